@@ -0,0 +1,38 @@
+"""Lazy attribute loading for package ``__init__`` modules."""
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable, Mapping
+from typing import Any
+
+
+def attach(package: str, exports: Mapping[str, str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Module ``__getattr__``/``__dir__`` pair importing ``exports`` on first access.
+
+    ``exports`` maps each public name to the submodule (relative to
+    ``package``) that defines it. Resolved names are cached in the package
+    namespace, so later lookups bypass ``__getattr__``.
+    """
+
+    namespace = importlib.import_module(package).__dict__
+    # Importing a submodule binds it on the package, which would shadow an
+    # export of the same name (``eval.band_scan``), so those load eagerly.
+    for name, module in exports.items():
+        if module.lstrip(".") == name:
+            namespace[name] = getattr(importlib.import_module(module, package), name)
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *exports})
+
+    return __getattr__, __dir__
+
+
+__all__ = ["attach"]
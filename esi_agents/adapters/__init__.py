@@ -1,24 +1,26 @@
 """Data adapters for ESI ingestion."""
-from .base import AdapterNotAvailable, BaseAdapter
-from .csv import CSVAdapter
-from .parquet import ParquetAdapter
-from .influxdb import InfluxDBAdapter
-from .timescale import TimescaleAdapter
-from .sqlite import SQLiteAdapter
-from .mqtt import MQTTAdapter
-from .opcua import OPCUAAdapter
-from .schema_registry import SchemaRegistry, SignalMetadata
+from .._lazy import attach
 
-__all__ = [
-    "AdapterNotAvailable",
-    "BaseAdapter",
-    "CSVAdapter",
-    "ParquetAdapter",
-    "InfluxDBAdapter",
-    "TimescaleAdapter",
-    "SQLiteAdapter",
-    "MQTTAdapter",
-    "OPCUAAdapter",
-    "SchemaRegistry",
-    "SignalMetadata",
-]
+_EXPORTS = {
+    "AdapterNotAvailable": ".base",
+    "BaseAdapter": ".base",
+    "EventBatch": ".base",
+    "batch_records": ".base",
+    "CSVAdapter": ".csv",
+    "ParquetAdapter": ".parquet",
+    "InfluxDBAdapter": ".influxdb",
+    "TimescaleAdapter": ".timescale",
+    "SQLiteAdapter": ".sqlite",
+    "RawWaveformAdapter": ".raw_waveform",
+    "MQTTAdapter": ".mqtt",
+    "OPCUAAdapter": ".opcua",
+    "MergedStream": ".merge",
+    "StreamSource": ".merge",
+    "ReplayAdapter": ".replay",
+    "ReplayStats": ".replay",
+    "SchemaRegistry": ".schema_registry",
+    "SignalMetadata": ".schema_registry",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
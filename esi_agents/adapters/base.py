@@ -2,17 +2,221 @@
 from __future__ import annotations
 
 import abc
-from collections.abc import AsyncIterator, Mapping
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Iterator, Mapping, Sequence
+from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 
+_KEY_COLUMNS = ("asset_id", "channel", "value")
+
+
+@dataclass
+class EventBatch:
+    """Columnar block of streaming observations.
+
+    Each attribute holds one entry per sample: ``asset_id`` and ``channel``
+    are object arrays of keys, ``timestamp`` is ``datetime64[ns]`` (``NaT``
+    when the source carries no time), ``value`` and ``rpm`` are ``float64``.
+    """
+
+    asset_id: np.ndarray
+    channel: np.ndarray
+    timestamp: np.ndarray
+    value: np.ndarray
+    rpm: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return int(self.value.shape[0])
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "EventBatch":
+        missing = set(_KEY_COLUMNS).difference(df.columns)
+        if missing:
+            raise ValueError(f"Event frame missing required columns: {sorted(missing)}")
+        n = len(df)
+        if "timestamp" in df.columns:
+            timestamp = pd.to_datetime(df["timestamp"]).to_numpy(dtype="datetime64[ns]")
+        else:
+            timestamp = np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]")
+        return cls(
+            asset_id=df["asset_id"].astype(str).to_numpy(dtype=object),
+            channel=df["channel"].astype(str).to_numpy(dtype=object),
+            timestamp=timestamp,
+            value=df["value"].to_numpy(dtype=float),
+            rpm=df["rpm"].to_numpy(dtype=float) if "rpm" in df.columns else None,
+        )
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]]) -> "EventBatch":
+        if not records:
+            return cls.empty()
+        first = records[0]
+        missing = set(_KEY_COLUMNS).difference(first)
+        if missing:
+            raise ValueError(f"Event records missing required fields: {sorted(missing)}")
+        has_rpm = all("rpm" in record for record in records)
+        timestamps = [record.get("timestamp") for record in records]
+        return cls(
+            asset_id=np.array([str(record["asset_id"]) for record in records], dtype=object),
+            channel=np.array([str(record["channel"]) for record in records], dtype=object),
+            timestamp=pd.to_datetime(pd.Series(timestamps), format="ISO8601").to_numpy(
+                dtype="datetime64[ns]"
+            ),
+            value=np.fromiter((record["value"] for record in records), dtype=float, count=len(records)),
+            rpm=np.fromiter((record["rpm"] for record in records), dtype=float, count=len(records))
+            if has_rpm
+            else None,
+        )
+
+    @classmethod
+    def empty(cls) -> "EventBatch":
+        return cls(
+            asset_id=np.empty(0, dtype=object),
+            channel=np.empty(0, dtype=object),
+            timestamp=np.empty(0, dtype="datetime64[ns]"),
+            value=np.empty(0, dtype=float),
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["EventBatch"]) -> "EventBatch":
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        if any(batch.rpm is not None for batch in batches):
+            rpm = np.concatenate(
+                [batch.rpm if batch.rpm is not None else np.full(len(batch), np.nan) for batch in batches]
+            )
+        else:
+            rpm = None
+        return cls(
+            asset_id=np.concatenate([batch.asset_id for batch in batches]),
+            channel=np.concatenate([batch.channel for batch in batches]),
+            timestamp=np.concatenate([batch.timestamp for batch in batches]),
+            value=np.concatenate([batch.value for batch in batches]),
+            rpm=rpm,
+        )
+
+    def take(self, index: np.ndarray | slice) -> "EventBatch":
+        return EventBatch(
+            asset_id=self.asset_id[index],
+            channel=self.channel[index],
+            timestamp=self.timestamp[index],
+            value=self.value[index],
+            rpm=self.rpm[index] if self.rpm is not None else None,
+        )
+
+    def groups(self) -> Iterator[tuple[tuple[str, str], "EventBatch"]]:
+        """Split the batch per ``(asset_id, channel)`` preserving sample order."""
+
+        n = len(self)
+        if n == 0:
+            return
+        if (self.asset_id == self.asset_id[0]).all() and (self.channel == self.channel[0]).all():
+            yield (str(self.asset_id[0]), str(self.channel[0])), self
+            return
+        asset_codes, assets = pd.factorize(self.asset_id)
+        channel_codes, channels = pd.factorize(self.channel)
+        combined = asset_codes * len(channels) + channel_codes
+        order = np.argsort(combined, kind="stable")
+        boundaries = np.flatnonzero(np.diff(combined[order])) + 1
+        for part in np.split(order, boundaries):
+            code = combined[part[0]]
+            key = (str(assets[code // len(channels)]), str(channels[code % len(channels)]))
+            yield key, self.take(part)
+
+    def to_frame(self) -> pd.DataFrame:
+        data: dict[str, Any] = {
+            "timestamp": self.timestamp,
+            "asset_id": self.asset_id,
+            "channel": self.channel,
+            "value": self.value,
+        }
+        if self.rpm is not None:
+            data["rpm"] = self.rpm
+        return pd.DataFrame(data)
+
+    def to_records(self) -> list[dict[str, Any]]:
+        return self.to_frame().to_dict(orient="records")
+
+
+def iter_frame_batches(df: pd.DataFrame, batch_size: int) -> Iterator[EventBatch]:
+    """Slice an in-memory frame into :class:`EventBatch` blocks."""
+
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    batch = EventBatch.from_frame(df)
+    for start in range(0, len(batch), batch_size):
+        yield batch.take(slice(start, start + batch_size))
+
+
+class _StreamFailure:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+_END_OF_STREAM = object()
+
+
+async def batch_records(
+    records: AsyncIterator[Mapping[str, Any]], batch_size: int = 1024
+) -> AsyncIterator[EventBatch]:
+    """Group a record stream into :class:`EventBatch` blocks.
+
+    A pump task drains ``records`` into a bounded queue; each batch holds
+    whatever is already queued (up to ``batch_size``), so fast sources are
+    batched fully while slow live sources are not delayed waiting for a
+    batch to fill.
+    """
+
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=batch_size)
+
+    async def _pump() -> None:
+        try:
+            async for record in records:
+                await queue.put(record)
+        except Exception as exc:  # surfaced to the consumer below
+            await queue.put(_StreamFailure(exc))
+        else:
+            await queue.put(_END_OF_STREAM)
+
+    task = asyncio.create_task(_pump())
+    try:
+        while True:
+            pending = [await queue.get()]
+            while len(pending) < batch_size and not queue.empty():
+                pending.append(queue.get_nowait())
+            collected: list[Mapping[str, Any]] = []
+            for item in pending:
+                if item is _END_OF_STREAM or isinstance(item, _StreamFailure):
+                    if collected:
+                        yield EventBatch.from_records(collected)
+                    if isinstance(item, _StreamFailure):
+                        raise item.exc
+                    return
+                collected.append(item)
+            yield EventBatch.from_records(collected)
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
 class BaseAdapter(abc.ABC):
     """Abstract base class for data adapters.
 
     Concrete implementations must provide batch loading via :meth:`load`
-    and streaming consumption via :meth:`subscribe`.
+    and streaming consumption via :meth:`subscribe`. Adapters that can
+    produce columnar data cheaply should also override
+    :meth:`subscribe_batches`.
     """
 
     @abc.abstractmethod
@@ -30,9 +234,40 @@ class BaseAdapter(abc.ABC):
     def subscribe(self, params: Mapping[str, Any]) -> AsyncIterator[dict[str, Any]]:
         """Return an asynchronous iterator yielding streaming observations."""
 
+    def subscribe_batches(self, params: Mapping[str, Any]) -> AsyncIterator[EventBatch]:
+        """Return an asynchronous iterator yielding :class:`EventBatch` blocks.
+
+        The default implementation groups the records produced by
+        :meth:`subscribe`; ``params["batch_size"]`` caps the batch length.
+        """
+
+        return batch_records(self.subscribe(params), int(params.get("batch_size", 1024)))
+
+    def resume_params(self, params: Mapping[str, Any], since: pd.Timestamp) -> dict[str, Any] | None:
+        """Subscription ``params`` that replay the source from ``since`` onwards.
+
+        Returns ``None`` when the adapter cannot seek by time; a resumed
+        stream then continues from wherever the source starts.
+        """
+
+        return None
+
+
+def later_bound(current: Any, since: pd.Timestamp) -> pd.Timestamp:
+    """The later of an optional configured start bound and ``since``."""
+
+    return since if current is None else max(pd.Timestamp(current), since)
+
 
 class AdapterNotAvailable(RuntimeError):
     """Raised when an optional adapter dependency is missing."""
 
 
-__all__ = ["BaseAdapter", "AdapterNotAvailable"]
+__all__ = [
+    "BaseAdapter",
+    "AdapterNotAvailable",
+    "EventBatch",
+    "batch_records",
+    "iter_frame_batches",
+    "later_bound",
+]
@@ -0,0 +1,199 @@
+"""Fan-in of several stream adapters merged by event time."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from .base import BaseAdapter, EventBatch
+
+
+@dataclass
+class StreamSource:
+    """One input of a :class:`MergedStream`."""
+
+    name: str
+    adapter: BaseAdapter
+    params: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class _SourceState:
+    watermark: int | None = None
+    held: EventBatch = field(default_factory=EventBatch.empty)
+    received: int = 0
+    last_seen: float | None = None
+    done: bool = False
+
+
+class _Failure:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class MergedStream:
+    """Subscribe to several adapters concurrently and merge by event time.
+
+    Each source is assumed to be (mostly) time ordered. Samples are held
+    until every live source has advanced past them, or until they are more
+    than ``reorder_window_s`` behind the newest event seen on any source,
+    so a stalled source delays the output by at most that window. When no
+    batch arrives for ``flush_interval_s`` everything held is released.
+    Samples older than what has already been released are passed through
+    immediately and counted as late. With ``per_key`` the merged output is
+    split into one batch per ``(asset_id, channel)``.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[StreamSource],
+        reorder_window_s: float = 1.0,
+        flush_interval_s: float = 0.5,
+        per_key: bool = False,
+        queue_batches: int = 8,
+    ):
+        if not sources:
+            raise ValueError("MergedStream requires at least one source")
+        self.sources = list(sources)
+        self.reorder_window_ns = int(reorder_window_s * 1e9)
+        self.flush_interval_s = flush_interval_s
+        self.per_key = per_key
+        self.queue_batches = queue_batches
+        self._states = [_SourceState() for _ in self.sources]
+        self._newest: int | None = None
+        self._released: int | None = None
+        self._queue: asyncio.Queue[tuple[int, Any]] | None = None
+        self.late = 0
+
+    def queue_depth(self) -> int:
+        """Batches received from the sources but not yet merged."""
+
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def lag(self) -> dict[str, dict[str, float | int | None]]:
+        """Per-source event-time lag behind the newest event, idle time and counts."""
+
+        now = time.monotonic()
+        report: dict[str, dict[str, float | int | None]] = {}
+        for source, state in zip(self.sources, self._states):
+            event_lag = None
+            if state.watermark is not None and self._newest is not None:
+                event_lag = (self._newest - state.watermark) / 1e9
+            report[source.name] = {
+                "event_lag_s": event_lag,
+                "idle_s": None if state.last_seen is None else now - state.last_seen,
+                "received": state.received,
+                "held": len(state.held),
+            }
+        return report
+
+    async def batches(self) -> AsyncIterator[EventBatch]:
+        queue: asyncio.Queue[tuple[int, Any]] = asyncio.Queue(
+            maxsize=self.queue_batches * len(self.sources)
+        )
+        self._queue = queue
+
+        async def _pump(idx: int, source: StreamSource) -> None:
+            try:
+                async for batch in source.adapter.subscribe_batches(source.params):
+                    await queue.put((idx, batch))
+            except Exception as exc:  # surfaced to the consumer
+                await queue.put((idx, _Failure(exc)))
+            else:
+                await queue.put((idx, None))
+
+        tasks = [asyncio.create_task(_pump(i, s)) for i, s in enumerate(self.sources)]
+        try:
+            while not all(state.done for state in self._states):
+                try:
+                    idx, item = await asyncio.wait_for(queue.get(), timeout=self.flush_interval_s)
+                except asyncio.TimeoutError:
+                    for out in self._release(np.iinfo(np.int64).max):
+                        yield out
+                    continue
+                if isinstance(item, _Failure):
+                    raise item.exc
+                state = self._states[idx]
+                if item is None:
+                    state.done = True
+                else:
+                    for out in self._accept(state, item):
+                        yield out
+                for out in self._release(self._release_point()):
+                    yield out
+            for out in self._release(np.iinfo(np.int64).max):
+                yield out
+        finally:
+            for task in tasks:
+                task.cancel()
+            for task in tasks:
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+    def _accept(self, state: _SourceState, batch: EventBatch) -> list[EventBatch]:
+        state.received += len(batch)
+        state.last_seen = time.monotonic()
+        ts = batch.timestamp.astype(np.int64)
+        untimed = np.isnat(batch.timestamp)
+        late = ~untimed
+        if self._released is not None:
+            late &= ts < self._released
+        else:
+            late[:] = False
+        self.late += int(late.sum())
+        passthrough = untimed | late
+        timed = ~passthrough
+        if timed.any():
+            newest = int(ts[timed].max())
+            state.watermark = newest if state.watermark is None else max(state.watermark, newest)
+            self._newest = newest if self._newest is None else max(self._newest, newest)
+            state.held = EventBatch.concat([state.held, batch.take(timed)])
+        if passthrough.any():
+            return self._emit(batch.take(passthrough))
+        return []
+
+    def _release_point(self) -> int:
+        live = [s.watermark for s in self._states if not s.done]
+        if any(mark is None for mark in live):
+            point = None
+        else:
+            point = min(live) if live else np.iinfo(np.int64).max
+        if self._newest is not None:
+            bounded = self._newest - self.reorder_window_ns
+            point = bounded if point is None else max(point, bounded)
+        return point if point is not None else np.iinfo(np.int64).min
+
+    def _release(self, point: int) -> list[EventBatch]:
+        parts: list[EventBatch] = []
+        for state in self._states:
+            if not len(state.held):
+                continue
+            ts = state.held.timestamp.astype(np.int64)
+            ready = ts <= point
+            if ready.all():
+                parts.append(state.held)
+                state.held = EventBatch.empty()
+            elif ready.any():
+                parts.append(state.held.take(ready))
+                state.held = state.held.take(~ready)
+        if not parts:
+            return []
+        merged = EventBatch.concat(parts)
+        order = np.argsort(merged.timestamp, kind="stable")
+        merged = merged.take(order)
+        newest = int(merged.timestamp[-1].astype(np.int64))
+        self._released = newest if self._released is None else max(self._released, newest)
+        return self._emit(merged)
+
+    def _emit(self, batch: EventBatch) -> list[EventBatch]:
+        if not self.per_key:
+            return [batch]
+        return [part for _, part in batch.groups()]
+
+
+__all__ = ["MergedStream", "StreamSource"]
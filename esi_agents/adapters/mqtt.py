@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 import asyncio
+import threading
+from collections import deque
 from collections.abc import AsyncIterator, Callable, Mapping
 from typing import Any
 
 import pandas as pd
 
-from .base import AdapterNotAvailable, BaseAdapter
+from .base import AdapterNotAvailable, BaseAdapter, EventBatch
+from .payloads import resolve_decoder
 
 try:  # pragma: no cover - optional dependency
     import paho.mqtt.client as mqtt  # type: ignore
@@ -15,13 +18,106 @@ except Exception:  # pragma: no cover
     mqtt = None  # type: ignore[misc]
 
 
+_OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class _BoundedBuffer:
+    """Thread-safe, sample-bounded buffer between the MQTT network thread and the loop.
+
+    The network thread appends decoded messages; the event loop is woken
+    only when the buffer goes from empty to non-empty, so a burst of
+    messages is handed over with a single ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, capacity: int, overflow: str, wake: Callable[[], None]):
+        if capacity <= 0:
+            raise ValueError("max_queue must be positive")
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {_OVERFLOW_POLICIES}")
+        self.capacity = capacity
+        self.overflow = overflow
+        self._wake = wake
+        self._items: deque[tuple[EventBatch | dict[str, Any], int]] = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        self.closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, item: EventBatch | dict[str, Any], size: int) -> None:
+        with self._cond:
+            self.received += size
+            while self._items and self._size + size > self.capacity:
+                if self.closed or self.overflow == "drop_newest":
+                    self.dropped += size
+                    return
+                if self.overflow == "drop_oldest":
+                    _, old_size = self._items.popleft()
+                    self._size -= old_size
+                    self.dropped += old_size
+                else:
+                    self._cond.wait()
+            was_empty = not self._items
+            self._items.append((item, size))
+            self._size += size
+        if was_empty:
+            self._wake()
+
+    def drain(self, max_samples: int) -> tuple[list[EventBatch | dict[str, Any]], bool]:
+        """Pop whole messages up to ``max_samples`` (at least one)."""
+
+        with self._cond:
+            items: list[EventBatch | dict[str, Any]] = []
+            taken = 0
+            while self._items and (not items or taken + self._items[0][1] <= max_samples):
+                item, size = self._items.popleft()
+                self._size -= size
+                taken += size
+                items.append(item)
+            self._cond.notify_all()
+            return items, bool(self._items)
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {"received": self.received, "dropped": self.dropped, "queued": self._size}
+
+
 class MQTTAdapter(BaseAdapter):
     """Adapter that can attach to an MQTT broker.
 
     The adapter exposes hooks that allow dependency-free unit tests by
-    injecting lightweight message producers.
+    injecting lightweight message producers through ``client_factory``.
+
+    Streaming params:
+
+    ``max_queue``
+        Maximum number of buffered samples (default 100000).
+    ``overflow``
+        ``drop_oldest`` (default), ``drop_newest`` or ``block``; ``block``
+        stalls the network thread so the broker applies backpressure.
+    ``payload_decoder``
+        Name from :data:`~esi_agents.adapters.payloads.PAYLOAD_DECODERS`
+        (``packed_float32``, ``compact_records``, ``json``) or a callable
+        ``(payload: bytes, topic, params)`` returning an
+        :class:`EventBatch` or a list of records.
+    ``decoder``
+        Legacy callable receiving the UTF-8 decoded payload and returning
+        a record.
     """
 
+    def __init__(self) -> None:
+        self._buffer: _BoundedBuffer | None = None
+
+    def stats(self) -> dict[str, int]:
+        """Received/dropped/queued sample counts of the active subscription."""
+
+        return self._buffer.stats() if self._buffer else {"received": 0, "dropped": 0, "queued": 0}
+
     def _ensure_available(self) -> None:
         if mqtt is None:
             raise AdapterNotAvailable(
@@ -48,43 +144,99 @@ class MQTTAdapter(BaseAdapter):
             df = df.sort_values("timestamp")
         return df.reset_index(drop=True)
 
-    async def subscribe(self, params: Mapping[str, Any]) -> AsyncIterator[dict[str, Any]]:
-        self._ensure_available()
+    def _decode(self, params: Mapping[str, Any]) -> Callable[[Any], Any]:
+        if params.get("payload_decoder"):
+            payload_decoder = resolve_decoder(params["payload_decoder"])
+            return lambda message: payload_decoder(message.payload, getattr(message, "topic", ""), params)
+        if params.get("decoder"):
+            decoder = params["decoder"]
+            return lambda message: decoder(message.payload.decode())
+        return lambda message: {"raw_payload": message.payload.decode()}
+
+    def _connect(self, params: Mapping[str, Any]) -> tuple[Any, _BoundedBuffer, asyncio.Event]:
+        client_factory: Callable[[], Any] | None = params.get("client_factory")
+        if client_factory is None:
+            self._ensure_available()
         topic = params.get("topic")
         if not topic:
             raise ValueError("MQTTAdapter.subscribe requires a 'topic'")
         host = params.get("host", "localhost")
         port = int(params.get("port", 1883))
-        client_factory: Callable[[], Any] | None = params.get("client_factory")
         loop = asyncio.get_running_loop()
-        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        ready = asyncio.Event()
+        buffer = _BoundedBuffer(
+            int(params.get("max_queue", 100_000)),
+            str(params.get("overflow", "drop_oldest")),
+            lambda: loop.call_soon_threadsafe(ready.set),
+        )
+        self._buffer = buffer
+        decode = self._decode(params)
 
         def _default_factory():  # pragma: no cover - network setup not tested
             return mqtt.Client()
 
         client = client_factory() if client_factory else _default_factory()
 
-        def on_message(_client, _userdata, message):  # pragma: no cover - thin wrapper
-            payload = message.payload.decode()
-            record: dict[str, Any]
-            if params.get("decoder"):
-                record = params["decoder"](payload)
+        def on_message(_client, _userdata, message):
+            decoded = decode(message)
+            if isinstance(decoded, EventBatch):
+                if len(decoded):
+                    buffer.put(decoded, len(decoded))
+            elif isinstance(decoded, list):
+                for record in decoded:
+                    buffer.put(record, 1)
             else:
-                record = {"raw_payload": payload}
-            loop.call_soon_threadsafe(queue.put_nowait, record)
+                buffer.put(decoded, 1)
 
         client.on_message = on_message
         client.connect(host, port, keepalive=params.get("keepalive", 60))
         client.subscribe(topic)
         client.loop_start()
+        return client, buffer, ready
 
+    async def _drain(self, params: Mapping[str, Any]) -> AsyncIterator[list[EventBatch | dict[str, Any]]]:
+        batch_size = int(params.get("batch_size", 1024))
+        client, buffer, ready = self._connect(params)
         try:
             while True:
-                item = await queue.get()
-                yield item
-        finally:  # pragma: no cover - network cleanup not exercised in unit tests
+                await ready.wait()
+                ready.clear()
+                items, more = buffer.drain(batch_size)
+                if more:
+                    ready.set()
+                if items:
+                    yield items
+        finally:
+            buffer.close()
             client.loop_stop()
             client.disconnect()
 
+    async def subscribe(self, params: Mapping[str, Any]) -> AsyncIterator[dict[str, Any]]:
+        async for items in self._drain(params):
+            for item in items:
+                if isinstance(item, EventBatch):
+                    for record in item.to_records():
+                        yield record
+                else:
+                    yield item
+
+    async def subscribe_batches(self, params: Mapping[str, Any]) -> AsyncIterator[EventBatch]:
+        """Yield the queued messages (up to ``batch_size`` samples) as one batch."""
+
+        async for items in self._drain(params):
+            parts: list[EventBatch] = []
+            records: list[dict[str, Any]] = []
+            for item in items:
+                if isinstance(item, EventBatch):
+                    if records:
+                        parts.append(EventBatch.from_records(records))
+                        records = []
+                    parts.append(item)
+                else:
+                    records.append(item)
+            if records:
+                parts.append(EventBatch.from_records(records))
+            yield EventBatch.concat(parts)
+
 
 __all__ = ["MQTTAdapter"]
@@ -0,0 +1,160 @@
+"""Payload codecs for message-based transports.
+
+A payload decoder takes the raw message bytes, the topic and the adapter
+params and returns either an :class:`EventBatch` or a list of record
+dicts. Binary formats let a single message carry hundreds of samples:
+
+``packed_float32``
+    Header ``<dd`` (start time as epoch seconds, sampling rate in Hz)
+    followed by little-endian float32 samples.
+``compact_records``
+    Repeated ``<qff`` records: epoch nanoseconds, value, rpm (``NaN`` when
+    absent).
+``json``
+    UTF-8 JSON object or list of objects with the usual record fields.
+
+Asset and channel identifiers for binary formats come from the topic via
+``topic_pattern`` (e.g. ``"esi/{asset_id}/{channel}"``) or from the
+``asset_id``/``channel`` params.
+"""
+from __future__ import annotations
+
+import json
+import re
+import struct
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Any, Union
+
+import numpy as np
+import pandas as pd
+
+from .base import EventBatch
+
+Decoded = Union[EventBatch, list[dict[str, Any]]]
+PayloadDecoder = Callable[[bytes, str, Mapping[str, Any]], Decoded]
+
+_PACKED_HEADER = struct.Struct("<dd")
+_COMPACT_DTYPE = np.dtype([("timestamp", "<i8"), ("value", "<f4"), ("rpm", "<f4")])
+
+
+@lru_cache(maxsize=32)
+def _topic_regex(pattern: str) -> re.Pattern[str]:
+    parts = re.split(r"\{(\w+)\}", pattern)
+    regex = ""
+    for idx, part in enumerate(parts):
+        regex += f"(?P<{part}>[^/]+)" if idx % 2 else re.escape(part)
+    return re.compile(f"^{regex}$")
+
+
+def topic_keys(topic: str, params: Mapping[str, Any]) -> tuple[str, str]:
+    """Resolve ``(asset_id, channel)`` for a message."""
+
+    fields: dict[str, str] = {}
+    pattern = params.get("topic_pattern")
+    if pattern:
+        match = _topic_regex(str(pattern)).match(topic)
+        if match:
+            fields = match.groupdict()
+    asset_id = fields.get("asset_id", params.get("asset_id"))
+    channel = fields.get("channel", params.get("channel"))
+    if asset_id is None or channel is None:
+        raise ValueError(f"Cannot resolve asset_id/channel for topic '{topic}'")
+    return str(asset_id), str(channel)
+
+
+def _keys(asset_id: str, channel: str, n: int) -> tuple[np.ndarray, np.ndarray]:
+    assets = np.empty(n, dtype=object)
+    channels = np.empty(n, dtype=object)
+    assets[:] = asset_id
+    channels[:] = channel
+    return assets, channels
+
+
+def decode_packed_float32(payload: bytes, topic: str, params: Mapping[str, Any]) -> EventBatch:
+    start_s, rate_hz = _PACKED_HEADER.unpack_from(payload)
+    if rate_hz <= 0:
+        raise ValueError("packed_float32 payload has a non-positive sampling rate")
+    values = np.frombuffer(payload, dtype="<f4", offset=_PACKED_HEADER.size).astype(float)
+    start_ns = np.int64(round(start_s * 1e9))
+    offsets = np.round(np.arange(values.size) * (1e9 / rate_hz)).astype(np.int64)
+    assets, channels = _keys(*topic_keys(topic, params), values.size)
+    return EventBatch(
+        asset_id=assets,
+        channel=channels,
+        timestamp=(start_ns + offsets).astype("datetime64[ns]"),
+        value=values,
+    )
+
+
+def decode_compact_records(payload: bytes, topic: str, params: Mapping[str, Any]) -> EventBatch:
+    records = np.frombuffer(payload, dtype=_COMPACT_DTYPE)
+    rpm = records["rpm"].astype(float)
+    assets, channels = _keys(*topic_keys(topic, params), records.size)
+    return EventBatch(
+        asset_id=assets,
+        channel=channels,
+        timestamp=records["timestamp"].astype("datetime64[ns]"),
+        value=records["value"].astype(float),
+        rpm=None if np.isnan(rpm).all() else rpm,
+    )
+
+
+def decode_json(payload: bytes, topic: str, params: Mapping[str, Any]) -> list[dict[str, Any]]:
+    raw = json.loads(payload.decode("utf-8"))
+    records = raw if isinstance(raw, list) else [raw]
+    if params.get("topic_pattern") or ("asset_id" in params and "channel" in params):
+        asset_id, channel = topic_keys(topic, params)
+        for record in records:
+            record.setdefault("asset_id", asset_id)
+            record.setdefault("channel", channel)
+    return records
+
+
+def encode_packed_float32(values: np.ndarray, start: Any, sampling_rate_hz: float) -> bytes:
+    """Encode samples in the ``packed_float32`` format (for publishers and tests)."""
+
+    start_s = pd.Timestamp(start).value / 1e9
+    header = _PACKED_HEADER.pack(start_s, float(sampling_rate_hz))
+    return header + np.asarray(values, dtype="<f4").tobytes()
+
+
+def encode_compact_records(
+    timestamps: np.ndarray, values: np.ndarray, rpm: np.ndarray | None = None
+) -> bytes:
+    """Encode samples in the ``compact_records`` format."""
+
+    out = np.empty(len(values), dtype=_COMPACT_DTYPE)
+    out["timestamp"] = np.asarray(timestamps, dtype="datetime64[ns]").astype(np.int64)
+    out["value"] = values
+    out["rpm"] = np.nan if rpm is None else rpm
+    return out.tobytes()
+
+
+PAYLOAD_DECODERS: dict[str, PayloadDecoder] = {
+    "packed_float32": decode_packed_float32,
+    "compact_records": decode_compact_records,
+    "json": decode_json,
+}
+
+
+def resolve_decoder(spec: str | PayloadDecoder) -> PayloadDecoder:
+    if callable(spec):
+        return spec
+    decoder = PAYLOAD_DECODERS.get(str(spec))
+    if decoder is None:
+        raise ValueError(f"Unknown payload decoder '{spec}'")
+    return decoder
+
+
+__all__ = [
+    "PAYLOAD_DECODERS",
+    "PayloadDecoder",
+    "decode_compact_records",
+    "decode_json",
+    "decode_packed_float32",
+    "encode_compact_records",
+    "encode_packed_float32",
+    "resolve_decoder",
+    "topic_keys",
+]
@@ -0,0 +1,165 @@
+"""Memory-mapped adapter for raw high-rate waveform captures."""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from collections.abc import AsyncIterator, Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..features.windows import Waveform
+from .base import BaseAdapter, EventBatch
+
+_SUFFIXES = (".npy", ".bin")
+
+
+class RawWaveformAdapter(BaseAdapter):
+    """Adapter for raw ``.npy``/``.bin`` captures with a JSON sidecar.
+
+    Each capture ``name.bin`` (or ``name.npy``) is described by
+    ``name.json``::
+
+        {"asset_id": "turbine_001", "channel": "accel_x",
+         "start_time": "2024-01-01T00:00:00", "sampling_rate_hz": 25600,
+         "rpm_channel": "tacho", "dtype": "<f4", "offset": 0}
+
+    ``dtype`` (default little-endian float32) and ``offset`` (header bytes)
+    only apply to ``.bin`` files. ``rpm_channel`` names another capture of
+    the same asset in the same directory; it is attached as the ``rpm``
+    trace of the asset's other channels instead of being windowed itself.
+
+    ``params`` accepts ``path`` (a capture or a directory of captures),
+    optional ``start``/``end`` time bounds, ``asset_id``/``channel``
+    filters and ``batch_size`` for streaming. Time slicing only adjusts
+    array views, so the unused parts of a file are never read.
+    """
+
+    def load_waveforms(self, params: Mapping[str, Any]) -> list[Waveform]:
+        path = Path(params["path"])
+        if not path.exists():
+            raise FileNotFoundError(path)
+        captures = [path] if path.is_file() else sorted(
+            p for p in path.iterdir() if p.suffix in _SUFFIXES
+        )
+        loaded = [(self._read_sidecar(capture), capture) for capture in captures]
+        rpm_traces: dict[tuple[str, str], np.ndarray] = {}
+        rpm_channels = {str(meta["rpm_channel"]) for meta, _ in loaded if meta.get("rpm_channel")}
+        for meta, capture in loaded:
+            if str(meta["channel"]) in rpm_channels:
+                rpm_traces[(str(meta["asset_id"]), str(meta["channel"]))] = self._map(capture, meta)
+        assets = {str(v) for v in np.atleast_1d(params.get("asset_id", []))}
+        channels = {str(v) for v in np.atleast_1d(params.get("channel", []))}
+        waveforms: list[Waveform] = []
+        for meta, capture in loaded:
+            asset_id, channel = str(meta["asset_id"]), str(meta["channel"])
+            if channel in rpm_channels or (assets and asset_id not in assets):
+                continue
+            if channels and channel not in channels:
+                continue
+            values = self._map(capture, meta)
+            rpm = rpm_traces.get((asset_id, str(meta.get("rpm_channel"))))
+            if rpm is not None and rpm.shape[0] != values.shape[0]:
+                raise ValueError(f"rpm capture length does not match {capture.name}")
+            waveform = Waveform(
+                asset_id=asset_id,
+                channel=channel,
+                start=pd.Timestamp(meta["start_time"]),
+                sampling_rate_hz=float(meta["sampling_rate_hz"]),
+                values=values,
+                rpm=rpm,
+            )
+            waveforms.append(self._slice(waveform, params.get("start"), params.get("end")))
+        return [waveform for waveform in waveforms if len(waveform)]
+
+    def load(self, params: Mapping[str, Any]) -> pd.DataFrame:
+        """Materialise the captures as a long-format frame.
+
+        Prefer :meth:`load_waveforms` for windowing; this exists for
+        callers that need the generic :class:`BaseAdapter` contract.
+        """
+
+        frames = [self._to_frame(waveform) for waveform in self.load_waveforms(params)]
+        if not frames:
+            return pd.DataFrame(columns=["timestamp", "asset_id", "channel", "value"])
+        return pd.concat(frames, ignore_index=True).sort_values("timestamp").reset_index(drop=True)
+
+    async def subscribe(self, params: Mapping[str, Any]) -> AsyncIterator[dict[str, Any]]:
+        async for batch in self.subscribe_batches(params):
+            for record in batch.to_records():
+                yield record
+
+    async def subscribe_batches(self, params: Mapping[str, Any]) -> AsyncIterator[EventBatch]:
+        batch_size = int(params.get("batch_size", 65_536))
+        for waveform in self.load_waveforms(params):
+            for start in range(0, len(waveform), batch_size):
+                part = self._window(waveform, start, min(start + batch_size, len(waveform)))
+                yield EventBatch.from_frame(self._to_frame(part))
+                await asyncio.sleep(0)
+
+    @staticmethod
+    def _read_sidecar(capture: Path) -> dict[str, Any]:
+        sidecar = capture.with_suffix(".json")
+        if not sidecar.exists():
+            raise FileNotFoundError(f"Missing sidecar {sidecar} for {capture}")
+        meta = json.loads(sidecar.read_text(encoding="utf-8"))
+        missing = {"asset_id", "channel", "start_time", "sampling_rate_hz"}.difference(meta)
+        if missing:
+            raise ValueError(f"Sidecar {sidecar} missing fields: {sorted(missing)}")
+        if float(meta["sampling_rate_hz"]) <= 0:
+            raise ValueError(f"Sidecar {sidecar} sampling_rate_hz must be positive")
+        return meta
+
+    @staticmethod
+    def _map(capture: Path, meta: Mapping[str, Any]) -> np.ndarray:
+        if capture.suffix == ".npy":
+            values = np.load(capture, mmap_mode="r")
+        else:
+            values = np.memmap(
+                capture, dtype=np.dtype(meta.get("dtype", "<f4")), mode="r", offset=int(meta.get("offset", 0))
+            )
+        if values.ndim != 1:
+            raise ValueError(f"{capture.name} must contain a one-dimensional signal")
+        return values
+
+    @staticmethod
+    def _window(waveform: Waveform, first: int, last: int) -> Waveform:
+        return Waveform(
+            asset_id=waveform.asset_id,
+            channel=waveform.channel,
+            start=waveform.timestamp_at(first),
+            sampling_rate_hz=waveform.sampling_rate_hz,
+            values=waveform.values[first:last],
+            rpm=waveform.rpm[first:last] if waveform.rpm is not None else None,
+        )
+
+    def _slice(self, waveform: Waveform, start: Any, end: Any) -> Waveform:
+        first, last = 0, len(waveform)
+        fs = waveform.sampling_rate_hz
+        if start is not None:
+            offset = (pd.Timestamp(start) - waveform.start).total_seconds()
+            first = min(max(math.ceil(offset * fs - 1e-9), 0), last)
+        if end is not None:
+            offset = (pd.Timestamp(end) - waveform.start).total_seconds()
+            last = min(max(math.floor(offset * fs + 1e-9) + 1, first), last)
+        if first == 0 and last == len(waveform):
+            return waveform
+        return self._window(waveform, first, last)
+
+    @staticmethod
+    def _to_frame(waveform: Waveform) -> pd.DataFrame:
+        data: dict[str, Any] = {
+            "timestamp": waveform.timestamps(),
+            "asset_id": waveform.asset_id,
+            "channel": waveform.channel,
+            "value": np.asarray(waveform.values, dtype=float),
+        }
+        if waveform.rpm is not None:
+            data["rpm"] = np.asarray(waveform.rpm, dtype=float)
+        return pd.DataFrame(data)
+
+
+__all__ = ["RawWaveformAdapter"]
@@ -0,0 +1,198 @@
+"""Replay adapter pacing recorded data by its original timestamps."""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .base import BaseAdapter, EventBatch, iter_frame_batches
+from .csv import CSVAdapter
+from .parquet import ParquetAdapter
+from .raw_waveform import RawWaveformAdapter
+from .sqlite import SQLiteAdapter
+
+_SOURCES: dict[str, type[BaseAdapter]] = {
+    "csv": CSVAdapter,
+    "parquet": ParquetAdapter,
+    "sqlite": SQLiteAdapter,
+    "raw_waveform": RawWaveformAdapter,
+}
+
+
+@dataclass
+class ReplayStats:
+    """Throughput and end-to-end latency recorded during a replay."""
+
+    samples: int = 0
+    batches: int = 0
+    started: float | None = None
+    finished: float | None = None
+    max_schedule_lag_s: float = 0.0
+    latencies_s: list[float] = field(default_factory=list)
+    _sent_ts: list[int] = field(default_factory=list, repr=False)
+    _sent_wall: list[float] = field(default_factory=list, repr=False)
+
+    def record_batch(self, batch: EventBatch, wall: float) -> None:
+        self.samples += len(batch)
+        self.batches += 1
+        newest = batch.timestamp.max()
+        if not np.isnat(newest):
+            ts = int(newest.astype(np.int64))
+            if not self._sent_ts or ts >= self._sent_ts[-1]:
+                self._sent_ts.append(ts)
+                self._sent_wall.append(wall)
+
+    def record_output(self, event_time: Any) -> None:
+        """Record latency from the send of the batch carrying ``event_time`` to now."""
+
+        ts = pd.Timestamp(event_time).value
+        idx = bisect.bisect_left(self._sent_ts, ts)
+        if idx < len(self._sent_wall):
+            self.latencies_s.append(time.perf_counter() - self._sent_wall[idx])
+
+    def summary(self) -> dict[str, float | int | None]:
+        elapsed = None
+        if self.started is not None:
+            elapsed = (self.finished or time.perf_counter()) - self.started
+        latencies = np.asarray(self.latencies_s)
+        pct = (
+            {f"latency_p{q}_ms": float(np.percentile(latencies, q) * 1e3) for q in (50, 95, 99)}
+            if latencies.size
+            else {f"latency_p{q}_ms": None for q in (50, 95, 99)}
+        )
+        return {
+            "samples": self.samples,
+            "batches": self.batches,
+            "elapsed_s": elapsed,
+            "throughput_sps": self.samples / elapsed if elapsed else None,
+            "max_schedule_lag_s": self.max_schedule_lag_s,
+            "outputs": int(latencies.size),
+            **pct,
+        }
+
+
+class ReplayAdapter(BaseAdapter):
+    """Replay any batch adapter's data as a paced stream.
+
+    Params:
+
+    ``source``
+        ``{"adapter": "csv", "params": {...}}`` describing the recorded data
+        (``csv``, ``parquet``, ``sqlite`` or ``raw_waveform``); a
+        :class:`BaseAdapter` instance may be passed as ``adapter``.
+    ``speed``
+        Replay speed multiplier relative to the original timestamps, or
+        ``"max"`` to replay as fast as the consumer accepts.
+    ``clones``
+        Synthetic fleet multiplier: each asset is replayed ``clones`` times
+        as ``<asset_id>~<k>``, shifted by up to ``clone_jitter_s`` and with
+        Gaussian ``value_noise_std`` added (``seed`` fixes the draw).
+    ``batch_size``
+        Samples per emitted batch.
+    ``repeat``
+        Number of passes over the data; later passes are shifted in time
+        so event time keeps increasing.
+
+    :attr:`stats` records throughput, how far the replay fell behind its
+    schedule and, via :meth:`latency_probe`, end-to-end latency.
+    """
+
+    def __init__(self) -> None:
+        self.stats = ReplayStats()
+
+    def load(self, params: Mapping[str, Any]) -> pd.DataFrame:
+        source = params.get("source", {})
+        adapter = source.get("adapter", "csv")
+        if isinstance(adapter, str):
+            adapter_cls = _SOURCES.get(adapter.lower())
+            if adapter_cls is None:
+                raise ValueError(f"Unsupported replay source '{adapter}'")
+            adapter = adapter_cls()
+        frame = adapter.load(source.get("params", {}))
+        frame = self._clone(frame, params)
+        if "timestamp" in frame.columns:
+            frame = frame.sort_values("timestamp", kind="stable")
+        return frame.reset_index(drop=True)
+
+    async def subscribe(self, params: Mapping[str, Any]) -> AsyncIterator[dict[str, Any]]:
+        async for batch in self.subscribe_batches(params):
+            for record in batch.to_records():
+                yield record
+
+    async def subscribe_batches(self, params: Mapping[str, Any]) -> AsyncIterator[EventBatch]:
+        frame = self.load(params)
+        speed = params.get("speed", 1.0)
+        paced = speed != "max"
+        if paced and float(speed) <= 0:
+            raise ValueError("speed must be positive or 'max'")
+        if paced and "timestamp" not in frame.columns:
+            raise ValueError("paced replay requires timestamps; use speed: max")
+        batch_size = int(params.get("batch_size", 256))
+        repeat = int(params.get("repeat", 1))
+        stats = self.stats = ReplayStats()
+        span = pd.Timedelta(0)
+        if "timestamp" in frame.columns and len(frame) > 1:
+            span = frame["timestamp"].iloc[-1] - frame["timestamp"].iloc[0]
+            span += span / max(len(frame) - 1, 1)
+        origin = frame["timestamp"].iloc[0].value if "timestamp" in frame.columns and len(frame) else 0
+        stats.started = time.perf_counter()
+        try:
+            for rep in range(repeat):
+                shifted = frame
+                if rep and "timestamp" in frame.columns:
+                    shifted = frame.assign(timestamp=frame["timestamp"] + span * rep)
+                for batch in iter_frame_batches(shifted, batch_size):
+                    if paced:
+                        due = stats.started + (int(batch.timestamp[0].astype(np.int64)) - origin) / 1e9 / float(speed)
+                        delay = due - time.perf_counter()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        else:
+                            stats.max_schedule_lag_s = max(stats.max_schedule_lag_s, -delay)
+                            await asyncio.sleep(0)
+                    else:
+                        await asyncio.sleep(0)
+                    stats.record_batch(batch, time.perf_counter())
+                    yield batch
+        finally:
+            stats.finished = time.perf_counter()
+
+    def latency_probe(
+        self, emit: Callable[[dict[str, Any]], None] | None = None
+    ) -> Callable[[dict[str, Any]], None]:
+        """Wrap a scorer ``emit`` callback to record end-to-end latency."""
+
+        def _emit(message: dict[str, Any]) -> None:
+            self.stats.record_output(message["timestamp"])
+            if emit is not None:
+                emit(message)
+
+        return _emit
+
+    @staticmethod
+    def _clone(frame: pd.DataFrame, params: Mapping[str, Any]) -> pd.DataFrame:
+        clones = int(params.get("clones", 1))
+        if clones <= 1:
+            return frame
+        rng = np.random.default_rng(params.get("seed", 0))
+        jitter_s = float(params.get("clone_jitter_s", 0.0))
+        noise = float(params.get("value_noise_std", 0.0))
+        copies = [frame]
+        for k in range(1, clones):
+            clone = frame.copy()
+            clone["asset_id"] = clone["asset_id"].astype(str) + f"~{k}"
+            if jitter_s and "timestamp" in clone.columns:
+                clone["timestamp"] = clone["timestamp"] + pd.Timedelta(seconds=rng.uniform(0, jitter_s))
+            if noise:
+                clone["value"] = clone["value"] + rng.normal(0.0, noise, size=len(clone))
+            copies.append(clone)
+        return pd.concat(copies, ignore_index=True)
+
+
+__all__ = ["ReplayAdapter", "ReplayStats"]
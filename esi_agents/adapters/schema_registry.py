@@ -2,12 +2,19 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, asdict
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
+import numpy as np
 import pandas as pd
 
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+_MISSING = object()
+
 
 @dataclass
 class SignalMetadata:
@@ -21,12 +28,124 @@ class SignalMetadata:
     phase: str | None = None
 
 
+_COLUMNS = [f.name for f in fields(SignalMetadata)]
+_VALUE_COLUMNS = _COLUMNS[2:]
+
+
+def measured_rate(timestamps: np.ndarray) -> float | None:
+    """Sampling rate of time-sorted timestamps, from their endpoints.
+
+    Equal to the inverse of the mean sample spacing.
+    """
+
+    if len(timestamps) < 2:
+        return None
+    span = (timestamps[-1] - timestamps[0]) / np.timedelta64(1, "s")
+    return float((len(timestamps) - 1) / span) if span > 0 else None
+
+
 class SchemaRegistry:
-    """Persist and retrieve :class:`SignalMetadata` for channels."""
+    """Persist and retrieve :class:`SignalMetadata` for channels.
+
+    Metadata is stored in a SQLite table keyed by ``(asset_id, channel)``;
+    :meth:`persist` upserts, keeping stored fields that the new record
+    leaves as ``None``. Lookups go through an in-memory LRU of
+    ``cache_size`` entries. A known sampling rate is reused as long as the
+    measured rate stays within ``drift_tolerance`` (relative) of it and is
+    re-inferred otherwise. A JSON file written by earlier versions is
+    migrated on open and kept as ``<path>.bak``.
+    """
+
+    _instances: ClassVar[dict[Path, SchemaRegistry]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
 
-    def __init__(self, path: str | Path):
+    def __init__(
+        self, path: str | Path, cache_size: int = 4096, drift_tolerance: float = 0.005
+    ):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+        self.drift_tolerance = drift_tolerance
+        self.reinferred = 0
+        self._cache: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._lock = threading.RLock()
+        legacy = self._read_legacy_json()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS signals ("
+            "asset_id TEXT NOT NULL, channel TEXT NOT NULL, unit TEXT, "
+            "sampling_rate_hz REAL, channel_type TEXT, phase TEXT, "
+            "PRIMARY KEY (asset_id, channel))"
+        )
+        self._conn.commit()
+        if legacy:
+            self.persist(legacy)
+
+    @classmethod
+    def open(cls, path: str | Path, **kwargs: Any) -> SchemaRegistry:
+        """Return the process-wide registry for ``path`` (shares its cache)."""
+
+        key = Path(path).resolve()
+        with cls._instances_lock:
+            registry = cls._instances.get(key)
+            if registry is None:
+                registry = cls._instances[key] = cls(path, **kwargs)
+            return registry
+
+    def get(self, asset_id: str, channel: str) -> SignalMetadata | None:
+        key = (str(asset_id), str(channel))
+        with self._lock:
+            cached = self._cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                self._cache.move_to_end(key)
+                return cached
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM signals WHERE asset_id = ? AND channel = ?", key
+            ).fetchone()
+            metadata = SignalMetadata(*row) if row else None
+            self._remember(key, metadata)
+            return metadata
+
+    def persist(self, metadata: list[SignalMetadata]) -> None:
+        if not metadata:
+            return
+        updates = ", ".join(f"{c} = COALESCE(excluded.{c}, signals.{c})" for c in _VALUE_COLUMNS)
+        sql = (
+            f"INSERT INTO signals ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+            f"ON CONFLICT (asset_id, channel) DO UPDATE SET {updates}"
+        )
+        rows = [
+            tuple(str(v) if i < 2 else v for i, v in enumerate(asdict(item).values()))
+            for item in metadata
+        ]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(sql, rows)
+            for item in metadata:
+                key = (str(item.asset_id), str(item.channel))
+                self._cache.pop(key, None)
+
+    def load(self) -> list[SignalMetadata]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM signals ORDER BY asset_id, channel"
+            ).fetchall()
+        return [SignalMetadata(*row) for row in rows]
+
+    def resolve_sampling_rate(
+        self, asset_id: str, channel: str, timestamps: np.ndarray
+    ) -> float | None:
+        """Known sampling rate for a channel, re-inferred when it drifts.
+
+        ``timestamps`` must be sorted ``datetime64`` values.
+        """
+
+        known = self.get(asset_id, channel)
+        rate = self._reconcile(known, measured_rate(timestamps))
+        if rate is not None and (known is None or rate != known.sampling_rate_hz):
+            self.persist([SignalMetadata(str(asset_id), str(channel), sampling_rate_hz=rate)])
+        return rate
 
     def infer_from_frame(
         self, df: pd.DataFrame, defaults: dict[str, Any] | None = None
@@ -34,38 +153,61 @@ class SchemaRegistry:
         defaults = defaults or {}
         if not {"asset_id", "channel"}.issubset(df.columns):
             raise ValueError("DataFrame must include 'asset_id' and 'channel'")
+        if "timestamp" in df.columns:
+            ts = pd.to_datetime(df["timestamp"])
+            spans = ts.groupby([df["asset_id"], df["channel"]]).agg(["min", "max", "count"])
+        else:
+            spans = df.groupby(["asset_id", "channel"]).size().to_frame("count")
         metadata: list[SignalMetadata] = []
-        for (asset_id, channel), group in df.groupby(["asset_id", "channel"]):
-            sampling_rate = None
-            if "timestamp" in group.columns:
-                timestamps = pd.to_datetime(group["timestamp"]).sort_values()
-                if len(timestamps) > 1:
-                    deltas = timestamps.diff().dropna().dt.total_seconds()
-                    if not deltas.empty:
-                        sampling_rate = 1.0 / deltas.mean()
+        for (asset_id, channel), row in spans.iterrows():
+            measured = None
+            if "min" in row and row["count"] > 1:
+                span = (row["max"] - row["min"]).total_seconds()
+                measured = (row["count"] - 1) / span if span > 0 else None
+            known = self.get(asset_id, channel)
             metadata.append(
                 SignalMetadata(
                     asset_id=str(asset_id),
                     channel=str(channel),
-                    unit=defaults.get("unit"),
-                    sampling_rate_hz=defaults.get("sampling_rate_hz", sampling_rate),
-                    channel_type=defaults.get("channel_type"),
-                    phase=defaults.get("phase"),
+                    unit=defaults.get("unit", known.unit if known else None),
+                    sampling_rate_hz=defaults.get("sampling_rate_hz", self._reconcile(known, measured)),
+                    channel_type=defaults.get("channel_type", known.channel_type if known else None),
+                    phase=defaults.get("phase", known.phase if known else None),
                 )
             )
         return metadata
 
-    def persist(self, metadata: list[SignalMetadata]) -> None:
-        serialised = [asdict(item) for item in metadata]
-        with self.path.open("w", encoding="utf-8") as fh:
-            json.dump(serialised, fh, indent=2)
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        with self._instances_lock:
+            if self._instances.get(self.path.resolve()) is self:
+                del self._instances[self.path.resolve()]
 
-    def load(self) -> list[SignalMetadata]:
-        if not self.path.exists():
+    def _reconcile(self, known: SignalMetadata | None, measured: float | None) -> float | None:
+        cached = known.sampling_rate_hz if known else None
+        if measured is None or not cached:
+            return cached if measured is None else measured
+        if abs(measured - cached) <= self.drift_tolerance * cached:
+            return cached
+        self.reinferred += 1
+        return measured
+
+    def _remember(self, key: tuple[str, str], metadata: SignalMetadata | None) -> None:
+        self._cache[key] = metadata
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _read_legacy_json(self) -> list[SignalMetadata]:
+        if not self.path.exists() or self.path.stat().st_size == 0:
             return []
-        with self.path.open("r", encoding="utf-8") as fh:
-            raw = json.load(fh)
+        with self.path.open("rb") as fh:
+            if fh.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC:
+                return []
+        raw = json.loads(self.path.read_text(encoding="utf-8"))
+        self.path.replace(self.path.with_suffix(self.path.suffix + ".bak"))
         return [SignalMetadata(**item) for item in raw]
 
 
-__all__ = ["SchemaRegistry", "SignalMetadata"]
+__all__ = ["SchemaRegistry", "SignalMetadata", "measured_rate"]
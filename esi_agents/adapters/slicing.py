@@ -0,0 +1,133 @@
+"""Time-sliced, pooled query execution shared by the database adapters."""
+from __future__ import annotations
+
+import queue
+import time
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import pandas as pd
+
+QueryFn = Callable[[Mapping[str, Any]], pd.DataFrame]
+
+
+def plan_slices(start: Any, end: Any, slice_duration: Any) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+    """Split ``[start, end)`` into consecutive half-open slices."""
+
+    start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+    step = pd.Timedelta(slice_duration)
+    if step <= pd.Timedelta(0):
+        raise ValueError("slice_duration must be positive")
+    if end_ts <= start_ts:
+        raise ValueError("end must be after start")
+    slices: list[tuple[pd.Timestamp, pd.Timestamp]] = []
+    cursor = start_ts
+    while cursor < end_ts:
+        upper = min(cursor + step, end_ts)
+        slices.append((cursor, upper))
+        cursor = upper
+    return slices
+
+
+class _ClientPool:
+    def __init__(self, factory: Callable[[], Any] | None, size: int):
+        self._factory = factory
+        self._idle: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._created: list[Any] = []
+        self._size = size
+
+    def acquire(self) -> Any:
+        if self._factory is None:
+            return None
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            client = self._factory()
+            self._created.append(client)
+            return client
+
+    def release(self, client: Any) -> None:
+        if client is not None:
+            self._idle.put(client)
+
+    def close(self) -> None:
+        for client in self._created:
+            close = getattr(client, "close", None)
+            if callable(close):
+                close()
+
+
+def sliced_query(
+    query_fn: QueryFn,
+    params: Mapping[str, Any],
+    client_factory: Callable[[], Any] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Run ``query_fn`` once per time slice and yield the chunks in time order.
+
+    ``params`` must provide ``start``, ``end`` and ``slice_duration``
+    (anything :class:`pandas.Timedelta` accepts, e.g. ``"6h"``). Each call
+    receives a copy of ``params`` with the slice bounds in ``start``/``end``
+    and a pooled client in ``client`` when ``client_factory`` is given.
+    Up to ``max_parallel`` slices run concurrently; a failing slice is
+    retried ``retries`` times with exponential backoff starting at
+    ``retry_backoff_s``.
+    """
+
+    slices = plan_slices(params["start"], params["end"], params["slice_duration"])
+    max_parallel = max(1, int(params.get("max_parallel", 4)))
+    retries = int(params.get("retries", 2))
+    backoff = float(params.get("retry_backoff_s", 0.5))
+    pool = _ClientPool(client_factory, max_parallel)
+
+    def _run(bounds: tuple[pd.Timestamp, pd.Timestamp]) -> pd.DataFrame:
+        attempt = 0
+        while True:
+            client = pool.acquire()
+            try:
+                slice_params = dict(params, start=bounds[0], end=bounds[1])
+                if client is not None:
+                    slice_params["client"] = client
+                df = query_fn(slice_params)
+                if not isinstance(df, pd.DataFrame):
+                    raise TypeError("query_fn must return a pandas.DataFrame")
+                return df
+            except TypeError:
+                raise
+            except Exception as exc:
+                if attempt >= retries:
+                    raise RuntimeError(
+                        f"Query for slice {bounds[0]} - {bounds[1]} failed after {attempt + 1} attempts"
+                    ) from exc
+                time.sleep(backoff * (2**attempt))
+                attempt += 1
+            finally:
+                pool.release(client)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            pending: deque[Future[pd.DataFrame]] = deque()
+            remaining = iter(slices)
+            for bounds in remaining:
+                pending.append(executor.submit(_run, bounds))
+                if len(pending) >= max_parallel:
+                    break
+            try:
+                while pending:
+                    df = pending.popleft().result()
+                    next_bounds = next(remaining, None)
+                    if next_bounds is not None:
+                        pending.append(executor.submit(_run, next_bounds))
+                    if "timestamp" in df.columns:
+                        df = df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+                    if not df.empty:
+                        yield df
+            finally:
+                for future in pending:
+                    future.cancel()
+    finally:
+        pool.close()
+
+
+__all__ = ["plan_slices", "sliced_query"]
@@ -1,33 +1,313 @@
-"""SQLite adapter useful for demos."""
+"""SQLite adapter useful for demos and as a local historian stand-in."""
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
+import os
+import queue
 import sqlite3
-from collections.abc import AsyncIterator, Mapping
+from collections.abc import AsyncIterator, Iterator, Mapping
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from .base import BaseAdapter
+from .base import BaseAdapter, EventBatch, iter_frame_batches, later_bound
+
+_ROWID = "__rowid"
+
+
+def _quote(identifier: str) -> str:
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _as_list(value: Any) -> list[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
+
+
+class _ReadOnlyPool:
+    """Small LIFO pool of read-only connections to one database file."""
+
+    def __init__(self, database: str, size: int):
+        self.database = database
+        self.size = size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._slots = queue.Queue(maxsize=size)
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        self._slots.put(None)
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                uri = f"{Path(self.database).resolve().as_uri()}?mode=ro"
+                conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            try:
+                yield conn
+            finally:
+                self._idle.put(conn)
+        finally:
+            self._slots.get_nowait()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
 
 
 class SQLiteAdapter(BaseAdapter):
-    """Lightweight adapter backed by :mod:`sqlite3`."""
+    """Lightweight adapter backed by :mod:`sqlite3`.
+
+    Two modes are supported:
+
+    * ``query`` mode runs an arbitrary SQL ``query`` and returns the result.
+    * structured mode (``table`` given) reads ``table`` in time-ordered
+      chunks of ``chunk_size`` rows with parameterised keyset queries on
+      ``(time_column, rowid)``. Optional ``asset_id``/``channel`` filters
+      and ``start``/``end`` bounds are applied in SQL. On first use the
+      database is switched to WAL mode and covering indexes are created
+      unless ``create_indexes`` is false; reads go through a pool of
+      ``pool_size`` read-only connections.
+
+    In structured mode :meth:`subscribe` follows the table: it polls every
+    ``poll_interval_s`` seconds for rows beyond the high-water mark and,
+    when ``state_path`` is given, persists the mark so a restarted stream
+    continues where it stopped. ``follow: false`` stops once caught up.
+    The mark is ignored when ``resume_from_mark`` is false, e.g. when the
+    stream resumes from its own checkpoint via :meth:`resume_params`.
+    """
+
+    def __init__(self) -> None:
+        self._pools: dict[str, _ReadOnlyPool] = {}
+        self._prepared: set[tuple[str, str]] = set()
 
     def load(self, params: Mapping[str, Any]) -> pd.DataFrame:
+        if params.get("table"):
+            frames = list(self.iter_frames(params))
+            if not frames:
+                return pd.DataFrame(columns=["timestamp", "asset_id", "channel", "value"])
+            return pd.concat(frames, ignore_index=True)
         database = params.get("database", ":memory:")
         query = params.get("query")
         if not query:
-            raise ValueError("SQLiteAdapter requires a SQL 'query'")
+            raise ValueError("SQLiteAdapter requires a SQL 'query' or a 'table'")
         with sqlite3.connect(database) as conn:
             df = pd.read_sql_query(query, conn)
         if "timestamp" in df.columns:
             df["timestamp"] = pd.to_datetime(df["timestamp"])
         return df
 
+    def iter_frames(
+        self, params: Mapping[str, Any], after: tuple[Any, int] | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Yield time-ordered chunks of a structured table."""
+
+        for raw in self._iter_raw(params, after):
+            yield self._normalise(raw, params)
+
     async def subscribe(self, params: Mapping[str, Any]) -> AsyncIterator[dict[str, Any]]:
-        df = self.load(params)
-        for record in df.to_dict(orient="records"):
-            yield record
+        if not params.get("table"):
+            df = self.load(params)
+            for record in df.to_dict(orient="records"):
+                yield record
+            return
+        async for frame in self._follow(params):
+            for record in frame.to_dict(orient="records"):
+                yield record
+
+    async def subscribe_batches(self, params: Mapping[str, Any]) -> AsyncIterator[EventBatch]:
+        batch_size = int(params.get("batch_size", 1024))
+        if not params.get("table"):
+            for batch in iter_frame_batches(self.load(params), batch_size):
+                yield batch
+                await asyncio.sleep(0)
+            return
+        async for frame in self._follow(params):
+            for batch in iter_frame_batches(frame, batch_size):
+                yield batch
+
+    def resume_params(self, params: Mapping[str, Any], since: pd.Timestamp) -> dict[str, Any] | None:
+        if not params.get("table"):
+            return None
+        return {**params, "start": later_bound(params.get("start"), since), "resume_from_mark": False}
+
+    def close(self) -> None:
+        for pool in self._pools.values():
+            pool.close()
+        self._pools.clear()
+
+    async def _follow(self, params: Mapping[str, Any]) -> AsyncIterator[pd.DataFrame]:
+        state_path = Path(params["state_path"]) if params.get("state_path") else None
+        mark = self._read_mark(state_path) if params.get("resume_from_mark", True) else None
+        interval = float(params.get("poll_interval_s", 1.0))
+        follow = bool(params.get("follow", True))
+        while True:
+            chunks = await asyncio.to_thread(lambda: list(self._iter_raw(params, mark, limit_chunks=1)))
+            if chunks:
+                raw = chunks[0]
+                mark = (
+                    self._to_sql_value(raw[self._time_column(params)].iloc[-1]),
+                    int(raw[_ROWID].iloc[-1]),
+                )
+                frame = self._normalise(raw, params)
+                yield frame
+                if state_path is not None:
+                    self._write_mark(state_path, mark)
+                continue
+            if not follow:
+                return
+            await asyncio.sleep(interval)
+
+    def _iter_raw(
+        self,
+        params: Mapping[str, Any],
+        after: tuple[Any, int] | None = None,
+        limit_chunks: int | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        database = str(params.get("database", ""))
+        if not database or database == ":memory:":
+            raise ValueError("SQLiteAdapter structured mode requires a database file")
+        table = str(params["table"])
+        time_col = self._time_column(params)
+        self._prepare(database, table, params)
+        pool = self._pool(database, int(params.get("pool_size", 4)))
+        chunk_size = int(params.get("chunk_size", 50_000))
+        columns = list(params.get("columns") or [])
+        if columns and time_col not in columns:
+            columns.append(time_col)
+        select = ", ".join(_quote(c) for c in columns) if columns else "*"
+        with pool.connection() as conn:
+            clauses, args = self._filters(conn, table, time_col, params)
+            emitted = 0
+            while limit_chunks is None or emitted < limit_chunks:
+                page_clauses, page_args = list(clauses), list(args)
+                if after is not None:
+                    page_clauses.append(f"({_quote(time_col)} > ? OR ({_quote(time_col)} = ? AND rowid > ?))")
+                    page_args += [after[0], after[0], after[1]]
+                where = f" WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+                sql = (
+                    f"SELECT rowid AS {_ROWID}, {select} FROM {_quote(table)}{where} "
+                    f"ORDER BY {_quote(time_col)}, rowid LIMIT ?"
+                )
+                raw = pd.read_sql_query(sql, conn, params=[*page_args, chunk_size])
+                if raw.empty:
+                    return
+                after = (self._to_sql_value(raw[time_col].iloc[-1]), int(raw[_ROWID].iloc[-1]))
+                yield raw
+                emitted += 1
+                if len(raw) < chunk_size:
+                    return
+
+    def _filters(
+        self, conn: sqlite3.Connection, table: str, time_col: str, params: Mapping[str, Any]
+    ) -> tuple[list[str], list[Any]]:
+        clauses: list[str] = []
+        args: list[Any] = []
+        for key in ("asset_id", "channel"):
+            values = _as_list(params.get(key))
+            if values:
+                column = _quote(params.get(f"{key}_column", key))
+                clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                args += [str(v) for v in values]
+        sample = conn.execute(
+            f"SELECT {_quote(time_col)} FROM {_quote(table)} LIMIT 1"
+        ).fetchone()
+        for key, op in (("start", ">="), ("end", "<=")):
+            if params.get(key) is not None:
+                clauses.append(f"{_quote(time_col)} {op} ?")
+                args.append(self._bound(params[key], sample[0] if sample else None, params))
+        return clauses, args
+
+    @staticmethod
+    def _bound(value: Any, sample: Any, params: Mapping[str, Any]) -> Any:
+        """Express a time bound in the storage format of the time column."""
+
+        ts = pd.Timestamp(value)
+        if isinstance(sample, (int, float)):
+            unit = params.get("time_unit", "s")
+            return ts.value / pd.Timedelta(1, unit=unit).value
+        sep = "T" if isinstance(sample, str) and "T" in sample else " "
+        return ts.isoformat(sep=sep)
+
+    @staticmethod
+    def _to_sql_value(value: Any) -> Any:
+        return value.item() if isinstance(value, np.generic) else value
+
+    def _prepare(self, database: str, table: str, params: Mapping[str, Any]) -> None:
+        if (database, table) in self._prepared:
+            return
+        if not Path(database).exists():
+            raise FileNotFoundError(database)
+        if params.get("create_indexes", True):
+            time_col = self._time_column(params)
+            asset_col = params.get("asset_id_column", "asset_id")
+            channel_col = params.get("channel_column", "channel")
+            with contextlib.closing(sqlite3.connect(database)) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                existing = [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+                covered = [c for c in (asset_col, channel_col, time_col, "value", "rpm") if c in existing]
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{time_col}')} "
+                    f"ON {_quote(table)} ({_quote(time_col)})"
+                )
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_covering')} "
+                    f"ON {_quote(table)} ({', '.join(_quote(c) for c in covered)})"
+                )
+                conn.commit()
+        self._prepared.add((database, table))
+
+    def _pool(self, database: str, size: int) -> _ReadOnlyPool:
+        pool = self._pools.get(database)
+        if pool is None:
+            pool = self._pools[database] = _ReadOnlyPool(database, size)
+        return pool
+
+    @staticmethod
+    def _time_column(params: Mapping[str, Any]) -> str:
+        return str(params.get("time_column", "timestamp"))
+
+    @staticmethod
+    def _normalise(raw: pd.DataFrame, params: Mapping[str, Any]) -> pd.DataFrame:
+        df = raw.drop(columns=[_ROWID])
+        rename = dict(params.get("rename", {}))
+        for key in ("asset_id", "channel"):
+            if params.get(f"{key}_column"):
+                rename[params[f"{key}_column"]] = key
+        if rename:
+            df = df.rename(columns=rename)
+        time_col = str(params.get("time_column", "timestamp"))
+        if time_col in df.columns:
+            if pd.api.types.is_numeric_dtype(df[time_col]):
+                timestamps = pd.to_datetime(df[time_col], unit=params.get("time_unit", "s"))
+            else:
+                timestamps = pd.to_datetime(df[time_col], format="ISO8601")
+            df = df.drop(columns=[time_col])
+            df.insert(0, "timestamp", timestamps)
+        return df.reset_index(drop=True)
+
+    @staticmethod
+    def _read_mark(state_path: Path | None) -> tuple[Any, int] | None:
+        if state_path is None or not state_path.exists():
+            return None
+        raw = json.loads(state_path.read_text(encoding="utf-8"))
+        return raw["time"], int(raw["rowid"])
+
+    @staticmethod
+    def _write_mark(state_path: Path, mark: tuple[Any, int]) -> None:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = state_path.with_suffix(state_path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"time": mark[0], "rowid": mark[1]}), encoding="utf-8")
+        os.replace(tmp, state_path)
 
 
 __all__ = ["SQLiteAdapter"]
@@ -1,12 +1,13 @@
 """TimescaleDB adapter using SQL callouts."""
 from __future__ import annotations
 
-from collections.abc import AsyncIterator, Callable, Mapping
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping
 from typing import Any
 
 import pandas as pd
 
 from .base import AdapterNotAvailable, BaseAdapter
+from .slicing import sliced_query
 
 try:  # pragma: no cover - optional dependency import guard
     import psycopg2  # type: ignore
@@ -28,11 +29,35 @@ class TimescaleAdapter(BaseAdapter):
         query_fn: Callable[[Mapping[str, Any]], pd.DataFrame] | None = params.get("query_fn")
         if query_fn is None:
             raise ValueError("TimescaleAdapter requires a 'query_fn' callable")
+        if params.get("slice_duration"):
+            frames = list(self.iter_frames(params))
+            return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
         df = query_fn(params)
         if not isinstance(df, pd.DataFrame):
             raise TypeError("query_fn must return a pandas.DataFrame")
         return df
 
+    def iter_frames(self, params: Mapping[str, Any]) -> Iterator[pd.DataFrame]:
+        """Yield the ``start``/``end`` range as time-ordered slice chunks.
+
+        See :func:`~esi_agents.adapters.slicing.sliced_query` for the
+        ``slice_duration``, ``max_parallel`` and retry params.
+        """
+
+        self._ensure_available()
+        query_fn: Callable[[Mapping[str, Any]], pd.DataFrame] | None = params.get("query_fn")
+        if query_fn is None:
+            raise ValueError("TimescaleAdapter requires a 'query_fn' callable")
+        yield from sliced_query(query_fn, params, self._client_factory(params))
+
+    @staticmethod
+    def _client_factory(params: Mapping[str, Any]) -> Callable[[], Any] | None:
+        if params.get("client_factory"):
+            return params["client_factory"]
+        if params.get("dsn"):
+            return lambda: psycopg2.connect(params["dsn"])  # pragma: no cover - requires a server
+        return None
+
     async def subscribe(self, params: Mapping[str, Any]) -> AsyncIterator[dict[str, Any]]:
         self._ensure_available()
         generator_fn: Callable[[Mapping[str, Any]], AsyncIterator[dict[str, Any]]] | None = params.get(
@@ -1,38 +1,49 @@
 """Agent registry for the ESI platform."""
-from .orchestrator import Orchestrator, OrchestratorResult
-from .data_ingestor import DataIngestor, IngestResult, DataQualitySummary
-from .feature_engineer import FeatureEngineer, FeatureResult
-from .model_trainer import ModelTrainer, TrainedModel
-from .model_selector import ModelSelector, SelectionResult
-from .evaluator import Evaluator, EvaluationArtifacts
-from .drift_monitor import DriftMonitor, DriftResult
-from .batch_scorer import BatchScorer
-from .stream_scorer import StreamScorer
-from .report_writer import ReportWriter
-from .logic_reviewer import LogicReviewer, LogicReview
-from .code_reviewer import CodeReviewer, CodeReview
+from .._lazy import attach
 
-__all__ = [
-    "Orchestrator",
-    "OrchestratorResult",
-    "DataIngestor",
-    "IngestResult",
-    "DataQualitySummary",
-    "FeatureEngineer",
-    "FeatureResult",
-    "ModelTrainer",
-    "TrainedModel",
-    "ModelSelector",
-    "SelectionResult",
-    "Evaluator",
-    "EvaluationArtifacts",
-    "DriftMonitor",
-    "DriftResult",
-    "BatchScorer",
-    "StreamScorer",
-    "ReportWriter",
-    "LogicReviewer",
-    "LogicReview",
-    "CodeReviewer",
-    "CodeReview",
-]
+_EXPORTS = {
+    "Orchestrator": ".orchestrator",
+    "OrchestratorResult": ".orchestrator",
+    "DataIngestor": ".data_ingestor",
+    "IngestResult": ".data_ingestor",
+    "DataQualitySummary": ".data_ingestor",
+    "ChunkedQuality": ".data_ingestor",
+    "FeatureEngineer": ".feature_engineer",
+    "FeatureResult": ".feature_engineer",
+    "ModelTrainer": ".model_trainer",
+    "TrainedModel": ".model_trainer",
+    "ModelSelector": ".model_selector",
+    "SelectionResult": ".model_selector",
+    "Evaluator": ".evaluator",
+    "EvaluationArtifacts": ".evaluator",
+    "DriftMonitor": ".drift_monitor",
+    "DriftResult": ".drift_monitor",
+    "BatchScorer": ".batch_scorer",
+    "ScoreSink": ".batch_scorer",
+    "read_scores": ".batch_scorer",
+    "StreamScorer": ".stream_scorer",
+    "OnlineScorer": ".online_scorer",
+    "Retrainer": ".retrainer",
+    "DecayingReservoir": ".retrainer",
+    "AlertPolicy": ".alerting",
+    "AlertTracker": ".alerting",
+    "AlertSink": ".alert_sinks",
+    "JsonlSink": ".alert_sinks",
+    "ParquetSink": ".alert_sinks",
+    "SQLiteSink": ".alert_sinks",
+    "make_sink": ".alert_sinks",
+    "ReportWriter": ".report_writer",
+    "LogicReviewer": ".logic_reviewer",
+    "LogicReview": ".logic_reviewer",
+    "CodeReviewer": ".code_reviewer",
+    "CodeReview": ".code_reviewer",
+    "MetricsRegistry": ".telemetry",
+    "MetricsExporter": ".telemetry",
+    "StreamMetrics": ".telemetry",
+    "Tracer": ".tracing",
+    "SpanRecord": ".tracing",
+    "read_trace": ".tracing",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
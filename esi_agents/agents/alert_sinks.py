@@ -0,0 +1,345 @@
+"""Batched sinks for scored stream windows."""
+from __future__ import annotations
+
+import abc
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, TextIO
+
+import pandas as pd
+
+from .batch_scorer import _require_pyarrow
+
+_COLUMNS = ("asset_id", "channel", "timestamp", "anomaly_score", "alert")
+
+
+class AlertSink(abc.ABC):
+    """Buffer messages and write them in batches from a background thread.
+
+    :meth:`emit` only appends to an in-memory buffer. The writer thread
+    flushes it every ``flush_interval_s`` seconds, or sooner once
+    ``max_buffer`` messages are pending. :meth:`close` (or leaving a
+    ``with`` block) flushes everything that was emitted. With
+    ``alerts_only`` windows below the threshold are dropped. A failed
+    write is raised from the next :meth:`emit` or :meth:`close`.
+    """
+
+    def __init__(self, flush_interval_s: float = 1.0, max_buffer: int = 10_000, alerts_only: bool = False):
+        self.flush_interval_s = flush_interval_s
+        self.max_buffer = max_buffer
+        self.alerts_only = alerts_only
+        self.written = 0
+        self._buffer: list[dict[str, Any]] = []
+        self._wake = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name=f"esi-{type(self).__name__}", daemon=True)
+        self._thread.start()
+
+    def emit(self, message: dict[str, Any]) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"{type(self).__name__} failed") from self._error
+        if self.alerts_only and not message.get("alert"):
+            return
+        with self._wake:
+            self._buffer.append(message)
+            if len(self._buffer) >= self.max_buffer:
+                self._wake.notify()
+
+    __call__ = emit
+
+    def flush(self) -> None:
+        """Write everything emitted so far, on the calling thread."""
+
+        with self._wake:
+            pending, self._buffer = self._buffer, []
+        if pending:
+            with self._write_lock:
+                self._write(pending)
+                self.written += len(pending)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
+        self._thread.join()
+        try:
+            if self._error is None:
+                self.flush()
+        finally:
+            with self._write_lock:
+                self._close()
+        if self._error is not None:
+            raise RuntimeError(f"{type(self).__name__} failed") from self._error
+
+    def __enter__(self) -> AlertSink:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._wake:
+                if not self._closed and len(self._buffer) < self.max_buffer:
+                    self._wake.wait(self.flush_interval_s)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except BaseException as exc:  # surfaced to the producer
+                self._error = exc
+                return
+
+    @abc.abstractmethod
+    def _write(self, messages: list[dict[str, Any]]) -> None:
+        """Persist one batch of messages."""
+
+    def _close(self) -> None:
+        return None
+
+
+class JsonlSink(AlertSink):
+    """Append messages as JSON lines to ``path``, one write per batch.
+
+    The file is rotated once it exceeds ``max_bytes`` or is older than
+    ``rotate_interval_s``. Rotated files are renamed to
+    ``<stem>.<UTC time>.jsonl``. Only the newest ``backups`` are kept, or
+    all of them when ``backups`` is ``None``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int | None = None,
+        rotate_interval_s: float | None = None,
+        backups: int | None = None,
+        **kwargs: Any,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.rotate_interval_s = rotate_interval_s
+        self.backups = backups
+        self._fh: TextIO | None = None
+        self._opened = 0.0
+        super().__init__(**kwargs)
+
+    def _write(self, messages: list[dict[str, Any]]) -> None:
+        if self._fh is not None and self._due():
+            self._rotate()
+        if self._fh is None:
+            self._fh = self.path.open("a", encoding="utf-8")
+            self._opened = time.monotonic()
+        self._fh.write("".join(json.dumps(message, default=str) + "\n" for message in messages))
+        self._fh.flush()
+
+    def _due(self) -> bool:
+        if self.max_bytes is not None and self._fh is not None and self._fh.tell() >= self.max_bytes:
+            return True
+        return self.rotate_interval_s is not None and time.monotonic() - self._opened >= self.rotate_interval_s
+
+    def _rotate(self) -> None:
+        assert self._fh is not None
+        self._fh.close()
+        self._fh = None
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        os.replace(self.path, self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}"))
+        if self.backups is not None:
+            rotated = sorted(self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}"))
+            for old in rotated[: max(len(rotated) - self.backups, 0)]:
+                old.unlink()
+
+    def _close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class StdoutSink(AlertSink):
+    """JSON lines on standard output, written in batches."""
+
+    def __init__(self, stream: TextIO | None = None, **kwargs: Any):
+        self.stream = stream or sys.stdout
+        super().__init__(**kwargs)
+
+    def _write(self, messages: list[dict[str, Any]]) -> None:
+        self.stream.write("".join(json.dumps(message, default=str) + "\n" for message in messages))
+        self.stream.flush()
+
+
+class ParquetSink(AlertSink):
+    """Write each batch as a ``part-<time>-<n>.parquet`` file under ``path``.
+
+    Every part has the same schema, so parts holding different message
+    kinds read back as one table: the standard fields, ``model_version``
+    and ``event`` get columns and the full message is kept as JSON in
+    ``payload``, as in :class:`SQLiteSink`. Closed files can be read while
+    the stream runs, for example with ``pandas.read_parquet(path)``.
+    """
+
+    def __init__(self, path: str | Path, compression: str = "zstd", **kwargs: Any):
+        _require_pyarrow()
+        import pyarrow as pa  # type: ignore
+
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.schema = pa.schema(
+            [
+                ("asset_id", pa.string()),
+                ("channel", pa.string()),
+                ("timestamp", pa.timestamp("us")),
+                ("anomaly_score", pa.float64()),
+                ("alert", pa.bool_()),
+                ("model_version", pa.string()),
+                ("event", pa.string()),
+                ("payload", pa.string()),
+            ]
+        )
+        self._parts = 0
+        super().__init__(**kwargs)
+
+    def _write(self, messages: list[dict[str, Any]]) -> None:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        timestamps = pd.to_datetime([message.get("timestamp") for message in messages], format="ISO8601")
+        if timestamps.tz is not None:
+            timestamps = timestamps.tz_convert(None)
+        columns = {name: [message.get(name) for message in messages] for name in self.schema.names}
+        columns["timestamp"] = timestamps
+        columns["payload"] = [json.dumps(message, default=str) for message in messages]
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        target = self.path / f"part-{stamp}-{self._parts:06d}.parquet"
+        tmp = target.with_suffix(".tmp")
+        pq.write_table(table, tmp, compression=self.compression)
+        os.replace(tmp, target)
+        self._parts += 1
+
+
+class SQLiteSink(AlertSink):
+    """Insert messages into ``table`` of the SQLite ``database``.
+
+    Each batch is inserted in one transaction. The database uses WAL mode,
+    so readers do not block the writer. The standard fields get columns,
+    and the full message is kept as JSON in ``payload``.
+    """
+
+    def __init__(self, path: str | Path, table: str = "alerts", **kwargs: Any):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.table = table
+        quoted = '"' + table.replace('"', '""') + '"'
+        self._insert = (
+            f"INSERT INTO {quoted} (asset_id, channel, timestamp, anomaly_score, alert, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?)"
+        )
+        self._conn: sqlite3.Connection | None = None
+        self._create = (
+            f"CREATE TABLE IF NOT EXISTS {quoted} (asset_id TEXT, channel TEXT, timestamp TEXT, "
+            "anomaly_score REAL, alert INTEGER, payload TEXT)"
+        )
+        super().__init__(**kwargs)
+
+    def _write(self, messages: list[dict[str, Any]]) -> None:
+        if self._conn is None:
+            # Created lazily so the connection belongs to the writing thread.
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(self._create)
+        rows = [
+            (*(message.get(column) for column in _COLUMNS), json.dumps(message, default=str))
+            for message in messages
+        ]
+        with self._conn:
+            self._conn.executemany(self._insert, rows)
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+SINKS: dict[str, type[AlertSink]] = {
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+    "sqlite": SQLiteSink,
+    "stdout": StdoutSink,
+}
+
+
+def make_sink(sink_cfg: Mapping[str, Any]) -> AlertSink:
+    """Sink for one entry of a ``sinks`` config list.
+
+    ``type`` picks the sink. ``path``, ``flush_interval_s``, ``max_buffer``
+    and ``alerts_only`` apply to all sinks. The JSONL sink also takes
+    ``max_mb``, ``rotate_interval_s`` and ``backups``, and the SQLite sink
+    takes ``table``.
+    """
+
+    cfg = dict(sink_cfg)
+    kind = str(cfg.pop("type", "jsonl")).lower()
+    if kind not in SINKS:
+        raise ValueError(f"Unknown sink type '{kind}'; expected one of {sorted(SINKS)}")
+    if "max_mb" in cfg:
+        cfg["max_bytes"] = int(float(cfg.pop("max_mb")) * 2**20)
+    return SINKS[kind](**cfg)
+
+
+class FanOut:
+    """Emit every message to several targets and close the sinks among them."""
+
+    def __init__(self, targets: Iterable[Callable[[dict[str, Any]], None]]):
+        self.targets = list(targets)
+
+    def __call__(self, message: dict[str, Any]) -> None:
+        for target in self.targets:
+            target(message)
+
+    def close(self) -> None:
+        errors: list[BaseException] = []
+        for target in self.targets:
+            if isinstance(target, AlertSink):
+                try:
+                    target.close()
+                except BaseException as exc:
+                    errors.append(exc)
+        if errors:
+            raise errors[0]
+
+
+def open_sinks(sinks_cfg: Sequence[Mapping[str, Any]] | None) -> list[AlertSink]:
+    sinks: list[AlertSink] = []
+    try:
+        for sink_cfg in sinks_cfg or []:
+            sinks.append(make_sink(sink_cfg))
+    except BaseException:
+        for sink in sinks:
+            sink.close()
+        raise
+    return sinks
+
+
+__all__ = [
+    "AlertSink",
+    "FanOut",
+    "JsonlSink",
+    "ParquetSink",
+    "SINKS",
+    "SQLiteSink",
+    "StdoutSink",
+    "make_sink",
+    "open_sinks",
+]
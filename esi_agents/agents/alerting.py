@@ -0,0 +1,111 @@
+"""Per-key alert state machines for streamed window scores."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import pandas as pd
+
+
+@dataclass
+class AlertPolicy:
+    """When a key's alert opens and closes.
+
+    An alert opens once scores have stayed at or above ``enter`` for
+    ``min_duration_s`` seconds of event time, and not within ``cooldown_s``
+    of the previous alert closing. It closes when a score drops below
+    ``exit``. With ``emit`` set to ``transitions`` only the opening and
+    closing windows are emitted; with ``all`` every window is, with
+    ``alert`` reflecting the state.
+    """
+
+    enter: float = 0.9
+    exit: float | None = None
+    min_duration_s: float = 0.0
+    cooldown_s: float = 0.0
+    emit: str = "transitions"
+
+    def __post_init__(self) -> None:
+        if self.exit is None:
+            self.exit = self.enter
+        if self.exit > self.enter:
+            raise ValueError("alerting.exit must not exceed alerting.enter")
+        if self.emit not in ("transitions", "all"):
+            raise ValueError(f"Unknown alerting.emit '{self.emit}'; expected 'transitions' or 'all'")
+
+    @classmethod
+    def from_config(cls, alerting_cfg: Mapping[str, Any], threshold: float) -> AlertPolicy:
+        """Policy for an ``alerting`` section; ``enter`` defaults to ``threshold``."""
+
+        cfg = dict(alerting_cfg)
+        cfg.setdefault("enter", threshold)
+        return cls(**cfg)
+
+
+@dataclass
+class KeyAlert:
+    """Alert state of one ``(asset_id, channel)`` key; times are epoch ns."""
+
+    active: bool = False
+    pending_since: int | None = None
+    started_at: int | None = None
+    cleared_at: int | None = None
+    peak: float = 0.0
+
+
+class AlertTracker:
+    """Turn scored windows into alert transitions, per key and in event time.
+
+    Opening messages carry ``"event": "alert_start"``; closing ones
+    ``"event": "alert_end"`` with the alert's ``started_at``,
+    ``duration_s`` and ``peak_score``. Windows the cascade did not
+    escalate count as below both thresholds.
+    """
+
+    def __init__(self, policy: AlertPolicy, keys: dict[tuple[str, str], KeyAlert] | None = None):
+        self.policy = policy
+        self.keys = keys if keys is not None else {}
+
+    def update(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        policy = self.policy
+        min_ns, cooldown_ns = int(policy.min_duration_s * 1e9), int(policy.cooldown_s * 1e9)
+        out: list[dict[str, Any]] = []
+        for message in messages:
+            key = (message["asset_id"], message["channel"])
+            state = self.keys.get(key)
+            if state is None:
+                state = self.keys[key] = KeyAlert()
+            now = pd.Timestamp(message["timestamp"]).value
+            score = message["anomaly_score"] if message.get("escalated", True) else float("-inf")
+            event: dict[str, Any] | None = None
+            if state.active:
+                state.peak = max(state.peak, score)
+                if score < policy.exit:
+                    event = {
+                        "event": "alert_end",
+                        "started_at": pd.Timestamp(state.started_at).isoformat(),
+                        "duration_s": (now - state.started_at) / 1e9,
+                        "peak_score": state.peak,
+                    }
+                    state.active, state.cleared_at = False, now
+            elif score >= policy.enter:
+                if state.pending_since is None:
+                    state.pending_since, state.peak = now, score
+                else:
+                    state.peak = max(state.peak, score)
+                cooled = state.cleared_at is None or now - state.cleared_at >= cooldown_ns
+                if now - state.pending_since >= min_ns and cooled:
+                    state.active, state.started_at = True, state.pending_since
+                    state.pending_since = None
+                    event = {"event": "alert_start", "started_at": pd.Timestamp(state.started_at).isoformat()}
+            else:
+                state.pending_since = None
+            if event is not None:
+                out.append({**message, "alert": state.active, **event})
+            elif policy.emit == "all":
+                out.append({**message, "alert": state.active})
+        return out
+
+
+__all__ = ["AlertPolicy", "AlertTracker", "KeyAlert"]
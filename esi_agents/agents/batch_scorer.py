@@ -1,13 +1,262 @@
 """Agent that performs batch scoring."""
 from __future__ import annotations
 
+import shutil
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from pathlib import Path
-from typing import Any, Tuple
+from typing import Any
+from urllib.parse import quote
 
 import pandas as pd
 
 from .model_selector import SelectionResult
 
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa  # type: ignore
+    import pyarrow.dataset as ds  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore[misc]
+    ds = None  # type: ignore[misc]
+    pq = None  # type: ignore[misc]
+
+PARQUET_AVAILABLE = pq is not None
+KEY_COLUMNS = ("asset_id", "channel", "window_start", "window_end")
+SCORE_COLUMNS = ("anomaly_score", "alert")
+_ID_COLUMNS = ("asset_id", "channel")
+
+
+def _require_pyarrow() -> None:
+    if pq is None:
+        raise ImportError(
+            "Writing Parquet output requires pyarrow (pip install esi-agents[parquet]); "
+            "use a .csv output path to write CSV instead"
+        )
+
+
+class FrameWriter:
+    """Append frames to one Parquet (or ``.csv``) file.
+
+    The first frame fixes the columns; later frames are aligned to them,
+    with missing columns filled by ``fill_value``. Parquet rows are
+    buffered into row groups of ``row_group_rows``, compressed with
+    ``compression`` and with dictionary-encoded id columns.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        fill_value: Any = 0.0,
+        compression: str = "zstd",
+        row_group_rows: int = 65_536,
+    ):
+        self.path = Path(path)
+        if self.path.suffix == ".parquet":
+            _require_pyarrow()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fill_value = fill_value
+        self.compression = compression
+        self.row_group_rows = row_group_rows
+        self.columns: list[str] | None = None
+        self.rows = 0
+        self._pending: list[pd.DataFrame] = []
+        self._pending_rows = 0
+        self._writer: Any = None
+        self._schema: Any = None
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self.columns is None:
+            self.columns = list(frame.columns)
+        else:
+            frame = frame.reindex(columns=self.columns, fill_value=self.fill_value)
+        self.rows += len(frame)
+        if self.path.suffix != ".parquet":
+            header = self.rows == len(frame)
+            frame.to_csv(self.path, mode="w" if header else "a", header=header, index=False)
+            return
+        self._pending.append(frame)
+        self._pending_rows += len(frame)
+        if self._pending_rows >= self.row_group_rows:
+            self._flush()
+
+    def close(self) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        frame = pd.concat(self._pending, ignore_index=True) if len(self._pending) > 1 else self._pending[0]
+        self._pending, self._pending_rows = [], 0
+        table = pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = pq.ParquetWriter(
+                self.path,
+                self._schema,
+                compression=self.compression,
+                use_dictionary=[c for c in _ID_COLUMNS if c in self.columns],
+            )
+        self._writer.write_table(table, row_group_size=self.row_group_rows)
+
+    def __enter__(self) -> FrameWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def iter_written(path: str | Path, batch_rows: int) -> Iterator[pd.DataFrame]:
+    """Read back a file produced by :class:`FrameWriter` in batches."""
+
+    path = Path(path)
+    if path.suffix == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=batch_rows)
+
+
+class ScoreSink:
+    """Incrementally write scored windows.
+
+    Parquet output (``.parquet`` path) is a hive-partitioned directory,
+    ``asset_id=<id>/date=<YYYY-MM-DD>/part-NNNNN.parquet`` by default, where
+    ``date`` is taken from ``window_start``; ``partition_by=()`` writes a
+    single file instead. With ``key_columns_only`` only the window keys and
+    scores are kept rather than every feature column. At most
+    ``max_open_files`` partition files are open at once. A ``.csv`` path
+    writes one CSV file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        partition_by: Sequence[str] = ("asset_id", "date"),
+        key_columns_only: bool = False,
+        row_group_rows: int = 65_536,
+        compression: str = "zstd",
+        max_open_files: int = 64,
+    ):
+        self.path = Path(path)
+        self.partition_by = list(partition_by) if self.path.suffix == ".parquet" else []
+        self.key_columns_only = key_columns_only
+        self.row_group_rows = row_group_rows
+        self.compression = compression
+        self.max_open_files = max_open_files
+        self.rows = 0
+        self._open: OrderedDict[tuple[str, ...], FrameWriter] = OrderedDict()
+        self._parts: dict[tuple[str, ...], int] = {}
+        if self.path.is_dir():
+            shutil.rmtree(self.path)
+        elif self.path.exists():
+            self.path.unlink()
+        self._single = None if self.partition_by else self._writer(self.path)
+
+    @classmethod
+    def from_config(cls, path: str | Path, output_cfg: Mapping[str, Any] | None) -> ScoreSink:
+        cfg = dict(output_cfg or {})
+        return cls(
+            path,
+            partition_by=cfg.get("partition_by", ("asset_id", "date")),
+            key_columns_only=bool(cfg.get("key_columns_only", False)),
+            row_group_rows=int(cfg.get("row_group_rows", 65_536)),
+            compression=str(cfg.get("compression", "zstd")),
+            max_open_files=int(cfg.get("max_open_files", 64)),
+        )
+
+    def write(self, scores: pd.DataFrame) -> None:
+        if self.key_columns_only:
+            keep = [c for c in (*KEY_COLUMNS, *SCORE_COLUMNS) if c in scores.columns]
+            scores = scores[keep]
+        self.rows += len(scores)
+        if self._single is not None:
+            self._single.write(scores)
+            return
+        parts = self._partition_values(scores)
+        for key, index in parts.groupby(list(parts.columns), sort=False).indices.items():
+            key = key if isinstance(key, tuple) else (key,)
+            data = scores.iloc[index].drop(columns=[c for c in self.partition_by if c in scores.columns])
+            self._partition_writer(tuple(str(v) for v in key)).write(data)
+
+    def close(self) -> None:
+        if self._single is not None:
+            self._single.close()
+        while self._open:
+            self._open.popitem(last=False)[1].close()
+
+    def __enter__(self) -> ScoreSink:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _partition_values(self, scores: pd.DataFrame) -> pd.DataFrame:
+        values = {}
+        for column in self.partition_by:
+            if column == "date" and "date" not in scores.columns:
+                source = "window_start" if "window_start" in scores.columns else "timestamp"
+                values[column] = pd.to_datetime(scores[source]).dt.strftime("%Y-%m-%d").to_numpy()
+            else:
+                values[column] = scores[column].astype(str).to_numpy()
+        return pd.DataFrame(values)
+
+    def _partition_writer(self, key: tuple[str, ...]) -> FrameWriter:
+        writer = self._open.get(key)
+        if writer is not None:
+            self._open.move_to_end(key)
+            return writer
+        directory = self.path.joinpath(
+            *(f"{name}={quote(value, safe='')}" for name, value in zip(self.partition_by, key))
+        )
+        part = self._parts.get(key, 0)
+        self._parts[key] = part + 1
+        writer = self._open[key] = self._writer(directory / f"part-{part:05d}.parquet")
+        if len(self._open) > self.max_open_files:
+            self._open.popitem(last=False)[1].close()
+        return writer
+
+    def _writer(self, path: Path) -> FrameWriter:
+        return FrameWriter(path, compression=self.compression, row_group_rows=self.row_group_rows)
+
+
+def read_scores(
+    path: str | Path, columns: Sequence[str] | None = None, partition_by: Sequence[str] | None = None
+) -> pd.DataFrame:
+    """Read scores written by :class:`ScoreSink`, projecting to ``columns``.
+
+    Rows come back in scoring order (asset, channel, window start), whatever
+    the partition layout. Partition columns (``partition_by``, by default
+    read from the directory layout) come back as the strings the sink
+    wrote, so asset ``"007"`` stays distinct from ``"7"``.
+    """
+
+    path = Path(path)
+    if path.suffix != ".parquet":
+        return pd.read_csv(path, usecols=lambda c: columns is None or c in columns)
+    _require_pyarrow()
+    partitioning = None
+    if path.is_dir():
+        if partition_by is None:
+            first = next(path.rglob("*.parquet"), None)
+            parts = () if first is None else first.relative_to(path).parent.parts
+            partition_by = [part.split("=", 1)[0] for part in parts]
+        partitioning = ds.partitioning(pa.schema([(name, pa.string()) for name in partition_by]), flavor="hive")
+    dataset = ds.dataset(path, format="parquet", partitioning=partitioning)
+    names = dataset.schema.names
+    sort_keys = [c for c in KEY_COLUMNS[:3] if c in names]
+    wanted = names if columns is None else [c for c in columns if c in names]
+    frame = dataset.to_table(columns=list(dict.fromkeys([*wanted, *sort_keys]))).to_pandas()
+    for column in _ID_COLUMNS:
+        if column in frame.columns and isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(str)
+    if path.is_dir() and sort_keys:
+        frame = frame.sort_values(sort_keys, kind="stable").reset_index(drop=True)
+    return frame[[c for c in wanted if c in frame.columns]] if columns is not None else frame
+
 
 class BatchScorer:
     def score(
@@ -16,24 +265,59 @@ class BatchScorer:
         features: pd.DataFrame,
         output_path: str | Path,
         threshold: float = 0.9,
+        output: Mapping[str, Any] | None = None,
     ) -> tuple[pd.DataFrame, Path]:
+        """Score ``features`` and write them through a :class:`ScoreSink`.
+
+        Returns the window keys with their scores and the output path;
+        ``output`` holds the sink options (see :meth:`ScoreSink.from_config`).
+        """
+
         numeric_cols = features.select_dtypes(include=[float, int]).columns
         X = features[numeric_cols].to_numpy(dtype=float)
         scores = selection.best_model.model.score_samples(X)
-        result = features.copy()
-        result["anomaly_score"] = scores
-        result["alert"] = result["anomaly_score"] >= threshold
-        path = Path(output_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        if path.suffix == ".parquet":
-            try:
-                result.to_parquet(path, index=False)
-            except ImportError:
-                path = path.with_suffix(".csv")
-                result.to_csv(path, index=False)
-        else:
-            result.to_csv(path, index=False)
-        return result, path
+        alerts = scores >= threshold
+        with ScoreSink.from_config(output_path, output) as sink:
+            step = sink.row_group_rows
+            for start in range(0, len(features), step):
+                stop = start + step
+                sink.write(
+                    features.iloc[start:stop].assign(anomaly_score=scores[start:stop], alert=alerts[start:stop])
+                )
+        keys = [c for c in KEY_COLUMNS if c in features.columns]
+        result = features[keys].assign(anomaly_score=scores, alert=alerts)
+        return result, sink.path
+
+    def score_batches(
+        self,
+        selection: SelectionResult,
+        batches: Iterable[pd.DataFrame],
+        feature_columns: Sequence[str],
+        output_path: str | Path,
+        threshold: float = 0.9,
+        output: Mapping[str, Any] | None = None,
+    ) -> tuple[int, Path]:
+        """Score feature frames one at a time, appending to ``output_path``.
+
+        ``feature_columns`` are the numeric columns the model was trained
+        on; columns missing from a batch are scored as ``0.0``.
+        """
+
+        with ScoreSink.from_config(output_path, output) as sink:
+            for features in batches:
+                X = features.reindex(columns=list(feature_columns), fill_value=0.0).to_numpy(dtype=float)
+                result = features.assign(anomaly_score=selection.best_model.model.score_samples(X))
+                result["alert"] = result["anomaly_score"] >= threshold
+                sink.write(result)
+        return sink.rows, sink.path
 
 
-__all__ = ["BatchScorer"]
+__all__ = [
+    "BatchScorer",
+    "FrameWriter",
+    "KEY_COLUMNS",
+    "PARQUET_AVAILABLE",
+    "ScoreSink",
+    "iter_written",
+    "read_scores",
+]
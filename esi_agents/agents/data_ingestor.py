@@ -1,7 +1,8 @@
 """Agent responsible for loading and validating data."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from typing import Any
 
 import numpy as np
@@ -15,8 +16,11 @@ from ..adapters import (
     SQLiteAdapter,
     MQTTAdapter,
     OPCUAAdapter,
+    RawWaveformAdapter,
     SchemaRegistry,
+    SignalMetadata,
 )
+from ..features import Waveform
 
 
 @dataclass
@@ -31,6 +35,57 @@ class DataQualitySummary:
 class IngestResult:
     frame: pd.DataFrame
     quality: DataQualitySummary
+    waveforms: list[Waveform] | None = None
+
+    @property
+    def signals(self) -> pd.DataFrame | list[Waveform]:
+        """Input for :meth:`FeatureEngineer.transform`."""
+
+        return self.waveforms if self.waveforms is not None else self.frame
+
+
+@dataclass
+class ChunkedQuality:
+    """Accumulate a :class:`DataQualitySummary` over time-ordered chunks.
+
+    Gaps are judged against each chunk's median spacing, and a channel
+    counts as a flatline when its minimum and maximum agree across all
+    chunks.
+    """
+
+    missing_values: int = 0
+    gap_count: int = 0
+    timestamp_monotonic: bool = True
+    _last: dict[tuple[str, str], Any] = field(default_factory=dict)
+    _ranges: dict[tuple[str, str], tuple[float, float]] = field(default_factory=dict)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.missing_values += int(chunk.isna().sum().sum())
+        keys = ["asset_id", "channel"]
+        if "value" in chunk.columns:
+            stats = chunk.groupby(keys)["value"].agg(["min", "max"])
+            for key, row in stats.iterrows():
+                lo, hi = self._ranges.get(key, (row["min"], row["max"]))
+                self._ranges[key] = (min(lo, row["min"]), max(hi, row["max"]))
+        if "timestamp" not in chunk.columns:
+            return
+        if self.timestamp_monotonic and not chunk["timestamp"].is_monotonic_increasing:
+            self.timestamp_monotonic = False
+        for key, group in chunk.groupby(keys):
+            ts = group["timestamp"]
+            previous = self._last.get(key)
+            if previous is not None and ts.iloc[0] < previous:
+                self.timestamp_monotonic = False
+            gaps = ts.diff().dt.total_seconds().dropna()
+            if not gaps.empty:
+                self.gap_count += int((gaps > gaps.median() * 1.5).sum())
+            self._last[key] = ts.iloc[-1]
+
+    def summary(self) -> DataQualitySummary:
+        flatlines = sum(1 for lo, hi in self._ranges.values() if np.isclose(lo, hi))
+        return DataQualitySummary(
+            self.missing_values, flatlines, self.gap_count, self.timestamp_monotonic
+        )
 
 
 _ADAPTERS = {
@@ -41,6 +96,7 @@ _ADAPTERS = {
     "sqlite": SQLiteAdapter,
     "mqtt": MQTTAdapter,
     "opcua": OPCUAAdapter,
+    "raw_waveform": RawWaveformAdapter,
 }
 
 
@@ -48,7 +104,12 @@ class DataIngestor:
     """Load data according to configuration."""
 
     def __init__(self, schema_registry_path: str | None = None):
-        self.registry = SchemaRegistry(schema_registry_path) if schema_registry_path else None
+        self.registry = SchemaRegistry.open(schema_registry_path) if schema_registry_path else None
+
+    def _registry(self, config: dict[str, Any]) -> SchemaRegistry | None:
+        if self.registry is None and config.get("schema_registry"):
+            return SchemaRegistry.open(config["schema_registry"])
+        return self.registry
 
     def ingest(self, config: dict[str, Any]) -> IngestResult:
         adapter_name = config.get("adapter", "csv").lower()
@@ -57,6 +118,8 @@ class DataIngestor:
             raise ValueError(f"Unknown adapter '{adapter_name}'")
         adapter = adapter_cls()
         params = config.get("params", {})
+        if isinstance(adapter, RawWaveformAdapter):
+            return self._ingest_waveforms(adapter.load_waveforms(params), self._registry(config))
         frame = adapter.load(params)
         if "timestamp" in frame.columns:
             frame = frame.sort_values("timestamp").reset_index(drop=True)
@@ -66,11 +129,73 @@ class DataIngestor:
         if config.get("target_sampling_hz") and "timestamp" in frame.columns:
             frame = self._resample(frame, float(config["target_sampling_hz"]))
         quality = self._compute_quality(frame)
-        if self.registry:
-            metadata = self.registry.infer_from_frame(frame)
-            self.registry.persist(metadata)
+        registry = self._registry(config)
+        if registry:
+            registry.persist(registry.infer_from_frame(frame))
         return IngestResult(frame=frame, quality=quality)
 
+    def iter_chunks(self, config: dict[str, Any], chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Yield the configured input in time-ordered chunks of about ``chunk_rows`` rows.
+
+        Adapters with ``iter_frames`` (CSV, Parquet, structured SQLite,
+        sliced InfluxDB/Timescale queries) are read incrementally; others
+        would have to be loaded whole and are rejected.
+        """
+
+        adapter_name = config.get("adapter", "csv").lower()
+        adapter_cls = _ADAPTERS.get(adapter_name)
+        if adapter_cls is None:
+            raise ValueError(f"Unknown adapter '{adapter_name}'")
+        adapter = adapter_cls()
+        params = dict(config.get("params", {}))
+        params.setdefault("chunk_size", chunk_rows)
+        params.setdefault("batch_size", chunk_rows)
+        incremental = hasattr(adapter, "iter_frames")
+        if isinstance(adapter, SQLiteAdapter):
+            incremental = bool(params.get("table"))
+        elif isinstance(adapter, (InfluxDBAdapter, TimescaleAdapter)):
+            incremental = bool(params.get("slice_duration"))
+        if not incremental:
+            hint = {
+                "sqlite": "; set params.table",
+                "influxdb": "; set params.slice_duration",
+                "timescale": "; set params.slice_duration",
+            }.get(adapter_name, "")
+            raise ValueError(f"Adapter '{adapter_name}' cannot be read in chunks with these params{hint}")
+        for frame in adapter.iter_frames(params):
+            for start in range(0, len(frame), chunk_rows):
+                yield frame.iloc[start : start + chunk_rows]
+
+    def _ingest_waveforms(
+        self, waveforms: list[Waveform], registry: SchemaRegistry | None = None
+    ) -> IngestResult:
+        """Keep memory-mapped waveforms as-is; timestamps are implicit."""
+
+        missing = 0
+        flatlines = 0
+        chunk = 1 << 20
+        for waveform in waveforms:
+            lo, hi = np.inf, -np.inf
+            for start in range(0, len(waveform), chunk):
+                block = np.asarray(waveform.values[start : start + chunk], dtype=float)
+                missing += int(np.isnan(block).sum())
+                if np.isfinite(block).any():
+                    lo = min(lo, float(np.nanmin(block)))
+                    hi = max(hi, float(np.nanmax(block)))
+            if np.isfinite(lo) and np.isclose(lo, hi):
+                flatlines += 1
+        quality = DataQualitySummary(missing, flatlines, 0, True)
+        if registry:
+            metadata = [
+                SignalMetadata(
+                    asset_id=w.asset_id, channel=w.channel, sampling_rate_hz=w.sampling_rate_hz
+                )
+                for w in waveforms
+            ]
+            registry.persist(metadata)
+        frame = pd.DataFrame(columns=["timestamp", "asset_id", "channel", "value"])
+        return IngestResult(frame=frame, quality=quality, waveforms=waveforms)
+
     def _resample(self, frame: pd.DataFrame, target_hz: float) -> pd.DataFrame:
         if target_hz <= 0:
             raise ValueError("target_sampling_hz must be positive")
@@ -108,4 +233,4 @@ class DataIngestor:
         return DataQualitySummary(missing, flatlines, gap_count, monotonic)
 
 
-__all__ = ["DataIngestor", "IngestResult", "DataQualitySummary"]
+__all__ = ["ChunkedQuality", "DataIngestor", "IngestResult", "DataQualitySummary"]
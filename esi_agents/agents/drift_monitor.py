@@ -6,7 +6,6 @@ from typing import Any
 
 import numpy as np
 import pandas as pd
-from scipy.stats import entropy  # type: ignore
 
 
 @dataclass
@@ -34,6 +33,8 @@ class DriftMonitor:
     def assess(
         self, reference: pd.DataFrame, current: pd.DataFrame, features: list[str]
     ) -> DriftResult:
+        from scipy.stats import entropy  # type: ignore
+
         psi: dict[str, float] = {}
         kl: dict[str, float] = {}
         for feature in features:
@@ -6,7 +6,9 @@ from typing import Any
 
 import pandas as pd
 
+from ..adapters import SchemaRegistry
 from ..features import (
+    Waveform,
     Window,
     compute_envelope_features,
     compute_frequency_features,
@@ -24,35 +26,46 @@ class FeatureResult:
     windows: list[Window]
 
 
+_DEFAULT_INCLUDE = {"time": True, "freq": True, "envelope": True, "orders": True}
+
+
 class FeatureEngineer:
-    def transform(self, frame: pd.DataFrame, config: dict[str, Any]) -> FeatureResult:
+    def transform(
+        self, frame: pd.DataFrame | list[Waveform], config: dict[str, Any]
+    ) -> FeatureResult:
         window_cfg = config.get("window", {})
         window_size = int(window_cfg.get("size", 256))
         stride = int(window_cfg.get("stride", window_size // 2))
-        windows = generate_windows(frame, window_size=window_size, stride=stride)
-        records: list[dict[str, Any]] = []
-        include = config.get("features", {"time": True, "freq": True, "envelope": True, "orders": True})
-        for window in windows:
-            feats: dict[str, Any] = {
-                "asset_id": window.asset_id,
-                "channel": window.channel,
-                "window_start": window.start,
-                "window_end": window.end,
-            }
-            if include.get("time", True):
-                feats.update(compute_time_features(window))
-            if include.get("freq", True):
-                feats.update(compute_frequency_features(window))
-                feats.update(dominant_frequencies(window))
-            if include.get("envelope", True):
-                feats.update(compute_envelope_features(window))
-            if include.get("orders", True):
-                feats.update(compute_order_features(window))
-                feats.update(compute_sideband_features(window))
-            records.append(feats)
+        registry = SchemaRegistry.open(config["schema_registry"]) if config.get("schema_registry") else None
+        windows = generate_windows(frame, window_size=window_size, stride=stride, registry=registry)
+        return FeatureResult(matrix=self.transform_windows(windows, config), windows=windows)
+
+    def transform_windows(self, windows: list[Window], config: dict[str, Any]) -> pd.DataFrame:
+        """Compute the feature matrix for already materialised windows."""
+
+        include = config.get("features", _DEFAULT_INCLUDE)
+        records = [self.window_features(window, include) for window in windows]
         feature_frame = pd.DataFrame(records)
         feature_frame = feature_frame.fillna(0.0)
-        return FeatureResult(matrix=feature_frame, windows=windows)
+        return feature_frame
 
+    def window_features(self, window: Window, include: dict[str, Any]) -> dict[str, Any]:
+        feats: dict[str, Any] = {
+            "asset_id": window.asset_id,
+            "channel": window.channel,
+            "window_start": window.start,
+            "window_end": window.end,
+        }
+        if include.get("time", True):
+            feats.update(compute_time_features(window))
+        if include.get("freq", True):
+            feats.update(compute_frequency_features(window))
+            feats.update(dominant_frequencies(window))
+        if include.get("envelope", True):
+            feats.update(compute_envelope_features(window))
+        if include.get("orders", True):
+            feats.update(compute_order_features(window))
+            feats.update(compute_sideband_features(window))
+        return feats
 
 __all__ = ["FeatureEngineer", "FeatureResult"]
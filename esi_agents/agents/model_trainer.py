@@ -8,14 +8,7 @@ import numpy as np
 import pandas as pd
 
 from ..eval import fit_platt_scaler
-from ..models import (
-    ARIMAResidualDetector,
-    HBOSDetector,
-    IsolationForestDetector,
-    LOFDetector,
-    OneClassSVMDetector,
-    STLResidualDetector,
-)
+from ..models import model_class
 
 
 @dataclass
@@ -25,16 +18,6 @@ class TrainedModel:
     scores: np.ndarray
 
 
-_MODEL_FACTORY = {
-    "isolation_forest": IsolationForestDetector,
-    "ocsvm": OneClassSVMDetector,
-    "lof": LOFDetector,
-    "hbos": HBOSDetector,
-    "stl_resid": STLResidualDetector,
-    "arima_resid": ARIMAResidualDetector,
-}
-
-
 class ModelTrainer:
     def train(
         self,
@@ -49,10 +32,7 @@ class ModelTrainer:
         for model_cfg in models_cfg:
             name = model_cfg["name"].lower()
             params = model_cfg.get("params", {})
-            cls = _MODEL_FACTORY.get(name)
-            if cls is None:
-                raise ValueError(f"Unknown model '{name}'")
-            model = cls(**params)
+            model = model_class(name)(**params)
             model.fit(X, labels)
             scores = model.score_samples(X)
             if labels is not None and len(np.unique(labels)) > 1 and hasattr(model, "calibrator"):
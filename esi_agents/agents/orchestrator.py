@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -10,16 +10,61 @@ import numpy as np
 import pandas as pd
 import yaml
 
-from .batch_scorer import BatchScorer
+from ..adapters import SchemaRegistry
+from ..features import ChunkedWindower, FeatureReservoir
+from .batch_scorer import PARQUET_AVAILABLE, BatchScorer, FrameWriter, iter_written
 from .code_reviewer import CodeReviewer
-from .data_ingestor import DataIngestor
+from .data_ingestor import ChunkedQuality, DataIngestor, DataQualitySummary
 from .drift_monitor import DriftMonitor
 from .evaluator import Evaluator
-from .feature_engineer import FeatureEngineer
+from .feature_engineer import FeatureEngineer, FeatureResult
 from .logic_reviewer import LogicReviewer
-from .model_selector import ModelSelector
+from .model_selector import ModelSelector, SelectionResult
 from .model_trainer import ModelTrainer
 from .report_writer import ReportWriter
+from .stages import Stage, StageGraph, StageTiming
+from .tracing import Tracer
+
+
+# Peak traced allocation per input row of a chunked CSV run (raw chunk,
+# per-key copies, windows and their features): about 170 bytes with
+# tracemalloc for 256/128 windows and time+freq features, rounded up for
+# wider inputs. A reservoir window measured about 200 bytes; the rest of
+# ``_BYTES_PER_WINDOW`` covers the copy the trainer takes.
+_BYTES_PER_ROW = 256
+_BYTES_PER_WINDOW = 512
+# Share of ``memory_budget_mb`` kept for the reservoir sample.
+_RESERVOIR_SHARE = 0.25
+_MAX_RESERVOIR = 20_000
+
+
+def _budget_bytes(chunk_cfg: dict[str, Any]) -> float:
+    return float(chunk_cfg.get("memory_budget_mb", 512)) * 2**20
+
+
+def chunk_rows_for_budget(chunk_cfg: dict[str, Any]) -> int:
+    """Rows per chunk for the configured ``memory_budget_mb``."""
+
+    if chunk_cfg.get("chunk_rows"):
+        return int(chunk_cfg["chunk_rows"])
+    budget = _budget_bytes(chunk_cfg) * (1.0 - _RESERVOIR_SHARE)
+    return max(1, int(budget // _BYTES_PER_ROW))
+
+
+def reservoir_size_for_budget(chunk_cfg: dict[str, Any]) -> int:
+    """Reservoir windows for ``memory_budget_mb``, at most 20000 unless ``reservoir_size`` is set."""
+
+    if chunk_cfg.get("reservoir_size"):
+        return int(chunk_cfg["reservoir_size"])
+    budget = _budget_bytes(chunk_cfg) * _RESERVOIR_SHARE
+    return max(1, min(_MAX_RESERVOIR, int(budget // _BYTES_PER_WINDOW)))
+
+
+def _output_suffix(config: dict[str, Any]) -> str:
+    """``.parquet`` unless pyarrow is missing or ``output.format`` asks for CSV."""
+
+    default = "parquet" if PARQUET_AVAILABLE else "csv"
+    return "." + str(config.get("output", {}).get("format", default)).lower()
 
 
 @dataclass
@@ -27,6 +72,18 @@ class OrchestratorResult:
     metrics: dict[str, Any]
     report_path: Path
     scores_path: Path
+    timings: list[StageTiming] = field(default_factory=list)
+    trace_path: Path | None = None
+
+
+@dataclass
+class ChunkedFeatures(FeatureResult):
+    """Reservoir sample of a chunked run plus the spooled full feature set."""
+
+    quality: DataQualitySummary | None = None
+    spool_path: Path | None = None
+    chunk_rows: int = 0
+    keep_spool: bool = True
 
 
 class Orchestrator:
@@ -42,16 +99,14 @@ class Orchestrator:
         self.batch_scorer = BatchScorer()
         self.drift_monitor = DriftMonitor()
 
-    def _window_labels(self, feature_result, labels_df: pd.DataFrame) -> np.ndarray:
+    def _span_labels(self, matrix: pd.DataFrame, labels_df: pd.DataFrame) -> np.ndarray:
         if "timestamp" not in labels_df.columns:
             return labels_df[labels_df.columns[-1]].to_numpy()
         labels_df["timestamp"] = pd.to_datetime(labels_df["timestamp"], format="ISO8601", errors="coerce")
         labels_df = labels_df.sort_values("timestamp")
         label_series = labels_df.set_index("timestamp")[labels_df.columns[-1]]
         window_labels = []
-        for window in feature_result.windows:
-            start = window.start
-            end = window.end
+        for start, end in zip(matrix["window_start"], matrix["window_end"]):
             window_data = label_series.loc[start:end]
             if window_data.empty:
                 window_labels.append(0)
@@ -65,49 +120,250 @@ class Orchestrator:
         input_path: str | None,
         output_dir: str | Path,
         labels_path: str | None = None,
+        resume: bool = False,
     ) -> OrchestratorResult:
+        """Run the pipeline as a checkpointed :class:`StageGraph`.
+
+        With ``resume`` stages whose inputs are unchanged since the last run
+        in ``output_dir`` are skipped. A ``tracing`` config section records
+        every stage and agent call (see :class:`Tracer`).
+        """
+
         config = yaml.safe_load(Path(config_path).read_text())
         if input_path:
             config.setdefault("params", {})["path"] = input_path
         output = Path(output_dir)
         output.mkdir(parents=True, exist_ok=True)
-
-        ingest_result = self.ingestor.ingest(config)
-        feature_result = self.features.transform(ingest_result.frame, config)
-        labels = None
-        if labels_path and Path(labels_path).exists():
-            labels_df = pd.read_csv(labels_path)
-            labels = self._window_labels(feature_result, labels_df)
-        trained = self.trainer.train(feature_result.matrix, config, labels)
-        selection = self.selector.select(trained, labels)
-        evaluation = self.evaluator.evaluate(selection, feature_result, labels, output / "evaluation")
-        drift = None
-        if config.get("reference_features"):
-            ref_path = Path(config["reference_features"])
-            if ref_path.exists():
-                reference = pd.read_parquet(ref_path)
-                numeric_cols = feature_result.matrix.select_dtypes(include=[float, int]).columns.tolist()
-                drift = self.drift_monitor.assess(reference, feature_result.matrix, numeric_cols)
-        scores_path = output / "scores.parquet"
-        _, scores_path = self.batch_scorer.score(selection, feature_result.matrix, scores_path)
-        report_path = self.reporter.write(
-            config,
-            ingest_result.quality,
-            feature_result,
-            selection,
-            evaluation,
-            drift,
-            output / "report.md",
-        )
-        logic_review = self.logic_reviewer.review(evaluation, report_path)
-        code_review = self.code_reviewer.review([scores_path, report_path])
-        reviews = {"logic": logic_review.__dict__, "code": code_review.__dict__}
-        (output / "reviews.json").write_text(json.dumps(reviews, indent=2), encoding="utf-8")
+        with Tracer.from_config(config.get("tracing"), output) as tracer:
+            with tracer.span("Orchestrator.run", resume=resume):
+                graph = StageGraph(
+                    self._stages(config, output, labels_path, tracer), output, resume=resume, tracer=tracer
+                )
+                results = graph.run(targets=["evaluate", "report", "score"])
         return OrchestratorResult(
-            metrics=evaluation.metrics.__dict__,
-            report_path=report_path,
-            scores_path=scores_path,
+            metrics=results["evaluate"].metrics.__dict__,
+            report_path=results["report"],
+            scores_path=results["score"],
+            timings=graph.summary(),
+            trace_path=tracer.path,
+        )
+
+    def _stages(
+        self, config: dict[str, Any], output: Path, labels_path: str | None, tracer: Tracer
+    ) -> list[Stage]:
+        params = config.get("params", {})
+        source_files = [params[key] for key in ("path", "database") if params.get(key)]
+        ingest_cfg = {key: config.get(key) for key in ("adapter", "params", "target_sampling_hz", "schema_registry")}
+        feature_cfg = {key: config.get(key) for key in ("window", "features", "schema_registry")}
+        labels_file = labels_path if labels_path and Path(labels_path).exists() else None
+        scores_path = output / f"scores{_output_suffix(config)}"
+        reference = config.get("reference_features")
+        chunked = bool(config.get("chunked"))
+
+        def labels(features: FeatureResult) -> np.ndarray | None:
+            if labels_file is None:
+                return None
+            return self._span_labels(features.matrix, pd.read_csv(labels_file))
+
+        def ingest():
+            with tracer.span("DataIngestor.ingest") as span:
+                result = self.ingestor.ingest(config)
+                span.set(rows=len(result.frame))
+            return result
+
+        def featurise(ingest):
+            with tracer.span("FeatureEngineer.transform") as span:
+                result = self.features.transform(ingest.signals, config)
+                span.set(rows=len(ingest.frame), windows=len(result.matrix))
+            # Only the matrix is checkpointed; windows may view memory-mapped waveforms.
+            return FeatureResult(result.matrix, windows=[])
+
+        def train(features: FeatureResult, labels: np.ndarray | None):
+            with tracer.span("ModelTrainer.train") as span:
+                trained = self.trainer.train(features.matrix, config, labels)
+                span.set(windows=len(features.matrix), models=[tm.name for tm in trained])
+            return trained
+
+        def select(train, labels: np.ndarray | None) -> SelectionResult:
+            with tracer.span("ModelSelector.select") as span:
+                selection = self.selector.select(train, labels)
+                span.set(best=selection.best_model.name)
+            return selection
+
+        def evaluate(select: SelectionResult, features: FeatureResult, labels: np.ndarray | None):
+            with tracer.span("Evaluator.evaluate") as span:
+                span.set(windows=len(features.matrix))
+                return self.evaluator.evaluate(select, features, labels, output / "evaluation")
+
+        def drift(features: FeatureResult):
+            if not reference or not Path(reference).exists():
+                return None
+            with tracer.span("DriftMonitor.assess") as span:
+                span.set(windows=len(features.matrix))
+                reference_frame = pd.read_parquet(reference)
+                numeric_cols = features.matrix.select_dtypes(include=[float, int]).columns.tolist()
+                return self.drift_monitor.assess(reference_frame, features.matrix, numeric_cols)
+
+        def write_scores(select: SelectionResult, features: FeatureResult) -> Path:
+            with tracer.span("BatchScorer.score") as span:
+                span.set(windows=len(features.matrix))
+                return self.batch_scorer.score(select, features.matrix, scores_path, output=config.get("output"))[1]
+
+        def report(quality, features, select, evaluate, drift) -> Path:
+            with tracer.span("ReportWriter.write"):
+                return self.reporter.write(config, quality, features, select, evaluate, drift, output / "report.md")
+
+        def review(evaluate, report: Path, score: Path) -> Path:
+            with tracer.span("LogicReviewer.review"):
+                logic_review = self.logic_reviewer.review(evaluate, report)
+            with tracer.span("CodeReviewer.review"):
+                code_review = self.code_reviewer.review([score, report])
+            reviews = {"logic": logic_review.__dict__, "code": code_review.__dict__}
+            path = output / "reviews.json"
+            path.write_text(json.dumps(reviews, indent=2), encoding="utf-8")
+            return path
+
+        if chunked:
+            head = [
+                Stage(
+                    "features",
+                    lambda: self._chunked_features(config, output, tracer),
+                    config={**ingest_cfg, **feature_cfg, "chunked": config["chunked"]},
+                    files=source_files,
+                    artifacts=lambda result: [result.spool_path],
+                ),
+                Stage("quality", lambda features: features.quality, inputs=["features"]),
+            ]
+            score = Stage(
+                "score",
+                lambda select, features: self._score_chunked(select, features, config, scores_path, tracer),
+                inputs=["select", "features"],
+                config=config.get("output"),
+                artifacts=lambda path: [path],
+            )
+        else:
+            head = [
+                Stage(
+                    "ingest",
+                    ingest,
+                    config=ingest_cfg,
+                    files=source_files,
+                    checkpoint=False,
+                ),
+                Stage("quality", lambda ingest: ingest.quality, inputs=["ingest"]),
+                Stage(
+                    "features",
+                    featurise,
+                    inputs=["ingest"],
+                    config=feature_cfg,
+                ),
+            ]
+            score = Stage(
+                "score",
+                write_scores,
+                inputs=["select", "features"],
+                config=config.get("output"),
+                artifacts=lambda path: [path],
+            )
+        return [
+            *head,
+            Stage("labels", labels, inputs=["features"], files=[labels_file] if labels_file else []),
+            Stage("train", train, inputs=["features", "labels"], config=config.get("models")),
+            Stage("select", select, inputs=["train", "labels"]),
+            Stage(
+                "evaluate",
+                evaluate,
+                inputs=["select", "features", "labels"],
+                artifacts=lambda result: [output / "evaluation" / "metrics.json", *result.plots.values()],
+            ),
+            Stage(
+                "drift",
+                drift,
+                inputs=["features"],
+                config=reference,
+                files=[reference] if reference else [],
+            ),
+            score,
+            Stage(
+                "report",
+                report,
+                inputs=["quality", "features", "select", "evaluate", "drift"],
+                config=config,
+                artifacts=lambda path: [path],
+            ),
+            Stage(
+                "review",
+                review,
+                inputs=["evaluate", "report", "score"],
+                artifacts=lambda path: [path],
+            ),
+        ]
+
+    def _chunked_features(self, config: dict[str, Any], output: Path, tracer: Tracer) -> ChunkedFeatures:
+        """Featurise the input chunk by chunk, keeping a reservoir sample.
+
+        Features of every window are spooled to disk while a reservoir of
+        ``reservoir_size`` windows is kept for training and evaluation.
+        Without explicit ``chunk_rows``/``reservoir_size`` both are sized
+        from ``memory_budget_mb``.
+        """
+
+        chunk_cfg = config["chunked"] if isinstance(config["chunked"], dict) else {}
+        chunk_rows = chunk_rows_for_budget(chunk_cfg)
+        window_cfg = config.get("window", {})
+        window_size = int(window_cfg.get("size", 256))
+        stride = int(window_cfg.get("stride", window_size // 2))
+        registry = SchemaRegistry.open(config["schema_registry"]) if config.get("schema_registry") else None
+        windower = ChunkedWindower(window_size, stride, registry)
+        reservoir = FeatureReservoir(reservoir_size_for_budget(chunk_cfg), chunk_cfg.get("seed", 0))
+        quality = ChunkedQuality()
+        spool_path = output / f"features{'.parquet' if PARQUET_AVAILABLE else '.csv'}"
+        with FrameWriter(spool_path) as spool:
+            for chunk in self.ingestor.iter_chunks(config, chunk_rows):
+                with tracer.span("FeatureEngineer.chunk") as span:
+                    quality.update(chunk)
+                    windows = windower.feed(chunk)
+                    span.set(rows=len(chunk), windows=len(windows))
+                    if not windows:
+                        continue
+                    matrix = self.features.transform_windows(windows, config)
+                    spool.write(matrix)
+                    reservoir.add(matrix)
+        sample = reservoir.frame()
+        if sample.empty:
+            raise ValueError("Input produced no complete windows")
+        return ChunkedFeatures(
+            matrix=sample,
+            windows=[],
+            quality=quality.summary(),
+            spool_path=spool.path,
+            chunk_rows=chunk_rows,
+            keep_spool=bool(chunk_cfg.get("keep_features", True)),
         )
 
+    def _score_chunked(
+        self,
+        selection: SelectionResult,
+        features: ChunkedFeatures,
+        config: dict[str, Any],
+        path: Path,
+        tracer: Tracer,
+    ) -> Path:
+        """Score the spooled features batch by batch into the scores output."""
+
+        feature_columns = features.matrix.select_dtypes(include=[np.number]).columns.tolist()
+        with tracer.span("BatchScorer.score_batches") as span:
+            written, scores_path = self.batch_scorer.score_batches(
+                selection,
+                iter_written(features.spool_path, features.chunk_rows),
+                feature_columns,
+                path,
+                output=config.get("output"),
+            )
+            span.set(windows=written)
+        if not features.keep_spool:
+            features.spool_path.unlink()
+        return scores_path
+
 
-__all__ = ["Orchestrator", "OrchestratorResult"]
+__all__ = ["Orchestrator", "OrchestratorResult", "chunk_rows_for_budget", "reservoir_size_for_budget"]
@@ -0,0 +1,252 @@
+"""Background retraining and hot swap of the streaming model."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import multiprocessing
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from .drift_monitor import DriftMonitor
+from .model_selector import ModelSelector, SelectionResult
+from .model_trainer import ModelTrainer, TrainedModel
+
+if TYPE_CHECKING:
+    from .stream_scorer import StreamScorer
+
+
+class DecayingReservoir:
+    """Bounded random sample of the feature vectors scored so far.
+
+    Rows are NumPy feature vectors. Every row draws a random priority and
+    the ``capacity`` rows with the lowest priorities are kept, which is a
+    uniform sample of the stream. With ``decay_s`` a row's priority is
+    lowered by its arrival time in units of ``decay_s``. This is
+    Efraimidis-Spirakis weighted sampling with weight ``exp(t / decay_s)``,
+    so the sample favours recent rows; Algorithm R, as used by
+    :class:`~esi_agents.features.FeatureReservoir`, cannot weight rows.
+    Rows that cannot enter a full reservoir are rejected in one vectorised
+    comparison.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 5000,
+        decay_s: float | None = None,
+        seed: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.decay_s = decay_s
+        self.clock = clock
+        self.seen = 0
+        self.rows: np.ndarray | None = None
+        self.keys = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+        self._start = clock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, X: np.ndarray) -> None:
+        X = np.asarray(X, dtype=float)
+        if not len(X):
+            return
+        self.seen += len(X)
+        # log(-log(u)) orders rows like the A-Res key u ** (1 / w), reversed,
+        # and stays finite when the weight exp(t / decay_s) would overflow.
+        keys = np.log(-np.log(self._rng.random(len(X))))
+        if self.decay_s is not None:
+            keys -= (self.clock() - self._start) / self.decay_s
+        if self.rows is None or self.rows.shape[1] != X.shape[1]:
+            self.rows, self.keys = np.empty((0, X.shape[1])), np.empty(0)
+        if len(self.keys) >= self.capacity:
+            enter = keys < self.keys.max()
+            if not enter.any():
+                return
+            X, keys = X[enter], keys[enter]
+        rows, keys = np.concatenate([self.rows, X]), np.concatenate([self.keys, keys])
+        if len(keys) > self.capacity:
+            keep = np.argpartition(keys, self.capacity - 1)[: self.capacity]
+            rows, keys = rows[keep], keys[keep]
+        self.rows, self.keys = rows, keys
+
+    def sample(self) -> np.ndarray:
+        return self.rows.copy() if self.rows is not None else np.empty((0, 0))
+
+
+def _retrain(
+    features: np.ndarray, columns: list[str], config: dict[str, Any], holdout: float, seed: int
+) -> SelectionResult:
+    """Train the configured models on part of ``features`` and select on the rest."""
+
+    order = np.random.default_rng(seed).permutation(len(features))
+    cut = max(1, int(round(len(features) * (1.0 - holdout))))
+    frame = pd.DataFrame(features, columns=columns)
+    trained = ModelTrainer().train(frame.iloc[order[:cut]], config)
+    held = frame.iloc[order[cut:]].to_numpy(dtype=float)
+    if len(held):
+        trained = [TrainedModel(tm.name, tm.model, np.asarray(tm.model.score_samples(held))) for tm in trained]
+    return ModelSelector().select(trained, labels=None)
+
+
+class Retrainer:
+    """Retrain the streaming model in the background and swap it in.
+
+    The feature vectors ``scorer`` computes are sampled into a
+    :class:`DecayingReservoir`. Every ``check_interval_s`` seconds the
+    loop retrains if either holds:
+
+    - ``interval_s`` has passed since the current model was trained.
+    - The largest per-feature PSI between the reservoir and ``reference``
+      (the features the current model was trained on) reaches
+      ``drift_psi``.
+
+    The ``models`` of ``config`` are trained in a separate process (or a
+    thread, with ``executor: thread``) on all but the ``holdout`` fraction
+    of the reservoir. :class:`ModelSelector` ranks them on the held-out
+    rows, and the winner replaces the scorer's model between batches via
+    :meth:`StreamScorer.swap_model`. Ingestion and scoring continue while
+    training runs. ``prepare``, if set, maps each new selection before the
+    swap (the stream pipeline uses it to keep a cascade pre-screen).
+    A check or retrain that raises is counted in ``failures`` and kept as
+    ``last_error``; the current model stays and the loop carries on.
+    """
+
+    def __init__(
+        self,
+        scorer: StreamScorer,
+        config: Mapping[str, Any],
+        reference: pd.DataFrame,
+        interval_s: float | None = None,
+        drift_psi: float | None = None,
+        check_interval_s: float = 30.0,
+        min_samples: int = 500,
+        capacity: int = 5000,
+        decay_s: float | None = None,
+        holdout: float = 0.25,
+        executor: str = "process",
+    ):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown retrain executor '{executor}'; expected 'process' or 'thread'")
+        self.scorer = scorer
+        self.config = dict(config)
+        self.reference = reference
+        self.interval_s = interval_s
+        self.drift_psi = drift_psi
+        self.check_interval_s = check_interval_s
+        self.min_samples = min_samples
+        self.holdout = holdout
+        self.executor_kind = executor
+        self.reservoir = DecayingReservoir(capacity, decay_s)
+        self.retrains = 0
+        self.failures = 0
+        self.last_reason: str | None = None
+        self.last_error: Exception | None = None
+        self.last_drift: float | None = None
+        self.prepare: Callable[[SelectionResult], SelectionResult] | None = None
+        self._trained_at = time.monotonic()
+        self._executor: Executor | None = None
+        self._task: asyncio.Task[None] | None = None
+        scorer.reservoir = self.reservoir
+        if scorer.metrics is not None:
+            scorer.metrics.reservoir_rows.set_function(lambda: len(self.reservoir))
+
+    @classmethod
+    def from_config(
+        cls, scorer: StreamScorer, config: Mapping[str, Any], reference: pd.DataFrame, retrain_cfg: Mapping[str, Any]
+    ) -> Retrainer:
+        """Retrainer for a ``stream.retrain`` section; ``models`` overrides the training models."""
+
+        cfg = dict(retrain_cfg)
+        if "models" in cfg:
+            config = {**config, "models": cfg.pop("models")}
+        return cls(scorer, config, reference, **cfg)
+
+    def start(self) -> Retrainer:
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        return self
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self) -> Retrainer:
+        return self.start()
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
+
+    async def due(self) -> str | None:
+        """Why a retrain is due now (``"schedule"`` or ``"drift"``), if it is."""
+
+        if len(self.reservoir) < self.min_samples:
+            return None
+        if self.interval_s is not None and time.monotonic() - self._trained_at >= self.interval_s:
+            return "schedule"
+        if self.drift_psi is not None:
+            current = pd.DataFrame(self.reservoir.sample(), columns=self.reference.columns)
+            result = await asyncio.to_thread(DriftMonitor().assess, self.reference, current, list(current.columns))
+            self.last_drift = max(result.psi.values(), default=0.0)
+            if self.last_drift >= self.drift_psi:
+                return "drift"
+        return None
+
+    async def retrain(self, reason: str = "manual") -> SelectionResult:
+        """Train on the current reservoir off the event loop and swap the winner in."""
+
+        features = self.reservoir.sample()
+        if self._executor is None:
+            if self.executor_kind == "process":
+                context = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(1, mp_context=context)
+            else:
+                self._executor = ThreadPoolExecutor(1, thread_name_prefix="esi-retrain")
+        loop = asyncio.get_running_loop()
+        selection = await loop.run_in_executor(
+            self._executor,
+            _retrain,
+            features,
+            [str(column) for column in self.reference.columns],
+            self.config,
+            self.holdout,
+            self.retrains,
+        )
+        if self.prepare is not None:
+            selection = self.prepare(selection)
+        self.scorer.swap_model(selection)
+        self.reference = pd.DataFrame(features, columns=self.reference.columns)
+        self._trained_at = time.monotonic()
+        self.retrains += 1
+        self.last_reason = reason
+        return selection
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval_s)
+            try:
+                reason = await self.due()
+                if reason is not None:
+                    await self.retrain(reason)
+            except Exception as exc:  # keep the current model and try again at the next check
+                self.failures += 1
+                self.last_error = exc
+                if self.scorer.metrics is not None:
+                    self.scorer.metrics.retrain_failures.inc()
+                if isinstance(exc, BrokenExecutor) and self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+
+
+__all__ = ["DecayingReservoir", "Retrainer"]
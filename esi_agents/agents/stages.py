@@ -0,0 +1,238 @@
+"""Checkpointed DAG of pipeline stages."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .tracing import Tracer
+
+# Files larger than this are fingerprinted by size, mtime and their first
+# and last block instead of being hashed in full.
+_FULL_HASH_LIMIT = 64 * 2**20
+_BLOCK = 2**20
+
+
+@dataclass
+class Stage:
+    """One step of a :class:`StageGraph`.
+
+    ``fn`` is called with the outputs of ``inputs`` as keyword arguments.
+    The stage's cache key covers ``config`` (the settings it depends on),
+    the content of the ``files`` it reads and the output hashes of its
+    inputs. ``artifacts`` lists files the stage writes; a cached result
+    is only reused while they exist. Stages with ``checkpoint=False`` are
+    not persisted and only run when a stage that runs needs their output.
+    """
+
+    name: str
+    fn: Callable[..., Any]
+    inputs: Sequence[str] = ()
+    config: Any = None
+    files: Sequence[str | Path] = ()
+    artifacts: Callable[[Any], Iterable[str | Path]] | None = None
+    checkpoint: bool = True
+
+
+@dataclass
+class StageTiming:
+    name: str
+    status: str
+    seconds: float = 0.0
+
+
+def fingerprint(path: str | Path) -> str:
+    """Content hash of a file or directory tree."""
+
+    path = Path(path)
+    digest = hashlib.sha256()
+    if not path.exists():
+        digest.update(b"missing")
+        return digest.hexdigest()
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    for item in files:
+        digest.update(str(item.relative_to(path) if path.is_dir() else item.name).encode())
+        stat = item.stat()
+        with item.open("rb") as fh:
+            if stat.st_size <= _FULL_HASH_LIMIT:
+                for block in iter(lambda: fh.read(_BLOCK), b""):
+                    digest.update(block)
+            else:
+                digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+                digest.update(fh.read(_BLOCK))
+                fh.seek(-_BLOCK, os.SEEK_END)
+                digest.update(fh.read(_BLOCK))
+    return digest.hexdigest()
+
+
+class StageGraph:
+    """Run stages in dependency order with content-hash checkpoints.
+
+    Outputs are pickled to ``<run_dir>/.stages`` and recorded in a manifest
+    together with the stage's cache key and an output hash covering the
+    value and the content of its artifacts. With ``resume`` a stage whose key
+    matches the manifest is skipped, and its output is only loaded if a
+    stage that does run needs it. Stages whose inputs are ready run
+    concurrently on up to ``max_workers`` threads. Each stage that runs is
+    recorded as a span named after it on ``tracer``.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        run_dir: str | Path,
+        resume: bool = False,
+        max_workers: int = 4,
+        tracer: Tracer | None = None,
+    ):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        for stage in stages:
+            unknown = set(stage.inputs) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages {sorted(unknown)}")
+        self.state_dir = Path(run_dir) / ".stages"
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.resume = resume
+        self.max_workers = max_workers
+        self.tracer = tracer or Tracer(enabled=False)
+        self.timings: dict[str, StageTiming] = {}
+        self._manifest_path = self.state_dir / "manifest.json"
+        self._manifest: dict[str, dict[str, Any]] = {}
+        if self._manifest_path.exists():
+            self._manifest = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+        self._keys: dict[str, str] = {}
+        self._hashes: dict[str, str] = {}
+        self._values: dict[str, Any] = {}
+        self._locks = {name: threading.Lock() for name in self.stages}
+        self._manifest_lock = threading.Lock()
+
+    def run(self, targets: Sequence[str] = ()) -> dict[str, Any]:
+        """Resolve every stage and return the values of ``targets``."""
+
+        pending = set(self.stages)
+        running: dict[Future[None], str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name in sorted(pending):
+                        stage = self.stages[name]
+                        if not all(dep in self._hashes for dep in stage.inputs):
+                            continue
+                        pending.discard(name)
+                        progressed = True
+                        self._keys[name] = self._key(stage)
+                        if not stage.checkpoint:
+                            self._hashes[name] = self._keys[name]
+                            self.timings[name] = StageTiming(name, "skipped")
+                        elif self._reusable(stage):
+                            self._hashes[name] = self._manifest[name]["output_hash"]
+                            self.timings[name] = StageTiming(name, "cached")
+                        else:
+                            running[executor.submit(self.value, name)] = name
+                if not running:
+                    if pending:
+                        raise ValueError(f"Dependency cycle among stages {sorted(pending)}")
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    future.result()
+        return {name: self.value(name) for name in targets}
+
+    def value(self, name: str) -> Any:
+        """Output of stage ``name``, loading or computing it on first use."""
+
+        with self._locks[name]:
+            if name in self._values:
+                return self._values[name]
+            stage = self.stages[name]
+            if name not in self._keys:
+                raise RuntimeError(f"Stage '{name}' has not been scheduled yet")
+            status = self.timings.get(name)
+            if status is not None and status.status == "cached" and stage.checkpoint:
+                with self._checkpoint(name).open("rb") as fh:
+                    value = pickle.load(fh)
+            else:
+                kwargs = {dep: self.value(dep) for dep in stage.inputs}
+                started = time.perf_counter()
+                with self.tracer.span(name):
+                    value = stage.fn(**kwargs)
+                elapsed = time.perf_counter() - started
+                self.timings[name] = StageTiming(name, "ran", elapsed)
+                self._store(stage, value, elapsed)
+            self._values[name] = value
+            return value
+
+    def summary(self) -> list[StageTiming]:
+        return [self.timings.get(name, StageTiming(name, "pending")) for name in self.stages]
+
+    def _key(self, stage: Stage) -> str:
+        payload = {
+            "stage": stage.name,
+            "config": stage.config,
+            "files": {str(path): fingerprint(path) for path in stage.files},
+            "inputs": {dep: self._hashes[dep] for dep in stage.inputs},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _reusable(self, stage: Stage) -> bool:
+        entry = self._manifest.get(stage.name)
+        if not self.resume or entry is None or entry.get("key") != self._keys[stage.name]:
+            return False
+        if stage.checkpoint and not self._checkpoint(stage.name).exists():
+            return False
+        return all(Path(path).exists() for path in entry.get("artifacts", []))
+
+    def _store(self, stage: Stage, value: Any, elapsed: float) -> None:
+        artifacts = [str(path) for path in stage.artifacts(value)] if stage.artifacts else []
+        if stage.checkpoint:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            digest = hashlib.sha256(payload)
+            for path in artifacts:
+                digest.update(fingerprint(path).encode())
+            output_hash = digest.hexdigest()
+            tmp = self._checkpoint(stage.name).with_suffix(".tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, self._checkpoint(stage.name))
+        else:
+            output_hash = self._keys[stage.name]
+        self._hashes.setdefault(stage.name, output_hash)
+        with self._manifest_lock:
+            self._manifest[stage.name] = {
+                "key": self._keys[stage.name],
+                "output_hash": output_hash,
+                "artifacts": artifacts,
+                "seconds": elapsed,
+            }
+            tmp = self._manifest_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._manifest, indent=2), encoding="utf-8")
+            os.replace(tmp, self._manifest_path)
+
+    def _checkpoint(self, name: str) -> Path:
+        return self.state_dir / f"{name}.pkl"
+
+
+def format_timings(timings: Sequence[StageTiming]) -> str:
+    """Plain-text table of stage statuses and durations."""
+
+    width = max((len(t.name) for t in timings), default=5)
+    lines = [f"{'stage':<{width}}  {'status':<8}  seconds"]
+    for timing in timings:
+        lines.append(f"{timing.name:<{width}}  {timing.status:<8}  {timing.seconds:7.3f}")
+    lines.append(f"{'total':<{width}}  {'':<8}  {sum(t.seconds for t in timings):7.3f}")
+    return "\n".join(lines)
+
+
+__all__ = ["Stage", "StageGraph", "StageTiming", "fingerprint", "format_timings"]
@@ -3,19 +3,379 @@ from __future__ import annotations
 
 import asyncio
 import json
-from collections import defaultdict
-from collections.abc import AsyncIterator, Callable
-from typing import Any
+import pickle
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import pandas as pd
 
+from ..adapters.base import EventBatch, batch_records
+from ..adapters.schema_registry import SchemaRegistry
+from ..features import Window
+from .alerting import AlertPolicy, AlertTracker, KeyAlert
 from .feature_engineer import FeatureEngineer
 from .model_selector import SelectionResult
+from .stream_state import KeyState, StreamState, model_version
+from .telemetry import StreamMetrics
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from .online_scorer import OnlineScorer
+    from .retrainer import DecayingReservoir
+
+
+@dataclass
+class _EventTime:
+    """Per-key event-time policy and the counts of samples it dropped.
+
+    Samples are held until the key's newest timestamp is ``lateness_ns``
+    past them. ``max_gap_ns`` is the largest step between samples that a
+    window may span.
+    """
+
+    lateness_ns: int = 0
+    max_gap_ns: int | None = None
+    dedup: bool = True
+    late: int = 0
+    duplicates: int = 0
+    gaps: int = 0
+
+    @classmethod
+    def from_config(cls, event_time_cfg: Mapping[str, Any]) -> _EventTime:
+        max_gap_s = event_time_cfg.get("max_gap_s")
+        return cls(
+            lateness_ns=int(float(event_time_cfg.get("lateness_s", 0.0)) * 1e9),
+            max_gap_ns=None if max_gap_s is None else int(float(max_gap_s) * 1e9),
+            dedup=bool(event_time_cfg.get("dedup", True)),
+        )
+
+
+class _KeyBuffer:
+    """Columnar sample buffer for one ``(asset_id, channel)`` key.
+
+    Windows are cut every ``stride`` samples once ``window_size`` samples
+    are available, matching :func:`~esi_agents.features.generate_windows`.
+    After a restore, samples at or before ``replay_until`` were already
+    seen before the restart and are dropped. With an :class:`_EventTime`
+    policy, timed samples first wait in a ``held`` reorder buffer (see
+    :meth:`_order`).
+    """
+
+    __slots__ = (
+        "asset_id", "channel", "values", "timestamps", "rpm", "skip", "last_ns", "events", "replay_until",
+        "held_values", "held_timestamps", "held_rpm", "released_ns",
+    )
+
+    def __init__(self, asset_id: str, channel: str):
+        self.asset_id = asset_id
+        self.channel = channel
+        self.values = np.empty(0, dtype=float)
+        self.timestamps = np.empty(0, dtype="datetime64[ns]")
+        self.rpm = np.empty(0, dtype=float)
+        self.skip = 0
+        self.last_ns: int | None = None
+        self.events = 0
+        self.replay_until: int | None = None
+        self.held_values = np.empty(0, dtype=float)
+        self.held_timestamps = np.empty(0, dtype="datetime64[ns]")
+        self.held_rpm = np.empty(0, dtype=float)
+        self.released_ns: int | None = None
+
+    def __len__(self) -> int:
+        return int(self.values.shape[0])
+
+    def extend(
+        self,
+        batch: EventBatch,
+        event_time: _EventTime | None = None,
+        on_gap: Callable[[], None] | None = None,
+    ) -> None:
+        values, timestamps = batch.value, batch.timestamp
+        rpm = batch.rpm if batch.rpm is not None else np.full(len(batch), np.nan)
+        if self.replay_until is not None:
+            fresh = ~(timestamps.view("int64") <= self.replay_until) | np.isnat(timestamps)
+            if fresh.all():
+                self.replay_until = None
+            else:
+                values, timestamps, rpm = values[fresh], timestamps[fresh], rpm[fresh]
+        if len(timestamps):
+            newest = int(timestamps.view("int64").max())
+            if newest != np.iinfo(np.int64).min:
+                self.last_ns = newest if self.last_ns is None else max(self.last_ns, newest)
+        self.events += len(values)
+        if event_time is not None:
+            self._order(values, timestamps, rpm, event_time, on_gap)
+        else:
+            self._append(values, timestamps, rpm)
+
+    def drain(self, event_time: _EventTime, on_gap: Callable[[], None] | None = None) -> None:
+        """Release everything in the reorder buffer, e.g. at end of stream."""
+
+        empty = np.empty(0, dtype=float)
+        self._order(empty, empty.astype("datetime64[ns]"), empty, event_time, on_gap, final=True)
+
+    def _order(
+        self,
+        values: np.ndarray,
+        timestamps: np.ndarray,
+        rpm: np.ndarray,
+        event_time: _EventTime,
+        on_gap: Callable[[], None] | None = None,
+        final: bool = False,
+    ) -> None:
+        """Append samples in event-time order once the watermark passes them.
+
+        Samples at or behind the last released timestamp are late and
+        dropped (counted as duplicates when equal and ``dedup`` is on).
+        Held and new samples are merged with a stable sort, which is linear
+        on already sorted runs, so the first arrival of a timestamp wins.
+        A jump of more than ``max_gap_ns`` between released samples ends
+        the run before it: ``on_gap`` is called so the caller can cut the
+        windows completed so far, then the partial window is discarded.
+        Untimed samples bypass the reorder buffer.
+        """
+
+        ns = timestamps.view("int64")
+        untimed = np.isnat(timestamps)
+        timed = ~untimed
+        if self.released_ns is not None:
+            behind = ns < self.released_ns
+            repeat = ns == self.released_ns if event_time.dedup else np.zeros(len(ns), dtype=bool)
+            event_time.late += int(np.count_nonzero(behind & timed))
+            event_time.duplicates += int(np.count_nonzero(repeat & timed))
+            timed &= ~(behind | repeat)
+        all_ns = np.concatenate([self.held_timestamps.view("int64"), ns[timed]])
+        order = np.argsort(all_ns, kind="stable")
+        all_ns = all_ns[order]
+        all_values = np.concatenate([self.held_values, values[timed]])[order]
+        all_rpm = np.concatenate([self.held_rpm, rpm[timed]])[order]
+        if event_time.dedup and len(all_ns) > 1:
+            first = np.empty(len(all_ns), dtype=bool)
+            first[0] = True
+            np.not_equal(all_ns[1:], all_ns[:-1], out=first[1:])
+            if not first.all():
+                event_time.duplicates += int(np.count_nonzero(~first))
+                all_ns, all_values, all_rpm = all_ns[first], all_values[first], all_rpm[first]
+        if final or not len(all_ns):
+            cut = len(all_ns)
+        else:
+            cut = int(np.searchsorted(all_ns, all_ns[-1] - event_time.lateness_ns, side="right"))
+        self.held_timestamps = all_ns[cut:].view("datetime64[ns]")
+        self.held_values, self.held_rpm = all_values[cut:], all_rpm[cut:]
+        out_ns, out_values, out_rpm = all_ns[:cut], all_values[:cut], all_rpm[:cut]
+        bounds = [0, len(out_ns)]
+        if len(out_ns) and event_time.max_gap_ns is not None:
+            previous = out_ns[0] if self.released_ns is None else self.released_ns
+            steps = np.diff(out_ns, prepend=previous)
+            gaps = np.flatnonzero(steps > event_time.max_gap_ns)
+            event_time.gaps += len(gaps)
+            bounds = [0, *gaps.tolist(), len(out_ns)]
+        if len(out_ns):
+            self.released_ns = int(out_ns[-1])
+        out_ts = out_ns.view("datetime64[ns]")
+        self._append(
+            np.concatenate([values[untimed], out_values[: bounds[1]]]),
+            np.concatenate([timestamps[untimed], out_ts[: bounds[1]]]),
+            np.concatenate([rpm[untimed], out_rpm[: bounds[1]]]),
+        )
+        for lo, hi in zip(bounds[1:-1], bounds[2:]):
+            if on_gap is not None:
+                on_gap()
+            self.values, self.timestamps, self.rpm = out_values[:0], out_ts[:0], out_rpm[:0]
+            self.skip = 0
+            self._append(out_values[lo:hi], out_ts[lo:hi], out_rpm[lo:hi])
+
+    def _append(self, values: np.ndarray, timestamps: np.ndarray, rpm: np.ndarray) -> None:
+        if self.skip:
+            drop = min(self.skip, len(values))
+            values, timestamps, rpm = values[drop:], timestamps[drop:], rpm[drop:]
+            self.skip -= drop
+        if not len(values):
+            return
+        self.values = np.concatenate([self.values, values])
+        self.timestamps = np.concatenate([self.timestamps, timestamps])
+        self.rpm = np.concatenate([self.rpm, rpm])
+
+    def pop_windows(
+        self, window_size: int, stride: int, registry: SchemaRegistry | None = None
+    ) -> list[Window]:
+        windows: list[Window] = []
+        while len(self) >= window_size:
+            windows.append(self._window(window_size, registry))
+            drop = min(stride, len(self))
+            self.values = self.values[drop:]
+            self.timestamps = self.timestamps[drop:]
+            self.rpm = self.rpm[drop:]
+            self.skip = stride - drop
+        return windows
+
+    def state(self) -> KeyState:
+        return KeyState(
+            self.values,
+            self.timestamps,
+            self.rpm,
+            self.skip,
+            self.last_ns,
+            self.events,
+            self.held_values,
+            self.held_timestamps,
+            self.held_rpm,
+            self.released_ns,
+        )
+
+    @classmethod
+    def from_state(cls, key: tuple[str, str], state: KeyState) -> _KeyBuffer:
+        buffer = cls(*key)
+        buffer.values, buffer.timestamps, buffer.rpm = state.values, state.timestamps, state.rpm
+        buffer.skip, buffer.last_ns, buffer.events = state.skip, state.last_ns, state.events
+        buffer.replay_until = state.last_ns
+        if state.held_timestamps is not None:
+            buffer.held_values, buffer.held_timestamps = state.held_values, state.held_timestamps
+            buffer.held_rpm = state.held_rpm
+        buffer.released_ns = state.released_ns
+        return buffer
+
+    def _window(self, window_size: int, registry: SchemaRegistry | None = None) -> Window:
+        timestamps = self.timestamps[:window_size]
+        start, end = pd.Timestamp(timestamps[0]), pd.Timestamp(timestamps[-1])
+        sampling_rate = None
+        if pd.isna(start) or pd.isna(end):
+            start = end = pd.Timestamp.now()
+        elif registry is not None:
+            sampling_rate = registry.resolve_sampling_rate(self.asset_id, self.channel, timestamps)
+        elif window_size > 1 and end > start:
+            sampling_rate = float((window_size - 1) / (end - start).total_seconds())
+        rpm = self.rpm[:window_size]
+        extras: dict[str, Any] = {} if np.isnan(rpm).all() else {"rpm": rpm}
+        return Window(
+            asset_id=self.asset_id,
+            channel=self.channel,
+            start=start,
+            end=end,
+            values=self.values[:window_size],
+            sampling_rate_hz=sampling_rate,
+            extras=extras,
+        )
 
 
 class StreamScorer:
-    def __init__(self, feature_engineer: FeatureEngineer | None = None):
+    """Buffer streamed samples per key and score every completed window.
+
+    With ``metrics`` the event, window and alert counts, per-key buffer
+    fill and feature/scoring latencies are updated once per batch. Buffers
+    live on the scorer, so :meth:`snapshot` and :meth:`restore` can carry
+    them across a restart.
+
+    ``offload`` moves feature extraction and scoring off the event loop
+    (``executor``: ``thread`` or ``process``, ``max_workers``,
+    ``max_in_flight``), so sources keep being drained while windows are
+    scored. Threads suit the NumPy-heavy feature code, which releases the
+    GIL for most of its work; processes suit detectors that do not.
+
+    ``alerting`` (see :class:`~esi_agents.agents.alerting.AlertPolicy`)
+    replaces the per-window ``score >= threshold`` flag with per-key alert
+    state machines and, by default, emits only their transitions. Their
+    state is part of :meth:`snapshot`. When the selected model is a
+    :class:`~esi_agents.models.cascade.CascadeDetector`, each window
+    carries ``escalated`` and :attr:`escalation_rate` reports the share
+    of windows the pre-screen passed on to the full model.
+
+    ``event_time`` makes each key tolerate out-of-order, duplicate and
+    gapped samples: ``lateness_s`` (default 0) bounds how far behind the
+    key's newest sample a sample may arrive and still be put in order,
+    ``dedup`` (default on) drops repeated timestamps, and ``max_gap_s``
+    discards a partial window instead of stitching it across a larger
+    gap. Held samples are released when the stream ends. Dropped samples
+    are counted on :attr:`event_time` and in the metrics.
+
+    An :class:`~esi_agents.agents.online_scorer.OnlineScorer` tapping the
+    same stream can be attached as :attr:`online` so its per-key state is
+    checkpointed along with the buffers.
+    """
+
+    def __init__(
+        self,
+        feature_engineer: FeatureEngineer | None = None,
+        tracer: Tracer | None = None,
+        metrics: StreamMetrics | None = None,
+        offload: Mapping[str, Any] | None = None,
+        alerting: Mapping[str, Any] | None = None,
+        event_time: Mapping[str, Any] | None = None,
+    ):
         self.feature_engineer = feature_engineer or FeatureEngineer()
+        self.tracer = tracer or Tracer(enabled=False)
+        self.metrics = metrics
+        self.offload = dict(offload) if offload else None
+        self.alerting = dict(alerting) if alerting else None
+        self.alert_keys: dict[tuple[str, str], KeyAlert] = {}
+        self.event_time = _EventTime.from_config(event_time) if event_time is not None else None
+        if metrics is not None and self.event_time is not None:
+            ordering = self.event_time
+            metrics.dropped_samples.labels("late").set_function(lambda: ordering.late)
+            metrics.dropped_samples.labels("duplicate").set_function(lambda: ordering.duplicates)
+            metrics.gap_resets.set_function(lambda: ordering.gaps)
+        self.windows_scored = 0
+        self.windows_escalated = 0
+        self._alerts: AlertTracker | None = None
+        self.buffers: dict[tuple[str, str], _KeyBuffer] = {}
+        self.model_version: str | None = None
+        self._restored_version: str | None = None
+        self.reservoir: DecayingReservoir | None = None
+        self.online: OnlineScorer | None = None
+        self._selection: SelectionResult | None = None
+        self._offload: _Offload | None = None
+
+    def snapshot(self) -> StreamState:
+        """Current buffers and progress. Buffer arrays are never modified in
+        place, so the snapshot shares them without copying."""
+
+        extras: dict[str, Any] = {"alerts": {key: KeyAlert(**vars(alert)) for key, alert in self.alert_keys.items()}}
+        if self.online is not None:
+            extras["online"] = self.online.snapshot()
+        return StreamState(
+            keys={key: buffer.state() for key, buffer in self.buffers.items()},
+            model_version=self.model_version,
+            extras=extras,
+        )
+
+    def restore(self, state: StreamState) -> None:
+        """Resume from ``state``; replayed samples already seen are dropped.
+
+        Alert state is only kept if the first run scores with the model
+        version that was saved; another model's scores start it afresh.
+        """
+
+        self.buffers = {key: _KeyBuffer.from_state(key, key_state) for key, key_state in state.keys.items()}
+        self.alert_keys = {key: KeyAlert(**vars(alert)) for key, alert in state.extras.get("alerts", {}).items()}
+        self._restored_version = state.model_version
+        if self.online is not None and "online" in state.extras:
+            self.online.restore(state.extras["online"])
+
+    def swap_model(self, selection: SelectionResult) -> None:
+        """Score windows from the next batch on with ``selection``.
+
+        Called on the event loop between batches, so no batch is split
+        across models; offloaded jobs already submitted finish on the old
+        model and keep its version.
+        """
+
+        self._selection = selection
+        self.model_version = model_version(selection)
+        if self._offload is not None:
+            self._offload.bind(selection, self.model_version)
+        if self.metrics is not None:
+            self.metrics.model_swaps.inc()
+
+    @property
+    def escalation_rate(self) -> float | None:
+        """Fraction of scored windows the cascade escalated, if one is in use."""
+
+        return self.windows_escalated / self.windows_scored if self.windows_scored else None
 
     async def run(
         self,
@@ -24,39 +384,305 @@ class StreamScorer:
         selection: SelectionResult,
         emit: Callable[[dict[str, Any]], None] | None = None,
     ) -> None:
+        """Score a stream of per-sample dict events."""
+
+        batches = batch_records(events, int(config.get("stream_batch_size", 1024)))
+        await self.run_batches(batches, config, selection, emit)
+
+    async def run_batches(
+        self,
+        batches: AsyncIterator[EventBatch],
+        config: dict[str, Any],
+        selection: SelectionResult,
+        emit: Callable[[dict[str, Any]], None] | None = None,
+    ) -> None:
+        """Score a stream of columnar :class:`EventBatch` blocks.
+
+        All windows completed by one batch are featurised and scored with a
+        single ``score_samples`` call, on the event loop or, with
+        ``offload``, on the executor. Each batch is traced as a
+        ``StreamScorer.batch`` span.
+        """
+
         window_cfg = config.get("window", {})
         window_size = int(window_cfg.get("size", 256))
         stride = int(window_cfg.get("stride", window_size // 2))
         threshold = float(config.get("threshold", 0.9))
-        buffers: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+        registry = SchemaRegistry.open(config["schema_registry"]) if config.get("schema_registry") else None
+        if selection is not self._selection:
+            self._selection = selection
+            self.model_version = model_version(selection)
+        if self._restored_version is not None:
+            if self._restored_version != self.model_version:
+                self.alert_keys = {}
+            self._restored_version = None
+        buffers = self.buffers
+        self._alerts = None
+        if self.alerting is not None:
+            self._alerts = AlertTracker(AlertPolicy.from_config(self.alerting, threshold), self.alert_keys)
         emit = emit or (lambda msg: print(json.dumps(msg)))
-        async for event in events:
-            asset_id = str(event["asset_id"])
-            channel = str(event["channel"])
-            key = (asset_id, channel)
-            buffers[key].append(event)
-            if len(buffers[key]) < window_size:
-                continue
-            df = pd.DataFrame(buffers[key])
-            features = self.feature_engineer.transform(df, config)
-            latest = features.matrix.iloc[-1]
-            numeric = latest.select_dtypes(include=[float, int])
-            X = numeric.to_numpy(dtype=float).reshape(1, -1)
-            score = float(selection.best_model.model.score_samples(X)[0])
-            alert = score >= threshold
-            emit(
-                {
-                    "asset_id": asset_id,
-                    "channel": channel,
-                    "timestamp": latest["window_end"].isoformat()
-                    if hasattr(latest["window_end"], "isoformat")
-                    else str(latest["window_end"]),
-                    "anomaly_score": score,
-                    "alert": alert,
-                }
-            )
-            if len(buffers[key]) >= window_size + stride:
-                buffers[key] = buffers[key][stride:]
+        metrics = self.metrics
+        event_time = self.event_time
+        offload = self._offload = _Offload(self, self.offload, selection, emit) if self.offload else None
+
+        def fill(buffer: _KeyBuffer, part: EventBatch | None) -> list[Window]:
+            buffered, held = len(buffer), len(buffer.held_timestamps)
+            windows: list[Window] = []
+
+            def cut() -> None:  # windows completed before an event-time gap
+                windows.extend(buffer.pop_windows(window_size, stride, registry))
+
+            if part is not None:
+                buffer.extend(part, event_time, cut)
+            elif event_time is not None:
+                buffer.drain(event_time, cut)
+            cut()
+            if metrics is not None:
+                metrics.buffered.inc(len(buffer) - buffered)
+                metrics.held_samples.inc(len(buffer.held_timestamps) - held)
+                metrics.buffer_fill.labels(buffer.asset_id, buffer.channel).set(len(buffer) / window_size)
+            return windows
+
+        async def dispatch(ready: list[Window]) -> None:
+            if offload is not None:
+                await offload.submit(ready, config, threshold)
+            else:
+                assert self._selection is not None
+                self._emit(self.score_windows(ready, config, self._selection, threshold), emit)
+
+        try:
+            async for batch in batches:
+                started = time.perf_counter()
+                with self.tracer.span("StreamScorer.batch") as span:
+                    ready: list[Window] = []
+                    with self.tracer.span("StreamScorer.buffer"):
+                        for key, part in batch.groups():
+                            buffer = buffers.get(key)
+                            if buffer is None:
+                                buffer = buffers[key] = _KeyBuffer(*key)
+                            ready.extend(fill(buffer, part))
+                    span.set(rows=len(batch), windows=len(ready))
+                    if ready:
+                        await dispatch(ready)
+                if metrics is not None:
+                    metrics.events.inc(len(batch))
+                    metrics.batches.inc()
+                    metrics.keys.set(len(buffers))
+                    metrics.batch_windows.observe(len(ready))
+                    metrics.batch_latency.observe(time.perf_counter() - started)
+            if event_time is not None:
+                ready = [window for buffer in buffers.values() for window in fill(buffer, None)]
+                if ready:
+                    await dispatch(ready)
+        except BaseException:
+            if offload is not None:
+                offload.abort()
+            raise
+        finally:
+            self._offload = None
+        if offload is not None:
+            await offload.close()
+
+    def score_windows(
+        self,
+        windows: list[Window],
+        config: dict[str, Any],
+        selection: SelectionResult,
+        threshold: float,
+    ) -> list[dict[str, Any]]:
+        version = self.model_version if selection is self._selection else model_version(selection)
+        scored = _score(
+            self.feature_engineer, selection.best_model.model, windows, config, threshold, self.tracer, version
+        )
+        self._record(scored)
+        return scored.messages
+
+    def _record(self, scored: _Scored) -> None:
+        if self.metrics is not None:
+            self.metrics.feature_latency.observe(scored.feature_s)
+            self.metrics.score_latency.observe(scored.score_s)
+            self.metrics.windows.inc(len(scored.messages))
+            self.metrics.alerts.inc(scored.alerts)
+        if scored.escalated is not None:
+            self.windows_scored += len(scored.messages)
+            self.windows_escalated += scored.escalated
+            if self.metrics is not None:
+                self.metrics.prescreened.inc(len(scored.messages))
+                self.metrics.escalated.inc(scored.escalated)
+        if self.reservoir is not None and scored.features is not None:
+            self.reservoir.add(scored.features)
+
+    def _emit(self, messages: list[dict[str, Any]], emit: Callable[[dict[str, Any]], None]) -> None:
+        with self.tracer.span("StreamScorer.emit"):
+            if self._alerts is not None:
+                messages = self._alerts.update(messages)
+                if self.metrics is not None:
+                    for message in messages:
+                        if "event" in message:
+                            self.metrics.alert_events.labels(message["event"]).inc()
+            for message in messages:
+                emit(message)
+
+
+@dataclass
+class _Scored:
+    messages: list[dict[str, Any]]
+    feature_s: float
+    score_s: float
+    alerts: int
+    escalated: int | None = None
+    features: np.ndarray | None = None
+
+
+def _score(
+    feature_engineer: FeatureEngineer,
+    model: Any,
+    windows: list[Window],
+    config: dict[str, Any],
+    threshold: float,
+    tracer: Tracer | None = None,
+    version: str | None = None,
+) -> _Scored:
+    """Featurise and score ``windows``; safe to run off the event loop.
+
+    Messages carry the ``model_version`` that scored them.
+    """
+
+    tracer = tracer or _NO_TRACER
+    started = time.perf_counter()
+    with tracer.span("FeatureEngineer.transform_windows", windows=len(windows)):
+        matrix = feature_engineer.transform_windows(windows, config)
+    X = matrix.select_dtypes(include=[np.number]).to_numpy(dtype=float)
+    featurised = time.perf_counter()
+    cascade = getattr(model, "score_cascade", None)
+    with tracer.span("StreamScorer.score", windows=len(windows)) as span:
+        if cascade is not None:
+            scores, escalated = cascade(X)
+            span.set(escalated=int(np.count_nonzero(escalated)))
+        else:
+            scores, escalated = np.asarray(model.score_samples(X)), None
+    scored_at = time.perf_counter()
+    alert = scores >= threshold
+    if escalated is not None:
+        alert &= escalated
+    messages: list[dict[str, Any]] = []
+    for i, (window, score) in enumerate(zip(windows, scores)):
+        message = {
+            "asset_id": window.asset_id,
+            "channel": window.channel,
+            "timestamp": window.end.isoformat(),
+            "anomaly_score": float(score),
+            "alert": bool(alert[i]),
+            "model_version": version,
+        }
+        if escalated is not None:
+            message["escalated"] = bool(escalated[i])
+        messages.append(message)
+    return _Scored(
+        messages,
+        featurised - started,
+        scored_at - featurised,
+        int(np.count_nonzero(alert)),
+        None if escalated is None else int(np.count_nonzero(escalated)),
+        X,
+    )
+
+
+_NO_TRACER = Tracer(enabled=False)
+# Feature engineer, model and model version of an offload worker process.
+_WORKER_STATE: tuple[FeatureEngineer, Any, str | None] | None = None
+
+
+def _init_offload_worker(selection_bytes: bytes, version: str | None) -> None:
+    global _WORKER_STATE
+    selection = pickle.loads(selection_bytes)
+    _WORKER_STATE = (FeatureEngineer(), selection.best_model.model, version)
+
+
+def _score_in_worker(windows: list[Window], config: dict[str, Any], threshold: float) -> _Scored:
+    assert _WORKER_STATE is not None, "offload worker was not initialised"
+    feature_engineer, model, version = _WORKER_STATE
+    return _score(feature_engineer, model, windows, config, threshold, version=version)
+
+
+class _Offload:
+    """Featurise and score windows on an executor while the loop keeps ingesting.
+
+    At most ``max_in_flight`` jobs are queued or running; submitting
+    beyond that waits, which backs pressure up into the source. Results are
+    emitted in submission order, so windows of a key leave in order.
+    :meth:`bind` switches the model for later jobs; a process pool is
+    replaced, and the old one finishes its queued jobs before exiting.
+    """
+
+    def __init__(
+        self,
+        scorer: StreamScorer,
+        offload_cfg: Mapping[str, Any],
+        selection: SelectionResult,
+        emit: Callable[[dict[str, Any]], None],
+    ):
+        self.kind = str(offload_cfg.get("executor", "thread"))
+        if self.kind not in ("thread", "process"):
+            raise ValueError(f"Unknown offload executor '{self.kind}'; expected 'thread' or 'process'")
+        self.workers = int(offload_cfg.get("max_workers", 2))
+        self.scorer = scorer
+        self.emit = emit
+        self.slots = asyncio.Semaphore(int(offload_cfg.get("max_in_flight", 2 * self.workers)))
+        self.executor: Executor | None = None
+        self.fn: Callable[..., _Scored] = _score_in_worker
+        self.bind(selection, scorer.model_version)
+        self.queue: asyncio.Queue[asyncio.Future[_Scored] | None] = asyncio.Queue()
+        self.emitter = asyncio.get_running_loop().create_task(self._emit_in_order())
+
+    def bind(self, selection: SelectionResult, version: str | None) -> None:
+        if self.kind == "thread":
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="esi-score")
+            model = selection.best_model.model
+            self.fn = partial(_score, self.scorer.feature_engineer, model, tracer=self.scorer.tracer, version=version)
+            return
+        payload = pickle.dumps(selection, protocol=pickle.HIGHEST_PROTOCOL)
+        retired, self.executor = self.executor, ProcessPoolExecutor(
+            self.workers, initializer=_init_offload_worker, initargs=(payload, version)
+        )
+        if retired is not None:
+            retired.shutdown(wait=False)
+
+    async def submit(self, windows: list[Window], config: dict[str, Any], threshold: float) -> None:
+        if self.slots.locked():
+            reserve = asyncio.ensure_future(self.slots.acquire())
+            await asyncio.wait({reserve, self.emitter}, return_when=asyncio.FIRST_COMPLETED)
+            if not reserve.done():
+                reserve.cancel()
+                self.emitter.result()  # re-raise what stopped the emitter
+        else:
+            await self.slots.acquire()
+        loop = asyncio.get_running_loop()
+        self.queue.put_nowait(loop.run_in_executor(self.executor, self.fn, windows, config, threshold))
+
+    async def close(self) -> None:
+        self.queue.put_nowait(None)
+        try:
+            await self.emitter
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True)
+
+    def abort(self) -> None:
+        self.emitter.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _emit_in_order(self) -> None:
+        while True:
+            future = await self.queue.get()
+            if future is None:
+                return
+            scored = await future
+            self.slots.release()
+            self.scorer._record(scored)
+            self.scorer._emit(scored.messages, self.emit)
 
 
 __all__ = ["StreamScorer"]
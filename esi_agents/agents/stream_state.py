@@ -0,0 +1,154 @@
+"""Checkpointing of :class:`StreamScorer` state."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import pickle
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from .model_selector import SelectionResult
+    from .stream_scorer import StreamScorer
+
+_FORMAT = 1
+
+
+@dataclass
+class KeyState:
+    """Buffered samples and progress of one ``(asset_id, channel)`` key."""
+
+    values: np.ndarray
+    timestamps: np.ndarray
+    rpm: np.ndarray
+    skip: int = 0
+    last_ns: int | None = None
+    events: int = 0
+    # Reorder buffer and release mark under event-time handling.
+    held_values: np.ndarray | None = None
+    held_timestamps: np.ndarray | None = None
+    held_rpm: np.ndarray | None = None
+    released_ns: int | None = None
+
+
+@dataclass
+class StreamState:
+    """Everything a restarted scorer needs to resume without a blind spot.
+
+    ``extras`` holds the state of optional scorer components (for example
+    alert hysteresis), keyed by component.
+    """
+
+    keys: dict[tuple[str, str], KeyState]
+    model_version: str | None = None
+    saved_at: float = field(default_factory=time.time)
+    extras: dict[str, Any] = field(default_factory=dict)
+
+    def resume_point(self) -> pd.Timestamp | None:
+        """Earliest last-seen timestamp over all keys.
+
+        Replaying a source from here covers every key's gap; samples a key
+        has already seen are dropped by the scorer.
+        """
+
+        marks = [key.last_ns for key in self.keys.values() if key.last_ns is not None]
+        return pd.Timestamp(min(marks)) if marks else None
+
+
+def model_version(selection: SelectionResult) -> str:
+    """Short content hash of the selected model."""
+
+    payload = pickle.dumps(selection.best_model.model, protocol=pickle.HIGHEST_PROTOCOL)
+    return f"{selection.best_model.name}-{hashlib.sha256(payload).hexdigest()[:12]}"
+
+
+def save_state(state: StreamState, path: str | Path) -> Path:
+    """Write ``state`` to ``path`` via a synced temporary file and an atomic rename."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as fh:
+        pickle.dump({"format": _FORMAT, "state": state}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    return path
+
+
+def load_state(path: str | Path) -> StreamState | None:
+    """State saved at ``path``, or ``None`` when there is no usable checkpoint."""
+
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with path.open("rb") as fh:
+            payload = pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != _FORMAT:
+        return None
+    return payload["state"]
+
+
+class StreamCheckpointer:
+    """Periodically save a running scorer's state from a background task.
+
+    The snapshot is taken on the event loop between batches, so it is
+    consistent without locking; pickling and the write happen on a worker
+    thread so scoring is not blocked by disk I/O. :meth:`stop` writes a
+    final checkpoint.
+    """
+
+    def __init__(self, scorer: StreamScorer, path: str | Path, interval_s: float = 5.0):
+        self.scorer = scorer
+        self.path = Path(path)
+        self.interval_s = interval_s
+        self.saved = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> StreamCheckpointer:
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        return self
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.save()
+
+    async def save(self) -> None:
+        state = self.scorer.snapshot()
+        await asyncio.to_thread(save_state, state, self.path)
+        self.saved += 1
+
+    async def __aenter__(self) -> StreamCheckpointer:
+        return self.start()
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            await self.save()
+
+
+__all__ = [
+    "KeyState",
+    "StreamCheckpointer",
+    "StreamState",
+    "load_state",
+    "model_version",
+    "save_state",
+]
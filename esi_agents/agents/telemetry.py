@@ -0,0 +1,395 @@
+"""In-process metrics registry with a Prometheus text endpoint."""
+from __future__ import annotations
+
+import math
+import os
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+# Latency buckets in seconds, from 100 µs to 10 s.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._child()
+
+    def labels(self, *values: Any) -> Any:
+        """Child metric for one combination of label values."""
+
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._child())
+        return child
+
+    def remove(self, *values: Any) -> None:
+        with self._lock:
+            self._children.pop(tuple(str(value) for value in values), None)
+
+    def _default(self) -> Any:
+        if self.labelnames:
+            raise ValueError(f"{self.name} is labelled; use .labels(...)")
+        return self.labels()
+
+    def _child(self) -> Any:
+        raise NotImplementedError
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in children:
+            yield from child.samples(self.name, self.labelnames, values)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value", "fn")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.fn: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Read the value from ``fn`` at collection time."""
+
+        self.fn = fn
+
+    def get(self) -> float:
+        return float(self.fn()) if self.fn is not None else self.value
+
+    def samples(self, name: str, labelnames: Sequence[str], values: Sequence[str]) -> Iterator[str]:
+        yield f"{name}{_labels(labelnames, values)} {_number(self.get())}"
+
+
+class Counter(_Metric):
+    """Monotonic count. ``inc`` is a plain float add; the GIL keeps it exact
+    for the single scoring thread that owns the hot path."""
+
+    kind = "counter"
+
+    def _child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def get(self) -> float:
+        return self._default().get()
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Report ``fn()`` at collection time, e.g. a count kept elsewhere."""
+
+        self._default().set_function(fn)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labelnames: Sequence[str], values: Sequence[str]) -> Iterator[str]:
+        cumulative = 0
+        for bound, count in zip((*self.bounds, math.inf), self.counts):
+            cumulative += count
+            le = f'le="{_number(bound)}"'
+            yield f"{name}_bucket{_labels(labelnames, values, le)} {cumulative}"
+        yield f"{name}_sum{_labels(labelnames, values)} {_number(self.sum)}"
+        yield f"{name}_count{_labels(labelnames, values)} {self.count}"
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed, sorted upper ``buckets``."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, help, labelnames)
+
+    def _child(self) -> _Buckets:
+        return _Buckets(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms rendered in the Prometheus
+    text exposition format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def get(self, name: str) -> _Metric:
+        return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+    def dump(self, path: str | Path) -> Path:
+        """Atomically write the current exposition to ``path``."""
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    def _register(self, metric: Any) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric '{metric.name}' is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+class MetricsExporter:
+    """Serve ``registry`` at ``http://host:port/metrics`` and/or dump it to
+    ``path`` every ``interval_s`` seconds, both from daemon threads.
+
+    ``port=0`` picks a free port (see :attr:`port` once started).
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        host: str = "127.0.0.1",
+        port: int | None = None,
+        path: str | Path | None = None,
+        interval_s: float = 10.0,
+    ):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.path = Path(path) if path else None
+        self.interval_s = interval_s
+        self._server: ThreadingHTTPServer | None = None
+        self._threads: list[threading.Thread] = []
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_config(
+        cls, metrics_cfg: Mapping[str, Any] | None, registry: MetricsRegistry, output_dir: str | Path = "."
+    ) -> MetricsExporter | None:
+        """Exporter for a config's ``metrics`` section (``host``, ``port``,
+        ``path``, ``interval_s``); ``None`` when neither endpoint nor file
+        is configured."""
+
+        cfg = dict(metrics_cfg or {})
+        if cfg.get("port") is None and not cfg.get("path"):
+            return None
+        return cls(
+            registry,
+            host=str(cfg.get("host", "127.0.0.1")),
+            port=None if cfg.get("port") is None else int(cfg["port"]),
+            path=Path(output_dir) / cfg["path"] if cfg.get("path") else None,
+            interval_s=float(cfg.get("interval_s", 10.0)),
+        )
+
+    def start(self) -> MetricsExporter:
+        if self.port is not None:
+            self._server = ThreadingHTTPServer((self.host, self.port), _handler(self.registry))
+            self._server.daemon_threads = True
+            self.port = self._server.server_address[1]
+            self._spawn("esi-metrics-http", self._server.serve_forever)
+        if self.path is not None:
+            self._spawn("esi-metrics-dump", self._dump_loop)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+        if self.path is not None:
+            self.registry.dump(self.path)
+
+    def __enter__(self) -> MetricsExporter:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _spawn(self, name: str, target: Callable[[], None]) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _dump_loop(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.registry.dump(self.path)
+
+
+def _handler(registry: MetricsRegistry) -> type[BaseHTTPRequestHandler]:
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return None
+
+    return _MetricsHandler
+
+
+class StreamMetrics:
+    """The streaming scorer's metrics on ``registry``."""
+
+    def __init__(self, registry: MetricsRegistry | None = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.events = r.counter("esi_stream_events_total", "Samples received by the scorer")
+        self.batches = r.counter("esi_stream_batches_total", "Event batches processed")
+        self.windows = r.counter("esi_stream_windows_total", "Windows scored")
+        self.alerts = r.counter("esi_stream_alerts_total", "Windows scored at or above the threshold")
+        self.alert_events = r.counter(
+            "esi_stream_alert_events_total", "Alert state transitions under hysteresis", ("event",)
+        )
+        self.prescreened = r.counter("esi_stream_prescreened_windows_total", "Windows scored by the cascade pre-screen")
+        self.escalated = r.counter("esi_stream_escalated_windows_total", "Windows escalated to the full model")
+        self.buffer_fill = r.gauge(
+            "esi_stream_buffer_fill_ratio",
+            "Buffered samples per key as a fraction of the window size",
+            ("asset_id", "channel"),
+        )
+        self.buffered = r.gauge("esi_stream_buffered_samples", "Samples held in key buffers")
+        self.keys = r.gauge("esi_stream_keys", "Active (asset_id, channel) buffers")
+        self.queue_depth = r.gauge("esi_stream_queue_depth", "Batches waiting in the merged input queue")
+        self.late_events = r.counter("esi_stream_late_events_total", "Samples that arrived behind the merge watermark")
+        self.source_lag = r.gauge(
+            "esi_stream_source_lag_seconds", "Event-time lag of a merged source behind the newest event", ("source",)
+        )
+        self.source_idle = r.gauge(
+            "esi_stream_source_idle_seconds", "Seconds since a merged source last delivered a batch", ("source",)
+        )
+        self.dropped_samples = r.counter(
+            "esi_stream_dropped_samples_total", "Samples dropped by per-key event-time handling", ("reason",)
+        )
+        self.gap_resets = r.counter("esi_stream_gap_resets_total", "Window buffers reset at an event-time gap")
+        self.held_samples = r.gauge("esi_stream_held_samples", "Samples waiting in per-key reorder buffers")
+        self.model_swaps = r.counter("esi_stream_model_swaps_total", "Models swapped in by background retraining")
+        self.reservoir_rows = r.gauge("esi_stream_reservoir_rows", "Feature vectors held for retraining")
+        self.retrain_failures = r.counter(
+            "esi_stream_retrain_failures_total", "Background retraining checks or runs that raised"
+        )
+        self.change_points = r.counter(
+            "esi_stream_change_points_total", "Change points signalled by per-sample detectors", ("detector",)
+        )
+        self.batch_latency = r.histogram("esi_stream_batch_seconds", "Time to process one event batch")
+        self.feature_latency = r.histogram("esi_stream_feature_seconds", "Feature extraction time per scoring call")
+        self.score_latency = r.histogram("esi_stream_score_seconds", "Model scoring time per scoring call")
+        self.batch_windows = r.histogram(
+            "esi_stream_batch_windows",
+            "Windows completed per event batch",
+            buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+        )
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "LATENCY_BUCKETS",
+    "MetricsExporter",
+    "MetricsRegistry",
+    "StreamMetrics",
+]
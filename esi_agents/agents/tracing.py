@@ -0,0 +1,302 @@
+"""Lightweight spans for timing and profiling pipeline stages."""
+from __future__ import annotations
+
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class SpanRecord:
+    """A finished span. ``start`` is seconds since the epoch; ``peak_bytes``
+    is the rise in traced memory over the span (``None`` unless the tracer
+    tracks memory)."""
+
+    name: str
+    span_id: int
+    parent_id: int | None
+    thread: str
+    start: float
+    wall_s: float
+    cpu_s: float
+    rows: int | None = None
+    windows: int | None = None
+    peak_bytes: int | None = None
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+class Span:
+    """Handle of an open span; :meth:`set` records counts and attributes."""
+
+    __slots__ = ("name", "span_id", "parent_id", "rows", "windows", "attrs", "_base_bytes", "_max_bytes")
+
+    def __init__(self, name: str, span_id: int, parent_id: int | None, attrs: dict[str, Any]):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.rows: int | None = None
+        self.windows: int | None = None
+        self.attrs = attrs
+        self._base_bytes = 0
+        self._max_bytes = 0
+
+    def set(self, rows: int | None = None, windows: int | None = None, **attrs: Any) -> None:
+        if rows is not None:
+            self.rows = int(rows)
+        if windows is not None:
+            self.windows = int(windows)
+        self.attrs.update(attrs)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, rows: int | None = None, windows: int | None = None, **attrs: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Record nested spans with wall/CPU time and processed counts.
+
+    Finished spans are appended to the JSONL file at ``path`` and, with
+    ``chrome_path``, written as a Chrome trace (``chrome://tracing`` /
+    Perfetto) on :meth:`close`. They are only kept in :attr:`records` for
+    the Chrome trace or when there is no ``path``. With ``memory`` the
+    tracer runs ``tracemalloc`` and records each span's peak allocation. Stages named
+    in ``profile`` are run under ``cProfile`` and those in
+    ``profile_memory`` get a ``tracemalloc`` snapshot diff; both are
+    written to ``profile_dir``. CPU time is per thread. A span opened on a
+    thread with no open span is parented to the outermost open span, so
+    stages run on worker threads nest under the run.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        chrome_path: str | Path | None = None,
+        memory: bool = False,
+        profile: Sequence[str] = (),
+        profile_memory: Sequence[str] = (),
+        profile_dir: str | Path | None = None,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.path = Path(path) if path else None
+        self.chrome_path = Path(chrome_path) if chrome_path else None
+        self.memory = memory and enabled
+        self.profile = set(profile) if enabled else set()
+        self.profile_memory = set(profile_memory) if enabled else set()
+        self.profile_dir = Path(profile_dir) if profile_dir else Path(".")
+        self.records: list[SpanRecord] = []
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open: dict[int, Span] = {}
+        self._root: Span | None = None
+        self._file: io.TextIOWrapper | None = None
+        self._started_tracemalloc = False
+        self._pid = os.getpid()
+        if self.path is not None and enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("w", encoding="utf-8")
+        if (self.memory or self.profile_memory) and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    @classmethod
+    def from_config(cls, tracing_cfg: Mapping[str, Any] | bool | None, output_dir: str | Path = ".") -> Tracer:
+        """Tracer for a config's ``tracing`` section; disabled when absent.
+
+        Relative ``path``, ``chrome`` and ``profile_dir`` entries resolve
+        against ``output_dir``.
+        """
+
+        if not tracing_cfg:
+            return cls(enabled=False)
+        cfg = dict(tracing_cfg) if isinstance(tracing_cfg, Mapping) else {}
+        if not cfg.get("enabled", True):
+            return cls(enabled=False)
+        base = Path(output_dir)
+
+        def resolve(value: Any) -> Path | None:
+            return None if not value else base / value
+
+        return cls(
+            path=resolve(cfg.get("path", "trace.jsonl")),
+            chrome_path=resolve(cfg.get("chrome")),
+            memory=bool(cfg.get("memory", False)),
+            profile=list(cfg.get("profile", [])),
+            profile_memory=list(cfg.get("profile_memory", [])),
+            profile_dir=resolve(cfg.get("profile_dir", "profiles")),
+        )
+
+    @contextmanager
+    def span(
+        self, name: str, rows: int | None = None, windows: int | None = None, **attrs: Any
+    ) -> Iterator[Span | _NullSpan]:
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+        stack = self._stack()
+        with self._lock:
+            parent = stack[-1] if stack else self._root
+            span = Span(name, next(self._ids), parent.span_id if parent else None, attrs)
+            self._open[span.span_id] = span
+            if self._root is None:
+                self._root = span
+        span.set(rows=rows, windows=windows)
+        if self.memory:
+            self._fold_peak(start=span)
+        stack.append(span)
+        profiler = cProfile.Profile() if name in self.profile else None
+        snapshot = tracemalloc.take_snapshot() if name in self.profile_memory else None
+        start, wall, cpu = time.time(), time.perf_counter(), time.thread_time()
+        if profiler is not None:
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler is active (Python 3.12+)
+                profiler = None
+        try:
+            yield span
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            stack.pop()
+            if self.memory:
+                self._fold_peak()
+            with self._lock:
+                del self._open[span.span_id]
+                if self._root is span:
+                    self._root = None
+            record = SpanRecord(
+                name=name,
+                span_id=span.span_id,
+                parent_id=span.parent_id,
+                thread=threading.current_thread().name,
+                start=start,
+                wall_s=wall,
+                cpu_s=cpu,
+                rows=span.rows,
+                windows=span.windows,
+                peak_bytes=span._max_bytes - span._base_bytes if self.memory else None,
+                attrs=span.attrs,
+            )
+            self._emit(record)
+            if profiler is not None:
+                self._dump_profile(name, span.span_id, profiler)
+            if snapshot is not None:
+                self._dump_memory(name, span.span_id, snapshot)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.chrome_path is not None and self.enabled:
+            write_chrome_trace(self.records, self.chrome_path, self._pid)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self) -> Tracer:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _fold_peak(self, start: Span | None = None) -> None:
+        # tracemalloc keeps one global peak. At every span boundary the
+        # peak since the last boundary is folded into each open span and
+        # then reset, so concurrent and nested spans all see their maximum.
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            for span in self._open.values():
+                span._max_bytes = max(span._max_bytes, peak)
+            if start is not None:
+                start._base_bytes = start._max_bytes = current
+            tracemalloc.reset_peak()
+
+    def _emit(self, record: SpanRecord) -> None:
+        with self._lock:
+            if self.chrome_path is not None or self.path is None:
+                self.records.append(record)
+            if self._file is not None:
+                self._file.write(json.dumps(asdict(record), default=str) + "\n")
+                self._file.flush()
+
+    def _dump_profile(self, name: str, span_id: int, profiler: cProfile.Profile) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.profile_dir / f"{name}-{span_id}"
+        profiler.dump_stats(stem.with_suffix(".prof"))
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(30)
+        stem.with_suffix(".txt").write_text(text.getvalue(), encoding="utf-8")
+
+    def _dump_memory(self, name: str, span_id: int, before: tracemalloc.Snapshot) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        stats = tracemalloc.take_snapshot().compare_to(before, "lineno")
+        lines = [str(stat) for stat in stats[:30]]
+        (self.profile_dir / f"{name}-{span_id}.mem.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+_CHROME_ARGS = ("cpu_s", "rows", "windows", "peak_bytes")
+
+
+def write_chrome_trace(records: Sequence[SpanRecord], path: str | Path, pid: int = 0) -> Path:
+    """Write spans as complete (``"ph": "X"``) events of the Chrome trace format."""
+
+    threads: dict[str, int] = {}
+    events: list[dict[str, Any]] = []
+    for record in records:
+        tid = threads.setdefault(record.thread, len(threads) + 1)
+        args = {key: getattr(record, key) for key in _CHROME_ARGS if getattr(record, key) is not None}
+        args.update(record.attrs)
+        events.append(
+            {
+                "name": record.name,
+                "cat": record.name.split(".")[0],
+                "ph": "X",
+                "ts": record.start * 1e6,
+                "dur": record.wall_s * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            }
+        )
+    for name, tid in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": events}, default=str), encoding="utf-8")
+    return path
+
+
+def read_trace(path: str | Path) -> list[SpanRecord]:
+    """Spans recorded in a JSONL trace file."""
+
+    with Path(path).open(encoding="utf-8") as fh:
+        return [SpanRecord(**json.loads(line)) for line in fh if line.strip()]
+
+
+__all__ = ["Span", "SpanRecord", "Tracer", "read_trace", "write_chrome_trace"]
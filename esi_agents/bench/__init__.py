@@ -0,0 +1,23 @@
+"""Benchmarks and synthetic data for the ESI pipeline."""
+from .._lazy import attach
+
+_EXPORTS = {
+    "FleetSpec": ".synthetic",
+    "SyntheticFleet": ".synthetic",
+    "InjectedFault": ".synthetic",
+    "generate_fleet": ".synthetic",
+    "write_fleet": ".synthetic",
+    "BenchCase": ".suite",
+    "BenchContext": ".suite",
+    "build_suite": ".suite",
+    "BenchResult": ".runner",
+    "Regression": ".runner",
+    "compare": ".runner",
+    "load_results": ".runner",
+    "run_case": ".runner",
+    "save_results": ".runner",
+    "select_cases": ".runner",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
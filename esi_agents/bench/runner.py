@@ -0,0 +1,166 @@
+"""Timing of benchmark cases and comparison against stored baselines."""
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .suite import BenchCase
+
+
+@dataclass
+class BenchResult:
+    name: str
+    group: str
+    unit: str
+    items: int = 0
+    repeat: int = 0
+    best_s: float | None = None
+    median_s: float | None = None
+    throughput: float | None = None
+    status: str = "ok"
+    error: str | None = None
+
+
+@dataclass
+class Regression:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative throughput change (negative is slower)."""
+
+        return self.current / self.baseline - 1.0
+
+
+def select_cases(cases: Iterable[BenchCase], patterns: Sequence[str] = ()) -> list[BenchCase]:
+    """Cases whose name or group matches any glob in ``patterns`` (all when empty)."""
+
+    cases = list(cases)
+    if not patterns:
+        return cases
+    return [
+        case
+        for case in cases
+        if any(fnmatch.fnmatch(case.name, p) or fnmatch.fnmatch(case.group, p) for p in patterns)
+    ]
+
+
+def run_case(case: BenchCase, repeat: int = 3, warmup: bool = True) -> BenchResult:
+    """Time ``case``; the first (warm-up) call is discarded for micro-benchmarks."""
+
+    repeat = case.repeat or repeat
+    result = BenchResult(case.name, case.group, case.unit, repeat=repeat)
+    try:
+        result.items = case.items()
+        if warmup and case.repeat is None:
+            if case.setup is not None:
+                case.setup()
+            case.fn()
+        samples = []
+        for _ in range(repeat):
+            if case.setup is not None:
+                case.setup()
+            started = time.perf_counter()
+            case.fn()
+            samples.append(time.perf_counter() - started)
+    except ImportError as exc:
+        result.status, result.error = "skipped", str(exc)
+        return result
+    except Exception as exc:
+        result.status, result.error = "failed", f"{type(exc).__name__}: {exc}"
+        return result
+    finally:
+        if case.teardown is not None:
+            case.teardown()
+    result.best_s = min(samples)
+    result.median_s = statistics.median(samples)
+    result.throughput = result.items / result.best_s if result.best_s > 0 else None
+    return result
+
+
+def environment() -> dict[str, Any]:
+    """Interpreter, platform and library versions recorded with results."""
+
+    import numpy
+    import pandas
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def save_results(path: str | Path, results: Sequence[BenchResult], metadata: Mapping[str, Any]) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"metadata": dict(metadata), "results": [asdict(result) for result in results]}
+    path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+    return path
+
+
+def load_results(path: str | Path) -> dict[str, BenchResult]:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {item["name"]: BenchResult(**item) for item in payload["results"]}
+
+
+def compare(
+    results: Iterable[BenchResult], baseline: Mapping[str, BenchResult], tolerance: float = 0.25
+) -> list[Regression]:
+    """Cases whose throughput fell more than ``tolerance`` below the baseline."""
+
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if reference is None or not reference.throughput or not result.throughput:
+            continue
+        if result.throughput < reference.throughput * (1.0 - tolerance):
+            regressions.append(Regression(result.name, reference.throughput, result.throughput))
+    return regressions
+
+
+def format_results(results: Sequence[BenchResult], baseline: Mapping[str, BenchResult] | None = None) -> str:
+    """Plain-text table of throughputs, with the change against ``baseline``."""
+
+    width = max((len(r.name) for r in results), default=4)
+    lines = [f"{'case':<{width}}  {'best s':>9}  {'throughput':>22}  {'vs base':>8}"]
+    for result in results:
+        if result.status != "ok":
+            lines.append(f"{result.name:<{width}}  {result.status}: {result.error}")
+            continue
+        reference = (baseline or {}).get(result.name)
+        change = ""
+        if reference is not None and reference.throughput and result.throughput:
+            change = f"{result.throughput / reference.throughput - 1.0:+.1%}"
+        throughput = f"{result.throughput:,.0f} {result.unit}/s" if result.throughput else "-"
+        lines.append(f"{result.name:<{width}}  {result.best_s:9.4f}  {throughput:>22}  {change:>8}")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "BenchResult",
+    "Regression",
+    "compare",
+    "environment",
+    "format_results",
+    "load_results",
+    "run_case",
+    "save_results",
+    "select_cases",
+]
@@ -0,0 +1,215 @@
+"""Micro- and macro-benchmarks of the pipeline hot paths."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from ..adapters.base import iter_frame_batches
+from ..features import (
+    Window,
+    compute_envelope_features,
+    compute_frequency_features,
+    compute_order_features,
+    compute_sideband_features,
+    compute_time_features,
+    dominant_frequencies,
+    envelope_spectrum,
+    generate_windows,
+)
+from ..models import MODEL_REGISTRY, model_class
+from .synthetic import FleetSpec, SyntheticFleet, generate_fleet, write_fleet
+
+if TYPE_CHECKING:
+    from ..agents import SelectionResult
+
+FEATURE_FAMILIES: dict[str, tuple[Callable[[Window], dict[str, float]], ...]] = {
+    "time": (compute_time_features,),
+    "freq": (compute_frequency_features, dominant_frequencies),
+    "envelope": (compute_envelope_features, envelope_spectrum),
+    "orders": (compute_order_features, compute_sideband_features),
+}
+# Worker counts of the sharded stream scaling benchmark.
+SHARD_WORKERS = (1, 2, 4)
+# Constructor arguments that keep detector benchmarks deterministic.
+_MODEL_PARAMS: dict[str, dict[str, Any]] = {
+    "isolation_forest": {"random_state": 0},
+}
+
+
+@dataclass
+class BenchCase:
+    """One timed operation processing ``items`` ``unit`` per call.
+
+    ``repeat`` overrides the runner's repeat count (macro-benchmarks run
+    once); ``setup`` runs untimed before every call and ``teardown`` once
+    after the last.
+    """
+
+    name: str
+    group: str
+    fn: Callable[[], Any]
+    items: Callable[[], int]
+    unit: str
+    repeat: int | None = None
+    setup: Callable[[], None] | None = None
+    teardown: Callable[[], None] | None = None
+
+
+class BenchContext:
+    """Synthetic data shared by the benchmark cases, built on first use."""
+
+    def __init__(self, spec: FleetSpec, workdir: str | Path, window_size: int = 256):
+        self.spec = spec
+        self.workdir = Path(workdir)
+        self.window_size = window_size
+        self.stride = window_size // 2
+        self.config: dict[str, Any] = {
+            "window": {"size": window_size, "stride": self.stride},
+            "features": {"time": True, "freq": True, "envelope": True, "orders": True},
+            "models": [{"name": "hbos"}],
+            "threshold": 0.9,
+        }
+
+    @cached_property
+    def fleet(self) -> SyntheticFleet:
+        return generate_fleet(self.spec)
+
+    @cached_property
+    def windows(self) -> list[Window]:
+        return generate_windows(self.fleet.frame, self.window_size, self.stride)
+
+    @cached_property
+    def feature_frame(self) -> pd.DataFrame:
+        from ..agents import FeatureEngineer
+
+        return FeatureEngineer().transform_windows(self.windows, self.config)
+
+    @cached_property
+    def features(self) -> np.ndarray:
+        return self.feature_frame.select_dtypes(include=[np.number]).to_numpy(dtype=float)
+
+    @cached_property
+    def selection(self) -> SelectionResult:
+        from ..agents import ModelSelector, ModelTrainer
+
+        trained = ModelTrainer().train(self.feature_frame, self.config)
+        return ModelSelector().select(trained, None)
+
+    @cached_property
+    def files(self) -> dict[str, Path]:
+        return write_fleet(self.fleet, self.workdir / "fleet")
+
+
+def _stream(context: BenchContext, batch_size: int = 1024) -> int:
+    from ..agents import StreamScorer
+
+    emitted = 0
+
+    def emit(message: dict[str, Any]) -> None:
+        nonlocal emitted
+        emitted += 1
+
+    async def batches():
+        for batch in iter_frame_batches(context.fleet.frame, batch_size):
+            yield batch
+
+    asyncio.run(StreamScorer().run_batches(batches(), context.config, context.selection, emit))
+    return emitted
+
+
+def _sharded_case(context: BenchContext, workers: int, rows: Callable[[], int]) -> BenchCase:
+    from ..workflows.sharded_stream import ShardedScorer
+
+    scorers: list[ShardedScorer] = []
+
+    def setup() -> None:
+        # Worker start-up (interpreter, imports, model load) is not timed.
+        if not scorers:
+            scorers.append(ShardedScorer(workers, context.selection, context.config).start())
+
+    async def batches():
+        for batch in iter_frame_batches(context.fleet.frame, 1024):
+            yield batch
+
+    def run() -> None:
+        asyncio.run(scorers[0].run_batches(batches()))
+
+    def teardown() -> None:
+        while scorers:
+            scorers.pop().close()
+
+    return BenchCase(
+        f"stream.sharded.w{workers}", "scaling", run, rows, "samples", repeat=1, setup=setup, teardown=teardown
+    )
+
+
+def _orchestrate(context: BenchContext) -> Any:
+    from ..agents import Orchestrator
+
+    files = context.files
+    return Orchestrator().run(files["config"], None, context.workdir / "run", str(files["labels"]))
+
+
+def build_suite(context: BenchContext) -> list[BenchCase]:
+    """Every benchmark case over ``context``'s synthetic fleet."""
+
+    def rows() -> int:
+        return len(context.fleet.frame)
+
+    def windows() -> int:
+        return len(context.windows)
+
+    def feature_rows() -> int:
+        return len(context.features)
+
+    cases = [
+        BenchCase(
+            "windows.generate_windows",
+            "micro",
+            lambda: generate_windows(context.fleet.frame, context.window_size, context.stride),
+            rows,
+            "samples",
+        )
+    ]
+    for family, functions in FEATURE_FAMILIES.items():
+        cases.append(
+            BenchCase(
+                f"features.{family}",
+                "micro",
+                lambda functions=functions: [fn(window) for window in context.windows for fn in functions],
+                windows,
+                "windows",
+            )
+        )
+    for name in MODEL_REGISTRY:
+        params = _MODEL_PARAMS.get(name, {})
+        fitted: dict[str, Any] = {}
+
+        def fit(name=name, params=params, fitted=fitted) -> None:
+            fitted["model"] = model_class(name)(**params).fit(context.features)
+
+        def score(fit=fit, fitted=fitted) -> np.ndarray:
+            return fitted["model"].score_samples(context.features)
+
+        def ensure_fitted(fit=fit, fitted=fitted) -> None:
+            if "model" not in fitted:
+                fit()
+
+        cases.append(BenchCase(f"models.{name}.fit", "micro", fit, feature_rows, "rows"))
+        cases.append(BenchCase(f"models.{name}.score", "micro", score, feature_rows, "rows", setup=ensure_fitted))
+    cases.append(BenchCase("stream.run_batches", "macro", lambda: _stream(context), rows, "samples", repeat=1))
+    cases.extend(_sharded_case(context, workers, rows) for workers in SHARD_WORKERS)
+    cases.append(
+        BenchCase("pipeline.orchestrator", "macro", lambda: _orchestrate(context), rows, "samples", repeat=1)
+    )
+    return cases
+
+
+__all__ = ["BenchCase", "BenchContext", "FEATURE_FAMILIES", "SHARD_WORKERS", "build_suite"]
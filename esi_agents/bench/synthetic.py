@@ -0,0 +1,211 @@
+"""Deterministic synthetic fleet of rotating-machine signals."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import yaml
+
+FAULT_KINDS = ("bearing", "imbalance", "spike")
+RPM_PROFILES = ("constant", "ramp", "sweep", "random_walk")
+# Amplitudes of the 1x/2x/3x shaft harmonics.
+_HARMONICS = (1.0, 0.35, 0.15)
+# Outer-race defect frequency as a multiple of shaft speed.
+_BPFO_ORDER = 3.57
+
+
+@dataclass
+class FleetSpec:
+    """Shape of a synthetic fleet.
+
+    Every asset has the same ``channels``, sampled at ``sampling_rate_hz``
+    for ``duration_s`` seconds. Shaft speed follows ``rpm_profile`` around
+    ``rpm_base`` (varying by up to ``rpm_spread`` of it). A
+    ``fault_fraction`` of the assets gets one fault of a kind drawn from
+    ``fault_kinds``, lasting 10-30 % of the run. The same spec and
+    ``seed`` always produce the same data.
+    """
+
+    assets: int = 4
+    channels: Sequence[str] = ("accel_x", "accel_y")
+    sampling_rate_hz: float = 1000.0
+    duration_s: float = 10.0
+    rpm_profile: str = "ramp"
+    rpm_base: float = 1800.0
+    rpm_spread: float = 0.1
+    fault_fraction: float = 0.25
+    fault_kinds: Sequence[str] = FAULT_KINDS
+    fault_severity: float = 1.0
+    noise_std: float = 0.05
+    start: str = "2024-01-01"
+    seed: int = 0
+
+    @property
+    def samples(self) -> int:
+        return int(round(self.duration_s * self.sampling_rate_hz))
+
+    @property
+    def rows(self) -> int:
+        return self.samples * self.assets * len(self.channels)
+
+
+@dataclass
+class InjectedFault:
+    asset_id: str
+    kind: str
+    start: pd.Timestamp
+    end: pd.Timestamp
+
+
+@dataclass
+class SyntheticFleet:
+    """Long-format samples (``timestamp, asset_id, channel, value, rpm``),
+    per-asset labels and the injected faults."""
+
+    spec: FleetSpec
+    frame: pd.DataFrame
+    labels: pd.DataFrame
+    faults: list[InjectedFault] = field(default_factory=list)
+
+
+def _rpm(profile: str, spec: FleetSpec, t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    base = spec.rpm_base * (1.0 + rng.uniform(-0.5, 0.5) * spec.rpm_spread)
+    span = spec.rpm_base * spec.rpm_spread
+    if profile == "constant":
+        return np.full(t.size, base)
+    if profile == "ramp":
+        return base + span * t / max(spec.duration_s, 1e-9)
+    if profile == "sweep":
+        return base + span * np.sin(2 * np.pi * t / max(spec.duration_s, 1e-9))
+    if profile == "random_walk":
+        steps = rng.normal(0.0, span / np.sqrt(max(t.size, 1)), t.size)
+        return base + np.cumsum(steps)
+    raise ValueError(f"Unknown rpm profile '{profile}'; expected one of {RPM_PROFILES}")
+
+
+def _fault_signal(
+    kind: str, t: np.ndarray, phase: np.ndarray, rate: float, rng: np.random.Generator
+) -> np.ndarray:
+    if kind == "imbalance":
+        return 2.0 * np.sin(phase)
+    if kind == "bearing":
+        # Resonance at a quarter of the sampling rate, amplitude-modulated
+        # by the outer-race defect frequency.
+        modulation = (0.5 * (1.0 + np.cos(_BPFO_ORDER * phase))) ** 4
+        return 1.5 * modulation * np.sin(2 * np.pi * (rate / 4) * t)
+    if kind == "spike":
+        spikes = np.zeros(t.size)
+        hits = rng.random(t.size) < 0.01
+        spikes[hits] = rng.normal(0.0, 4.0, int(hits.sum()))
+        return spikes
+    raise ValueError(f"Unknown fault kind '{kind}'; expected one of {FAULT_KINDS}")
+
+
+def generate_fleet(spec: FleetSpec | None = None) -> SyntheticFleet:
+    """Generate a :class:`SyntheticFleet` for ``spec``."""
+
+    spec = spec or FleetSpec()
+    n = spec.samples
+    if n < 1 or spec.assets < 1 or not spec.channels:
+        raise ValueError("FleetSpec must describe at least one asset, channel and sample")
+    root = np.random.default_rng(spec.seed)
+    faulty = set(root.permutation(spec.assets)[: int(round(spec.fault_fraction * spec.assets))].tolist())
+    asset_seeds = np.random.SeedSequence(spec.seed).spawn(spec.assets)
+    t = np.arange(n) / spec.sampling_rate_hz
+    offsets = pd.to_timedelta(np.round(t * 1e9).astype("int64"), unit="ns")
+    timestamps = pd.Timestamp(spec.start) + offsets
+    parts: list[pd.DataFrame] = []
+    labels: list[pd.DataFrame] = []
+    faults: list[InjectedFault] = []
+    for index in range(spec.assets):
+        rng = np.random.default_rng(asset_seeds[index])
+        asset_id = f"asset_{index:03d}"
+        rpm = _rpm(spec.rpm_profile, spec, t, rng)
+        phase = 2 * np.pi * np.cumsum(rpm / 60.0) / spec.sampling_rate_hz
+        label = np.zeros(n, dtype=int)
+        fault = np.zeros(n)
+        if index in faulty:
+            kind = str(spec.fault_kinds[rng.integers(len(spec.fault_kinds))])
+            length = max(1, int(n * rng.uniform(0.1, 0.3)))
+            begin = int(rng.integers(0, n - length + 1))
+            fault[begin : begin + length] = spec.fault_severity * _fault_signal(
+                kind, t, phase, spec.sampling_rate_hz, rng
+            )[begin : begin + length]
+            label[begin : begin + length] = 1
+            faults.append(InjectedFault(asset_id, kind, timestamps[begin], timestamps[begin + length - 1]))
+        for offset, channel in enumerate(spec.channels):
+            harmonics = sum(
+                amplitude * np.sin(order * phase + 0.7 * offset)
+                for order, amplitude in enumerate(_HARMONICS, start=1)
+            )
+            value = harmonics + fault + rng.normal(0.0, spec.noise_std, n)
+            parts.append(
+                pd.DataFrame(
+                    {"timestamp": timestamps, "asset_id": asset_id, "channel": channel, "value": value, "rpm": rpm}
+                )
+            )
+        labels.append(pd.DataFrame({"timestamp": timestamps, "asset_id": asset_id, "label": label}))
+    frame = pd.concat(parts, ignore_index=True).sort_values("timestamp", kind="stable", ignore_index=True)
+    label_frame = pd.concat(labels, ignore_index=True).sort_values("timestamp", kind="stable", ignore_index=True)
+    return SyntheticFleet(spec=spec, frame=frame, labels=label_frame, faults=faults)
+
+
+def write_fleet(fleet: SyntheticFleet, directory: str | Path, fmt: str = "csv") -> dict[str, Path]:
+    """Write the samples, labels, faults and a batch config to ``directory``.
+
+    Returns the written paths under ``input``, ``labels``, ``faults`` and
+    ``config``. ``fmt`` is ``csv`` or ``parquet``.
+    """
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "input": directory / f"fleet.{fmt}",
+        "labels": directory / "labels.csv",
+        "faults": directory / "faults.yaml",
+        "config": directory / "config.yaml",
+    }
+    if fmt == "parquet":
+        fleet.frame.to_parquet(paths["input"], index=False)
+    elif fmt == "csv":
+        fleet.frame.to_csv(paths["input"], index=False)
+    else:
+        raise ValueError(f"Unsupported format '{fmt}'")
+    fleet.labels.to_csv(paths["labels"], index=False)
+    faults = [{**asdict(f), "start": f.start.isoformat(), "end": f.end.isoformat()} for f in fleet.faults]
+    paths["faults"].write_text(yaml.safe_dump({"spec": _spec_dict(fleet.spec), "faults": faults}))
+    config: dict[str, Any] = {
+        "adapter": fmt,
+        "params": {"path": str(paths["input"]), "timestamp_column": "timestamp"},
+        "window": {"size": 256, "stride": 128},
+        "features": {"time": True, "freq": True, "envelope": True, "orders": True},
+        "models": [
+            {"name": "isolation_forest", "params": {"n_estimators": 100, "random_state": 0}},
+            {"name": "hbos"},
+        ],
+        "threshold": 0.9,
+    }
+    paths["config"].write_text(yaml.safe_dump(config, sort_keys=False))
+    return paths
+
+
+def _spec_dict(spec: FleetSpec) -> dict[str, Any]:
+    data = asdict(spec)
+    data["channels"] = list(spec.channels)
+    data["fault_kinds"] = list(spec.fault_kinds)
+    return data
+
+
+__all__ = [
+    "FAULT_KINDS",
+    "FleetSpec",
+    "InjectedFault",
+    "RPM_PROFILES",
+    "SyntheticFleet",
+    "generate_fleet",
+    "write_fleet",
+]
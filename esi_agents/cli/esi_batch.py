@@ -2,9 +2,6 @@
 from __future__ import annotations
 
 import argparse
-from pathlib import Path
-
-from ..workflows.batch_pipeline import run_batch
 
 
 def main() -> None:
@@ -13,8 +10,15 @@ def main() -> None:
     parser.add_argument("--input", required=False, help="Input data path override")
     parser.add_argument("--out", required=True, help="Output directory for artifacts")
     parser.add_argument("--labels", required=False, help="Optional labels CSV")
+    parser.add_argument(
+        "--resume", action="store_true", help="Skip stages whose inputs are unchanged since the last run in --out"
+    )
     args = parser.parse_args()
-    run_batch(args.config, args.input, args.out, args.labels)
+    from ..agents.stages import format_timings
+    from ..workflows.batch_pipeline import run_batch
+
+    result = run_batch(args.config, args.input, args.out, args.labels, resume=args.resume)
+    print(format_timings(result.timings))
 
 
 if __name__ == "__main__":
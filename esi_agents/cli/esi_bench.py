@@ -0,0 +1,106 @@
+"""CLI for the benchmark suite and synthetic fleet generator."""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+# (assets, channels, duration_s) of the built-in fleet sizes.
+_PRESETS = {"quick": (2, 1, 4.0), "default": (8, 2, 20.0), "large": (32, 3, 60.0)}
+
+
+def _spec(args: argparse.Namespace):
+    from ..bench.synthetic import FleetSpec
+
+    assets, channels, duration = _PRESETS[args.preset]
+    return FleetSpec(
+        assets=args.assets or assets,
+        channels=tuple(args.channels.split(",")) if args.channels else tuple(f"accel_{i}" for i in range(channels)),
+        sampling_rate_hz=args.rate,
+        duration_s=args.duration or duration,
+        rpm_profile=args.rpm_profile,
+        fault_fraction=args.fault_fraction,
+        seed=args.seed,
+    )
+
+
+def _run(args: argparse.Namespace) -> int:
+    from ..bench.runner import (
+        compare,
+        environment,
+        format_results,
+        load_results,
+        run_case,
+        save_results,
+        select_cases,
+    )
+    from ..bench.suite import BenchContext, build_suite
+
+    spec = _spec(args)
+    with tempfile.TemporaryDirectory(prefix="esi_bench_") as scratch:
+        context = BenchContext(spec, args.workdir or scratch, window_size=args.window)
+        results = []
+        for case in select_cases(build_suite(context), args.filter):
+            result = run_case(case, repeat=args.repeat)
+            results.append(result)
+            if not args.quiet:
+                print(f"{result.name}: {result.status}", flush=True)
+    metadata = {**environment(), "preset": args.preset, "spec": asdict(spec), "window": args.window}
+    save_results(args.out, results, metadata)
+    if args.save_baseline:
+        save_results(args.save_baseline, results, metadata)
+    baseline = load_results(args.baseline) if args.baseline else None
+    print(format_results(results, baseline))
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name}: {regression.current:,.0f} vs {regression.baseline:,.0f}"
+            f" ({regression.change:+.1%})"
+        )
+    return 1 if regressions else 0
+
+
+def _generate(args: argparse.Namespace) -> int:
+    from ..bench.synthetic import generate_fleet, write_fleet
+
+    fleet = generate_fleet(_spec(args))
+    paths = write_fleet(fleet, args.out, fmt=args.format)
+    for kind, path in paths.items():
+        print(f"{kind}: {path}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the ESI pipeline on a synthetic fleet")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Run benchmarks and compare against a baseline")
+    generate = commands.add_parser("generate", help="Write a synthetic fleet, labels and batch config")
+    for sub in (run, generate):
+        sub.add_argument("--preset", choices=sorted(_PRESETS), default="default", help="Fleet size")
+        sub.add_argument("--assets", type=int, help="Number of assets (overrides the preset)")
+        sub.add_argument("--channels", help="Comma-separated channel names (overrides the preset)")
+        sub.add_argument("--rate", type=float, default=1000.0, help="Sampling rate in Hz")
+        sub.add_argument("--duration", type=float, help="Seconds of data per asset (overrides the preset)")
+        sub.add_argument("--rpm-profile", default="ramp", help="constant, ramp, sweep or random_walk")
+        sub.add_argument("--fault-fraction", type=float, default=0.25, help="Fraction of assets with a fault")
+        sub.add_argument("--seed", type=int, default=0, help="Generator seed")
+    run.add_argument("--filter", action="append", default=[], help="Glob on case name or group; repeatable")
+    run.add_argument("--repeat", type=int, default=3, help="Timed repetitions of micro-benchmarks")
+    run.add_argument("--window", type=int, default=256, help="Window size in samples")
+    run.add_argument("--out", default="artifacts/bench/results.json", help="Results JSON path")
+    run.add_argument("--baseline", help="Baseline results JSON to compare against")
+    run.add_argument("--save-baseline", help="Also write the results to this baseline path")
+    run.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative throughput drop")
+    run.add_argument("--workdir", help="Keep generated inputs and run artifacts here")
+    run.add_argument("--quiet", action="store_true", help="Only print the final table")
+    generate.add_argument("--out", required=True, help="Output directory")
+    generate.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Sample file format")
+    args = parser.parse_args()
+    raise SystemExit(_run(args) if args.command == "run" else _generate(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,6 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-import pandas as pd
-
-from ..eval import compute_classification_metrics, plot_pr_curve, plot_roc_curve
-
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Evaluate anomaly scores")
@@ -15,12 +11,12 @@ def main() -> None:
     parser.add_argument("--labels", required=True, help="CSV with ground truth labels")
     parser.add_argument("--out", required=True, help="Output directory")
     args = parser.parse_args()
+    import pandas as pd
+
+    from ..agents.batch_scorer import read_scores
+    from ..eval import compute_classification_metrics, plot_pr_curve, plot_roc_curve
 
-    scores_path = Path(args.scores)
-    if scores_path.suffix == ".parquet":
-        scores_df = pd.read_parquet(scores_path)
-    else:
-        scores_df = pd.read_csv(scores_path)
+    scores_df = read_scores(Path(args.scores), columns=["anomaly_score"])
     labels_df = pd.read_csv(args.labels)
     labels = labels_df[labels_df.columns[-1]].to_numpy()
     scores = scores_df["anomaly_score"].to_numpy()
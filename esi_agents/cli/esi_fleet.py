@@ -0,0 +1,40 @@
+"""CLI entry point for running a fleet of batch jobs."""
+from __future__ import annotations
+
+import argparse
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run many batch jobs from a manifest on a process pool")
+    parser.add_argument("--manifest", required=True, help="YAML/JSON manifest of jobs")
+    parser.add_argument("--out", required=True, help="Directory for the consolidated summary")
+    parser.add_argument("--concurrency", type=int, help="Worker processes (overrides the manifest)")
+    parser.add_argument("--resume", action="store_true", help="Resume every job from its checkpoints")
+    args = parser.parse_args()
+    import pandas as pd
+
+    from ..workflows.fleet import load_manifest, run_fleet
+
+    jobs, options = load_manifest(args.manifest)
+    if args.resume:
+        for job in jobs:
+            job.resume = True
+    concurrency = args.concurrency or int(options.get("concurrency", 4))
+    summary = run_fleet(
+        jobs,
+        concurrency=concurrency,
+        shared=options.get("shared"),
+        summary_dir=args.out,
+        on_result=lambda result: print(f"{result.name}: {result.status} after {result.attempts} attempt(s)"),
+    )
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(summary.drop(columns=["error"]).to_string(index=False))
+    failed = summary[summary["status"] != "ok"]
+    for _, row in failed.iterrows():
+        print(f"{row['job']} failed: {row['error']}")
+    if not failed.empty:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,23 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-
-from ..workflows.stream_pipeline import run_stream
+import json
+import signal
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run streaming anomaly detection")
     parser.add_argument("--config", required=True, help="Path to stream YAML config")
+    parser.add_argument("--quiet", action="store_true", help="Do not print scored windows")
     args = parser.parse_args()
-    asyncio.run(run_stream(args.config))
+    from ..workflows.stream_pipeline import run_stream
+
+    # Stop on SIGTERM like on Ctrl-C so alert sinks and checkpoints are flushed.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    summary = asyncio.run(run_stream(args.config, (lambda msg: None) if args.quiet else None))
+    if summary is not None:
+        print(json.dumps({"replay": summary}, indent=2))
 
 
 if __name__ == "__main__":
@@ -1,19 +1,19 @@
 """Evaluation toolkit for the anomaly detection platform."""
-from .metrics import MetricsResult, compute_classification_metrics, precision_recall_table
-from .band_scan import BandScanResult, band_scan, top_bands
-from .plots import plot_roc_curve, plot_pr_curve, plot_band_scan
-from .calibration import fit_platt_scaler, calibrate_scores
+from .._lazy import attach
 
-__all__ = [
-    "MetricsResult",
-    "compute_classification_metrics",
-    "precision_recall_table",
-    "BandScanResult",
-    "band_scan",
-    "top_bands",
-    "plot_roc_curve",
-    "plot_pr_curve",
-    "plot_band_scan",
-    "fit_platt_scaler",
-    "calibrate_scores",
-]
+_EXPORTS = {
+    "MetricsResult": ".metrics",
+    "compute_classification_metrics": ".metrics",
+    "precision_recall_table": ".metrics",
+    "BandScanResult": ".band_scan",
+    "band_scan": ".band_scan",
+    "top_bands": ".band_scan",
+    "plot_roc_curve": ".plots",
+    "plot_pr_curve": ".plots",
+    "plot_band_scan": ".plots",
+    "fit_platt_scaler": ".calibration",
+    "calibrate_scores": ".calibration",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
@@ -4,7 +4,6 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 import numpy as np
-from scipy.stats import norm  # type: ignore
 
 
 @dataclass
@@ -26,6 +25,8 @@ def band_scan(
         raise ValueError("window_size must be positive")
     if freqs.size == 0:
         return []
+    from scipy.stats import norm  # type: ignore
+
     window = min(window_size, freqs.size)
     results: list[BandScanResult] = []
     rolling = np.convolve(magnitudes, np.ones(window), mode="valid") / window
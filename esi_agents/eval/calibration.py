@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import numpy as np
-from sklearn.linear_model import LogisticRegression
 
 from ..models.base import CalibrationModel
 
@@ -10,6 +9,8 @@ from ..models.base import CalibrationModel
 def fit_platt_scaler(scores: np.ndarray, labels: np.ndarray) -> CalibrationModel:
     if scores.ndim != 1:
         raise ValueError("scores must be one-dimensional")
+    from sklearn.linear_model import LogisticRegression
+
     model = LogisticRegression()
     model.fit(scores.reshape(-1, 1), labels)
     slope = float(model.coef_[0][0])
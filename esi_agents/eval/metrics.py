@@ -7,11 +7,6 @@ from pathlib import Path
 from typing import Any
 
 import numpy as np
-from sklearn.metrics import (
-    average_precision_score,
-    precision_recall_curve,
-    roc_auc_score,
-)
 
 
 @dataclass
@@ -53,6 +48,8 @@ def compute_classification_metrics(
     if y_true is None:
         alert_rate = float(np.mean(scores >= 0.5))
         return MetricsResult(None, None, None, None, alert_rate)
+    from sklearn.metrics import average_precision_score, roc_auc_score
+
     y_true = y_true.astype(int)
     try:
         roc_auc = float(roc_auc_score(y_true, scores))
@@ -72,6 +69,8 @@ def compute_classification_metrics(
 
 
 def precision_recall_table(y_true: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    from sklearn.metrics import precision_recall_curve
+
     precision, recall, thresholds = precision_recall_curve(y_true, scores)
     return np.column_stack([precision[:-1], recall[:-1], thresholds])
 
@@ -4,9 +4,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Iterable
 
-import matplotlib.pyplot as plt
 import numpy as np
-from sklearn.metrics import precision_recall_curve, roc_curve
 
 from .band_scan import BandScanResult
 
@@ -15,9 +13,20 @@ _FIGSIZE = (5.12, 5.12)
 _DPI = 100
 
 
+def _figure():
+    """Off-screen figure and axes; matplotlib is only imported when plotting."""
+
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=_FIGSIZE, dpi=_DPI)
+    return fig, fig.subplots()
+
+
 def plot_roc_curve(y_true: np.ndarray, scores: np.ndarray, path: str | Path) -> None:
+    from sklearn.metrics import roc_curve
+
     fpr, tpr, _ = roc_curve(y_true, scores)
-    fig, ax = plt.subplots(figsize=_FIGSIZE, dpi=_DPI)
+    fig, ax = _figure()
     ax.plot(fpr, tpr, label="ROC")
     ax.plot([0, 1], [0, 1], linestyle="--", color="gray")
     ax.set_xlabel("False Positive Rate")
@@ -27,12 +36,13 @@ def plot_roc_curve(y_true: np.ndarray, scores: np.ndarray, path: str | Path) ->
     ax.legend()
     Path(path).parent.mkdir(parents=True, exist_ok=True)
     fig.savefig(path, bbox_inches="tight")
-    plt.close(fig)
 
 
 def plot_pr_curve(y_true: np.ndarray, scores: np.ndarray, path: str | Path) -> None:
+    from sklearn.metrics import precision_recall_curve
+
     precision, recall, _ = precision_recall_curve(y_true, scores)
-    fig, ax = plt.subplots(figsize=_FIGSIZE, dpi=_DPI)
+    fig, ax = _figure()
     ax.plot(recall, precision, label="PR")
     ax.set_xlabel("Recall")
     ax.set_ylabel("Precision")
@@ -41,7 +51,6 @@ def plot_pr_curve(y_true: np.ndarray, scores: np.ndarray, path: str | Path) -> N
     ax.legend()
     Path(path).parent.mkdir(parents=True, exist_ok=True)
     fig.savefig(path, bbox_inches="tight")
-    plt.close(fig)
 
 
 def plot_band_scan(results: Iterable[BandScanResult], path: str | Path) -> None:
@@ -51,7 +60,7 @@ def plot_band_scan(results: Iterable[BandScanResult], path: str | Path) -> None:
     starts = [b.band_start for b in bands]
     ends = [b.band_end for b in bands]
     z_scores = [b.z_score for b in bands]
-    fig, ax = plt.subplots(figsize=_FIGSIZE, dpi=_DPI)
+    fig, ax = _figure()
     centers = [(s + e) / 2 for s, e in zip(starts, ends)]
     widths = [e - s for s, e in zip(starts, ends)]
     ax.bar(centers, z_scores, width=widths, align="center")
@@ -61,7 +70,6 @@ def plot_band_scan(results: Iterable[BandScanResult], path: str | Path) -> None:
     ax.grid(True)
     Path(path).parent.mkdir(parents=True, exist_ok=True)
     fig.savefig(path, bbox_inches="tight")
-    plt.close(fig)
 
 
 __all__ = ["plot_roc_curve", "plot_pr_curve", "plot_band_scan"]
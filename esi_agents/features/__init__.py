@@ -1,18 +1,20 @@
 """Feature computation library for ESI signals."""
-from .windows import Window, generate_windows
-from .time import compute_time_features
-from .freq import compute_frequency_features, dominant_frequencies
-from .envelope import compute_envelope_features, envelope_spectrum
-from .orders import compute_order_features, compute_sideband_features
+from .._lazy import attach
 
-__all__ = [
-    "Window",
-    "generate_windows",
-    "compute_time_features",
-    "compute_frequency_features",
-    "dominant_frequencies",
-    "compute_envelope_features",
-    "envelope_spectrum",
-    "compute_order_features",
-    "compute_sideband_features",
-]
+_EXPORTS = {
+    "ChunkedWindower": ".windows",
+    "Window": ".windows",
+    "Waveform": ".windows",
+    "generate_windows": ".windows",
+    "compute_time_features": ".time",
+    "compute_frequency_features": ".freq",
+    "dominant_frequencies": ".freq",
+    "compute_envelope_features": ".envelope",
+    "envelope_spectrum": ".envelope",
+    "compute_order_features": ".orders",
+    "compute_sideband_features": ".orders",
+    "FeatureReservoir": ".reservoir",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 import numpy as np
-from scipy.signal import hilbert  # type: ignore
 
+from .spectral import analytic_signal, rfft_freqs, tapered_rfft
 from .windows import Window
 
 
@@ -15,8 +15,7 @@ def compute_envelope_features(window: Window) -> dict[str, float]:
             "envelope_rms": 0.0,
             "envelope_peak": 0.0,
         }
-    analytic_signal = hilbert(values)
-    envelope = np.abs(analytic_signal)
+    envelope = np.abs(analytic_signal(values))
     mean_env = float(np.mean(envelope))
     rms_env = float(np.sqrt(np.mean(envelope**2)))
     peak_env = float(np.max(envelope))
@@ -31,15 +30,10 @@ def envelope_spectrum(window: Window, n_fft: int | None = None) -> dict[str, flo
     values = window.values.astype(float)
     if values.size == 0:
         return {"envelope_peak_freq": 0.0}
-    analytic_signal = hilbert(values)
-    envelope = np.abs(analytic_signal)
-    n = n_fft or (1 << (envelope.size - 1).bit_length())
-    spectrum = np.fft.rfft(envelope * np.hanning(envelope.size), n=n)
+    envelope = np.abs(analytic_signal(values))
+    spectrum, n = tapered_rfft(envelope, n_fft)
     magnitudes = np.abs(spectrum)
-    if window.sampling_rate_hz:
-        freqs = np.fft.rfftfreq(n, d=1.0 / window.sampling_rate_hz)
-    else:
-        freqs = np.fft.rfftfreq(n)
+    freqs = rfft_freqs(n, window.sampling_rate_hz)
     idx = int(np.argmax(magnitudes))
     return {"envelope_peak_freq": float(freqs[idx])}
 
@@ -3,13 +3,10 @@ from __future__ import annotations
 
 import numpy as np
 
+from .spectral import rfft_freqs, tapered_rfft
 from .windows import Window
 
 
-def _next_pow_two(n: int) -> int:
-    return 1 << (n - 1).bit_length()
-
-
 def compute_frequency_features(window: Window, n_fft: int | None = None) -> dict[str, float]:
     values = window.values.astype(float)
     if values.size == 0:
@@ -20,16 +17,11 @@ def compute_frequency_features(window: Window, n_fft: int | None = None) -> dict
             "freq_bandpower_mid": 0.0,
             "freq_bandpower_high": 0.0,
         }
-    n_fft = n_fft or _next_pow_two(values.size)
-    window_fn = np.hanning(values.size)
-    fft_values = np.fft.rfft(values * window_fn, n=n_fft)
+    fft_values, n_fft = tapered_rfft(values, n_fft)
     magnitudes = np.abs(fft_values)
     power_spectrum = magnitudes**2
     total_power = float(power_spectrum.sum())
-    if window.sampling_rate_hz:
-        freqs = np.fft.rfftfreq(n_fft, d=1.0 / window.sampling_rate_hz)
-    else:
-        freqs = np.fft.rfftfreq(n_fft)
+    freqs = rfft_freqs(n_fft, window.sampling_rate_hz)
     centroid = float((freqs * power_spectrum).sum() / power_spectrum.sum()) if total_power else 0.0
 
     thirds = np.array_split(power_spectrum, 3)
@@ -50,14 +42,9 @@ def dominant_frequencies(window: Window, top_k: int = 3, n_fft: int | None = Non
     values = window.values.astype(float)
     if values.size == 0:
         return {f"freq_peak_{i}": 0.0 for i in range(1, top_k + 1)}
-    n_fft = n_fft or _next_pow_two(values.size)
-    fft_values = np.fft.rfft(values * np.hanning(values.size), n=n_fft)
+    fft_values, n_fft = tapered_rfft(values, n_fft)
     magnitudes = np.abs(fft_values)
-    freqs = (
-        np.fft.rfftfreq(n_fft, d=1.0 / window.sampling_rate_hz)
-        if window.sampling_rate_hz
-        else np.fft.rfftfreq(n_fft)
-    )
+    freqs = rfft_freqs(n_fft, window.sampling_rate_hz)
     indices = np.argsort(magnitudes)[::-1][:top_k]
     return {f"freq_peak_{i+1}": float(freqs[idx]) for i, idx in enumerate(indices)}
 
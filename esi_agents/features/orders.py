@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import numpy as np
 
+from .spectral import rfft_freqs, tapered_rfft
 from .windows import Window
 
 
@@ -18,9 +19,8 @@ def compute_order_features(
     values = window.values.astype(float)
     if values.size == 0:
         return {f"order_{order}_amplitude": 0.0 for order in orders}
-    n_fft = n_fft or (1 << (values.size - 1).bit_length())
-    spectrum = np.fft.rfft(values * np.hanning(values.size), n=n_fft)
-    freqs = np.fft.rfftfreq(n_fft, d=1.0 / window.sampling_rate_hz)
+    spectrum, n_fft = tapered_rfft(values, n_fft)
+    freqs = rfft_freqs(n_fft, window.sampling_rate_hz)
     magnitudes = np.abs(spectrum)
     results: dict[str, float] = {}
     for order in orders:
@@ -34,10 +34,9 @@ def compute_sideband_features(window: Window, sideband_offset_hz: float = 1.0) -
     values = window.values.astype(float)
     if values.size == 0 or not window.sampling_rate_hz:
         return {"sideband_ratio": 0.0}
-    n_fft = 1 << (values.size - 1).bit_length()
-    spectrum = np.fft.rfft(values * np.hanning(values.size), n=n_fft)
+    spectrum, n_fft = tapered_rfft(values)
     magnitudes = np.abs(spectrum)
-    freqs = np.fft.rfftfreq(n_fft, d=1.0 / window.sampling_rate_hz)
+    freqs = rfft_freqs(n_fft, window.sampling_rate_hz)
     peak_idx = int(np.argmax(magnitudes))
     peak_freq = freqs[peak_idx]
     lower_idx = int(np.argmin(np.abs(freqs - (peak_freq - sideband_offset_hz))))
@@ -0,0 +1,57 @@
+"""Uniform reservoir sampling of feature rows."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+class FeatureReservoir:
+    """Keep a uniform random sample of at most ``size`` rows from a stream of frames.
+
+    Vectorised Algorithm R: after ``n`` rows have been offered each one is
+    retained with probability ``size / n``. Frames are aligned to the
+    columns of the first frame offered.
+    """
+
+    def __init__(self, size: int, seed: int | None = 0):
+        if size <= 0:
+            raise ValueError("reservoir size must be positive")
+        self.size = size
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._rows: pd.DataFrame | None = None
+
+    def add(self, frame: pd.DataFrame) -> None:
+        if frame.empty:
+            return
+        if self._rows is not None:
+            frame = frame.reindex(columns=self._rows.columns)
+        frame = frame.reset_index(drop=True)
+        positions = self.seen + np.arange(len(frame))
+        self.seen += len(frame)
+        filling = positions < self.size
+        if filling.any():
+            head = frame[filling]
+            self._rows = head if self._rows is None else pd.concat([self._rows, head], ignore_index=True)
+        rest = np.flatnonzero(~filling)
+        if not rest.size:
+            return
+        slots = self._rng.integers(0, positions[rest] + 1)
+        accepted = slots < self.size
+        rest, slots = rest[accepted], slots[accepted]
+        if not rest.size:
+            return
+        # Later rows replace earlier ones that drew the same slot.
+        _, last = np.unique(slots[::-1], return_index=True)
+        keep = len(slots) - 1 - last
+        self._rows.iloc[slots[keep]] = frame.iloc[rest[keep]].to_numpy()
+
+    def frame(self) -> pd.DataFrame:
+        """The current sample, with rows in arbitrary order."""
+
+        if self._rows is None:
+            return pd.DataFrame()
+        return self._rows.infer_objects().reset_index(drop=True)
+
+
+__all__ = ["FeatureReservoir"]
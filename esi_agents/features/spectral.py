@@ -0,0 +1,57 @@
+"""Cached FFT helpers shared by the spectral feature extractors."""
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+
+
+def next_pow_two(n: int) -> int:
+    return 1 << (n - 1).bit_length()
+
+
+@lru_cache(maxsize=64)
+def hann(n: int) -> np.ndarray:
+    """Read-only Hann taper of length ``n``."""
+
+    taper = np.hanning(n)
+    taper.setflags(write=False)
+    return taper
+
+
+@lru_cache(maxsize=256)
+def rfft_freqs(n_fft: int, sampling_rate_hz: float | None) -> np.ndarray:
+    """Read-only frequency grid of an ``n_fft``-point real FFT."""
+
+    freqs = np.fft.rfftfreq(n_fft, d=1.0 / sampling_rate_hz) if sampling_rate_hz else np.fft.rfftfreq(n_fft)
+    freqs.setflags(write=False)
+    return freqs
+
+
+@lru_cache(maxsize=64)
+def _hilbert_gain(n: int) -> np.ndarray:
+    gain = np.zeros(n)
+    gain[0] = 1.0
+    if n % 2 == 0:
+        gain[n // 2] = 1.0
+        gain[1 : n // 2] = 2.0
+    else:
+        gain[1 : (n + 1) // 2] = 2.0
+    gain.setflags(write=False)
+    return gain
+
+
+def analytic_signal(values: np.ndarray) -> np.ndarray:
+    """Analytic signal of a real 1-D array (same result as ``scipy.signal.hilbert``)."""
+
+    return np.fft.ifft(np.fft.fft(values) * _hilbert_gain(values.size))
+
+
+def tapered_rfft(values: np.ndarray, n_fft: int | None = None) -> tuple[np.ndarray, int]:
+    """Hann-tapered real FFT of ``values`` zero-padded to ``n_fft`` (default: next power of two)."""
+
+    n_fft = n_fft or next_pow_two(values.size)
+    return np.fft.rfft(values * hann(values.size), n=n_fft), n_fft
+
+
+__all__ = ["analytic_signal", "hann", "next_pow_two", "rfft_freqs", "tapered_rfft"]
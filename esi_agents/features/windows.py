@@ -1,12 +1,16 @@
 """Utilities for windowing ESI time-series data."""
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from ..adapters.schema_registry import SchemaRegistry
+
 
 @dataclass
 class Window:
@@ -21,6 +25,34 @@ class Window:
     extras: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class Waveform:
+    """Uniformly sampled signal with implicit timestamps.
+
+    ``values`` (and ``rpm`` when present) may be memory-mapped arrays; the
+    timestamp of sample ``i`` is ``start + i / sampling_rate_hz``.
+    """
+
+    asset_id: str
+    channel: str
+    start: pd.Timestamp
+    sampling_rate_hz: float
+    values: np.ndarray
+    rpm: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return int(self.values.shape[0])
+
+    def timestamp_at(self, index: int) -> pd.Timestamp:
+        return self.start + pd.Timedelta(nanoseconds=int(round(index * 1e9 / self.sampling_rate_hz)))
+
+    def timestamps(self) -> np.ndarray:
+        """Materialise the timestamp column (only needed for frame conversion)."""
+
+        offsets = np.round(np.arange(len(self)) * (1e9 / self.sampling_rate_hz)).astype("timedelta64[ns]")
+        return np.datetime64(self.start.as_unit("ns").to_datetime64()) + offsets
+
+
 def _infer_sampling_rate(timestamps: pd.Series) -> float | None:
     timestamps = pd.to_datetime(timestamps).sort_values()
     if len(timestamps) < 2:
@@ -31,12 +63,34 @@ def _infer_sampling_rate(timestamps: pd.Series) -> float | None:
     return float(1.0 / deltas.mean()) if deltas.mean() else None
 
 
+def _waveform_windows(waveform: Waveform, window_size: int, stride: int) -> list[Window]:
+    windows: list[Window] = []
+    for start in range(0, len(waveform) - window_size + 1, stride):
+        end = start + window_size
+        extras: dict[str, Any] = {}
+        if waveform.rpm is not None:
+            extras["rpm"] = waveform.rpm[start:end]
+        windows.append(
+            Window(
+                asset_id=waveform.asset_id,
+                channel=waveform.channel,
+                start=waveform.timestamp_at(start),
+                end=waveform.timestamp_at(end - 1),
+                values=waveform.values[start:end],
+                sampling_rate_hz=waveform.sampling_rate_hz,
+                extras=extras,
+            )
+        )
+    return windows
+
+
 def generate_windows(
-    df: pd.DataFrame,
+    df: pd.DataFrame | Sequence[Waveform],
     window_size: int,
     stride: int,
     time_col: str = "timestamp",
     value_col: str = "value",
+    registry: SchemaRegistry | None = None,
 ) -> list[Window]:
     """Generate sliding windows for each asset/channel pair.
 
@@ -44,17 +98,23 @@ def generate_windows(
     ----------
     df:
         Input data frame with at least ``asset_id``, ``channel`` and value
-        columns.
+        columns, or a sequence of :class:`Waveform` objects whose windows
+        are views into the underlying (possibly memory-mapped) arrays.
     window_size:
         Number of samples per window.
     stride:
         Step size between consecutive windows.
+    registry:
+        Optional :class:`~esi_agents.adapters.SchemaRegistry` supplying known
+        sampling rates; a rate is only re-inferred when it has drifted.
     """
 
     if window_size <= 0:
         raise ValueError("window_size must be positive")
     if stride <= 0:
         raise ValueError("stride must be positive")
+    if not isinstance(df, pd.DataFrame):
+        return [window for waveform in df for window in _waveform_windows(waveform, window_size, stride)]
     if not {"asset_id", "channel", value_col}.issubset(df.columns):
         raise ValueError("DataFrame missing required columns")
 
@@ -67,7 +127,12 @@ def generate_windows(
             pd.to_datetime(group[time_col]).to_numpy() if time_col in group.columns else None
         )
         rpm = group["rpm"].to_numpy() if "rpm" in group.columns else None
-        sampling_rate = _infer_sampling_rate(group[time_col]) if time_col in group else None
+        if timestamps is None:
+            sampling_rate = None
+        elif registry is not None:
+            sampling_rate = registry.resolve_sampling_rate(str(asset_id), str(channel), timestamps)
+        else:
+            sampling_rate = _infer_sampling_rate(group[time_col])
         for start in range(0, len(values) - window_size + 1, stride):
             end = start + window_size
             window_values = values[start:end]
@@ -94,4 +159,55 @@ def generate_windows(
     return windows
 
 
-__all__ = ["Window", "generate_windows"]
+class ChunkedWindower:
+    """Cut windows from time-ordered chunks of a larger-than-memory input.
+
+    Each ``(asset_id, channel)`` key keeps the samples after its last
+    window start plus ``stride`` (at most ``window_size - 1`` rows) and
+    prepends them to its rows in the next chunk. When ``stride`` exceeds
+    ``window_size`` the rows still to skip before the next window start
+    are remembered instead, so the windows match those
+    :func:`generate_windows` would produce on the full input.
+    """
+
+    def __init__(self, window_size: int, stride: int, registry: SchemaRegistry | None = None):
+        if window_size <= 0:
+            raise ValueError("window_size must be positive")
+        if stride <= 0:
+            raise ValueError("stride must be positive")
+        self.window_size = window_size
+        self.stride = stride
+        self.registry = registry
+        self._carry: dict[tuple[str, str], pd.DataFrame] = {}
+        self._skip: dict[tuple[str, str], int] = {}
+
+    def feed(self, chunk: pd.DataFrame) -> list[Window]:
+        windows: list[Window] = []
+        for (asset_id, channel), group in chunk.groupby(["asset_id", "channel"], sort=False):
+            key = (str(asset_id), str(channel))
+            carry = self._carry.get(key)
+            if carry is not None:
+                group = pd.concat([carry, group], ignore_index=True)
+            if "timestamp" in group.columns:
+                group = group.sort_values("timestamp", kind="stable")
+            skip = self._skip.pop(key, 0)
+            if skip:
+                drop = min(skip, len(group))
+                group = group.iloc[drop:]
+                if skip > drop:
+                    self._skip[key] = skip - drop
+                    self._carry[key] = group.reset_index(drop=True)
+                    continue
+            produced = generate_windows(group, self.window_size, self.stride, registry=self.registry)
+            windows.extend(produced)
+            consumed = len(produced) * self.stride
+            if consumed > len(group):
+                self._skip[key] = consumed - len(group)
+            self._carry[key] = group.iloc[consumed:].reset_index(drop=True)
+        return windows
+
+    def carried_rows(self) -> int:
+        return sum(len(frame) for frame in self._carry.values())
+
+
+__all__ = ["ChunkedWindower", "Window", "Waveform", "generate_windows"]
@@ -1,21 +1,25 @@
 """Anomaly detection model zoo."""
-from .base import AnomalyDetector, CalibrationModel
-from .isolation_forest import IsolationForestDetector
-from .ocsvm import OneClassSVMDetector
-from .lof import LOFDetector
-from .hbos import HBOSDetector
-from .stl_resid import STLResidualDetector
-from .arima_resid import ARIMAResidualDetector
-from .ae_torch import AutoencoderDetector
+from .._lazy import attach
 
-__all__ = [
-    "AnomalyDetector",
-    "CalibrationModel",
-    "IsolationForestDetector",
-    "OneClassSVMDetector",
-    "LOFDetector",
-    "HBOSDetector",
-    "STLResidualDetector",
-    "ARIMAResidualDetector",
-    "AutoencoderDetector",
-]
+_EXPORTS = {
+    "AnomalyDetector": ".base",
+    "CalibrationModel": ".base",
+    "IsolationForestDetector": ".isolation_forest",
+    "OneClassSVMDetector": ".ocsvm",
+    "LOFDetector": ".lof",
+    "HBOSDetector": ".hbos",
+    "STLResidualDetector": ".stl_resid",
+    "ARIMAResidualDetector": ".arima_resid",
+    "AutoencoderDetector": ".ae_torch",
+    "CascadeDetector": ".cascade",
+    "EWMADetector": ".change_point",
+    "CUSUMDetector": ".change_point",
+    "PageHinkleyDetector": ".change_point",
+    "MODEL_REGISTRY": ".registry",
+    "ONLINE_REGISTRY": ".registry",
+    "model_class": ".registry",
+    "online_class": ".registry",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = attach(__name__, _EXPORTS)
@@ -1,11 +1,11 @@
 """Optional PyTorch autoencoder for anomaly detection."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import numpy as np
 
-from .base import CalibrationModel
+from .base import CalibrationModel, minmax_scale
 
 try:  # pragma: no cover - optional dependency
     import torch
@@ -23,6 +23,7 @@ class AutoencoderDetector:
     lr: float = 1e-3
     epochs: int = 50
     calibrator: CalibrationModel | None = None
+    score_range_: tuple[float, float] | None = field(default=None, init=False)
 
     def __post_init__(self) -> None:
         if torch is None:
@@ -47,15 +48,19 @@ class AutoencoderDetector:
             loss = self.loss_fn(recon, data)
             loss.backward()
             self.optim.step()
+        raw = self._raw_scores(X)
+        self.score_range_ = (float(raw.min()), float(raw.max()))
         return self
 
-    def score_samples(self, X: np.ndarray) -> np.ndarray:
+    def _raw_scores(self, X: np.ndarray) -> np.ndarray:
         data = torch.tensor(X, dtype=torch.float32)
         with torch.no_grad():
             recon = self.model(data)
             residual = torch.mean((data - recon) ** 2, dim=1)
-        scores = residual.numpy()
-        scores = (scores - scores.min()) / (scores.max() - scores.min() + 1e-8)
+        return residual.numpy()
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        scores = minmax_scale(self._raw_scores(X), self.score_range_)
         if self.calibrator:
             return self.calibrator.transform(scores)
         return scores
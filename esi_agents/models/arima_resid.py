@@ -1,12 +1,12 @@
 """ARIMA-lite residual based detector."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import numpy as np
 from statsmodels.tsa.arima.model import ARIMA  # type: ignore
 
-from .base import CalibrationModel
+from .base import CalibrationModel, minmax_scale
 
 
 @dataclass
@@ -14,6 +14,7 @@ class ARIMAResidualDetector:
     order: tuple[int, int, int] = (1, 0, 0)
     feature_index: int = 0
     calibrator: CalibrationModel | None = None
+    score_range_: tuple[float, float] | None = field(default=None, init=False)
 
     def fit(self, X: np.ndarray, y: np.ndarray | None = None) -> "ARIMAResidualDetector":
         series = X[:, self.feature_index].astype(float)
@@ -23,6 +24,8 @@ class ARIMAResidualDetector:
         self.result_ = model.fit()
         resid = self.result_.resid
         self.scale_ = float(np.median(np.abs(resid)) + 1e-6)
+        raw = np.abs(np.asarray(resid, dtype=float)) / self.scale_
+        self.score_range_ = (float(raw.min()), float(raw.max()))
         return self
 
     def score_samples(self, X: np.ndarray) -> np.ndarray:
@@ -31,8 +34,7 @@ class ARIMAResidualDetector:
         series = X[:, self.feature_index].astype(float)
         forecast = self.result_.forecast(steps=len(series))
         residual = np.abs(series - forecast) / self.scale_
-        residual = residual.astype(float)
-        residual = (residual - residual.min()) / (residual.max() - residual.min() + 1e-8)
+        residual = minmax_scale(residual.astype(float), self.score_range_)
         if self.calibrator:
             return self.calibrator.transform(residual)
         return residual
@@ -29,4 +29,22 @@ class CalibrationModel:
         return 1.0 / (1.0 + np.exp(-logits))
 
 
-__all__ = ["AnomalyDetector", "CalibrationModel"]
+def minmax_scale(raw: np.ndarray, score_range: tuple[float, float] | None = None) -> np.ndarray:
+    """Rescale raw outlier scores so the reference range maps to ``[0, 1]``.
+
+    When ``score_range`` (the raw score range observed at fit time) is given
+    the result no longer depends on which samples are scored together, so a
+    single streaming window is scored the same way as a full batch. Scores
+    below the fit-time minimum are clipped to 0; scores beyond the fit-time
+    maximum keep growing past 1, so anomalies stronger than anything seen
+    in training still rank against each other.
+    """
+
+    if score_range is None:
+        lo, hi = float(raw.min()), float(raw.max())
+    else:
+        lo, hi = score_range
+    return np.maximum((raw - lo) / (hi - lo + 1e-8), 0.0)
+
+
+__all__ = ["AnomalyDetector", "CalibrationModel", "minmax_scale"]
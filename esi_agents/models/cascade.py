@@ -0,0 +1,41 @@
+"""Two-tier detector: a cheap pre-screen in front of an expensive model."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+
+@dataclass
+class CascadeDetector:
+    """Score every row with ``screen`` and escalate the suspicious ones to ``model``.
+
+    Rows whose screen score is at or above ``prescreen`` are rescored by
+    ``model``; the rest keep their screen score. Both detectors must
+    already be fitted.
+    """
+
+    screen: Any
+    model: Any
+    prescreen: float
+
+    def fit(self, X: np.ndarray, y: np.ndarray | None = None) -> "CascadeDetector":
+        self.screen.fit(X, y)
+        self.model.fit(X, y)
+        return self
+
+    def score_cascade(self, X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Scores and the mask of rows that were escalated to ``model``."""
+
+        scores = np.asarray(self.screen.score_samples(X), dtype=float)
+        escalated = scores >= self.prescreen
+        if escalated.any():
+            scores[escalated] = self.model.score_samples(X[escalated])
+        return scores, escalated
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        return self.score_cascade(X)[0]
+
+
+__all__ = ["CascadeDetector"]
@@ -0,0 +1,153 @@
+"""Online change-point detectors updated once per sample."""
+from __future__ import annotations
+
+import abc
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def _lindley(start: float, steps: np.ndarray) -> np.ndarray:
+    """``s[i] = max(0, s[i - 1] + steps[i])`` from ``s[-1] = start``, without a loop."""
+
+    walk = start + np.cumsum(steps)
+    return walk - np.minimum(np.minimum.accumulate(walk), 0.0)
+
+
+@dataclass
+class _Baseline(abc.ABC):
+    """Mean and scale of the in-control series, fitted on column ``feature_index``."""
+
+    feature_index: int = 0
+
+    def fit(self, X: np.ndarray, y: np.ndarray | None = None) -> _Baseline:
+        series = np.asarray(X, dtype=float)[:, self.feature_index]
+        series = series[np.isfinite(series)]
+        if series.size < 2:
+            raise ValueError(f"{type(self).__name__} needs at least two finite samples to fit")
+        self.mean_ = float(series.mean())
+        self.scale_ = float(series.std() + 1e-9)
+        return self
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """Statistic over the rows of ``X`` read as one series, capped at 1."""
+
+        if not hasattr(self, "mean_"):
+            raise RuntimeError(f"{type(self).__name__} must be fitted before scoring")
+        series = np.asarray(X, dtype=float)[:, self.feature_index]
+        return np.minimum(self.update(self.new_state(), series), 1.0)
+
+    @abc.abstractmethod
+    def new_state(self) -> list[float]:
+        """State of a series that has not seen any samples yet."""
+
+    def update(self, state: list[float], series: np.ndarray) -> np.ndarray:
+        """Advance ``state`` over ``series``; a statistic of 1 or more is a change.
+
+        Detectors that accumulate evidence reset after signalling. NaN
+        samples are skipped and score 0.
+        """
+
+        series = np.asarray(series, dtype=float)
+        out = np.zeros(len(series))
+        present = ~np.isnan(series)
+        if present.any():
+            out[present] = self._update(state, series[present])
+        return out
+
+    @abc.abstractmethod
+    def _update(self, state: list[float], series: np.ndarray) -> np.ndarray:
+        """Statistic for each sample of a NaN-free ``series``."""
+
+
+@dataclass
+class EWMADetector(_Baseline):
+    """EWMA control chart: ``alpha``-smoothed level outside ``limit`` sigma."""
+
+    alpha: float = 0.1
+    limit: float = 3.0
+
+    def new_state(self) -> list[float]:
+        return [self.mean_]
+
+    def _update(self, state: list[float], series: np.ndarray) -> np.ndarray:
+        from scipy.signal import lfilter  # type: ignore
+
+        alpha = self.alpha
+        bound = self.limit * self.scale_ * math.sqrt(alpha / (2.0 - alpha))
+        level = lfilter([alpha], [1.0, alpha - 1.0], series, zi=[(1.0 - alpha) * state[0]])[0]
+        state[0] = float(level[-1])
+        return np.abs(level - self.mean_) / bound
+
+
+@dataclass
+class CUSUMDetector(_Baseline):
+    """Two-sided tabular CUSUM of standardised samples (slack ``k``, limit ``h``)."""
+
+    k: float = 0.5
+    h: float = 5.0
+
+    def new_state(self) -> list[float]:
+        return [0.0, 0.0]
+
+    def _update(self, state: list[float], series: np.ndarray) -> np.ndarray:
+        z = (series - self.mean_) / self.scale_
+        out = np.empty(len(z))
+        start = 0
+        while start < len(z):
+            high = _lindley(state[0], z[start:] - self.k)
+            low = _lindley(state[1], -z[start:] - self.k)
+            stat = np.maximum(high, low) / self.h
+            hits = np.flatnonzero(stat >= 1.0)
+            if not len(hits):
+                out[start:] = stat
+                state[0], state[1] = float(high[-1]), float(low[-1])
+                break
+            # Signalled: restart both sums after the alarm sample.
+            end = start + int(hits[0]) + 1
+            out[start:end] = stat[: end - start]
+            state[0] = state[1] = 0.0
+            start = end
+        return out
+
+
+@dataclass
+class PageHinkleyDetector(_Baseline):
+    """Page-Hinkley test for an upward shift of the standardised series.
+
+    ``delta`` is the tolerated drift and ``threshold`` the cumulative
+    deviation that signals a change, both in baseline standard deviations.
+    """
+
+    delta: float = 0.5
+    threshold: float = 50.0
+
+    def new_state(self) -> list[float]:
+        return [0.0, 0.0, 0.0, 0.0]  # samples, running mean, cumulative sum, its minimum
+
+    def _update(self, state: list[float], series: np.ndarray) -> np.ndarray:
+        z = (series - self.mean_) / self.scale_
+        out = np.empty(len(z))
+        start = 0
+        while start < len(z):
+            n, running, total, lowest = state
+            seg = z[start:]
+            counts = n + np.arange(1, len(seg) + 1)
+            means = (n * running + np.cumsum(seg)) / counts
+            totals = total + np.cumsum(seg - means - self.delta)
+            lows = np.minimum(np.minimum.accumulate(totals), lowest)
+            stat = (totals - lows) / self.threshold
+            hits = np.flatnonzero(stat >= 1.0)
+            if not len(hits):
+                out[start:] = stat
+                state[:] = [float(counts[-1]), float(means[-1]), float(totals[-1]), float(lows[-1])]
+                break
+            end = start + int(hits[0]) + 1
+            out[start:end] = stat[: end - start]
+            state[:] = [0.0, 0.0, 0.0, 0.0]
+            start = end
+        return out
+
+
+__all__ = ["CUSUMDetector", "EWMADetector", "PageHinkleyDetector"]
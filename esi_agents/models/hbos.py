@@ -5,7 +5,7 @@ from dataclasses import dataclass, field
 
 import numpy as np
 
-from .base import CalibrationModel
+from .base import CalibrationModel, minmax_scale
 
 
 @dataclass
@@ -13,6 +13,7 @@ class HBOSDetector:
     n_bins: int = 15
     calibrator: CalibrationModel | None = None
     histograms: list[tuple[np.ndarray, np.ndarray]] = field(default_factory=list)
+    score_range_: tuple[float, float] | None = field(default=None, init=False)
 
     def fit(self, X: np.ndarray, y: np.ndarray | None = None) -> "HBOSDetector":
         self.histograms.clear()
@@ -20,22 +21,24 @@ class HBOSDetector:
             hist, edges = np.histogram(X[:, i], bins=self.n_bins, density=True)
             hist = np.where(hist == 0, 1e-8, hist)
             self.histograms.append((hist, edges))
+        raw = self._raw_scores(X)
+        self.score_range_ = (float(raw.min()), float(raw.max()))
         return self
 
+    def _raw_scores(self, X: np.ndarray) -> np.ndarray:
+        # One searchsorted per feature over all rows; summing the columns in
+        # order gives the same floating-point result as the per-row loop.
+        X = np.asarray(X, dtype=float)
+        log_density = np.zeros(X.shape[0])
+        for column, (hist, edges) in zip(X.T, self.histograms):
+            idx = np.clip(np.searchsorted(edges, column, side="right") - 1, 0, len(hist) - 1)
+            log_density += np.log(hist[idx])
+        return -log_density
+
     def score_samples(self, X: np.ndarray) -> np.ndarray:
         if not self.histograms:
             raise RuntimeError("HBOSDetector must be fitted before scoring")
-        scores = []
-        for row in X:
-            log_density = 0.0
-            for value, (hist, edges) in zip(row, self.histograms):
-                idx = np.searchsorted(edges, value, side="right") - 1
-                idx = np.clip(idx, 0, len(hist) - 1)
-                density = hist[idx]
-                log_density += np.log(density)
-            scores.append(float(-log_density))
-        scores_arr = np.asarray(scores)
-        scores_arr = (scores_arr - scores_arr.min()) / (scores_arr.max() - scores_arr.min() + 1e-8)
+        scores_arr = minmax_scale(self._raw_scores(X), self.score_range_)
         if self.calibrator:
             return self.calibrator.transform(scores_arr)
         return scores_arr
@@ -1,12 +1,12 @@
 """Isolation forest detector wrapper."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import numpy as np
 from sklearn.ensemble import IsolationForest
 
-from .base import CalibrationModel
+from .base import CalibrationModel, minmax_scale
 
 
 @dataclass
@@ -16,6 +16,7 @@ class IsolationForestDetector:
     contamination: float | str | None = "auto"
     random_state: int | None = 42
     calibrator: CalibrationModel | None = None
+    score_range_: tuple[float, float] | None = field(default=None, init=False)
 
     def __post_init__(self) -> None:
         self.model = IsolationForest(
@@ -27,11 +28,13 @@ class IsolationForestDetector:
 
     def fit(self, X: np.ndarray, y: np.ndarray | None = None) -> "IsolationForestDetector":
         self.model.fit(X)
+        raw = -self.model.score_samples(X)
+        self.score_range_ = (float(raw.min()), float(raw.max()))
         return self
 
     def score_samples(self, X: np.ndarray) -> np.ndarray:
         raw = -self.model.score_samples(X)
-        scores = (raw - raw.min()) / (raw.max() - raw.min() + 1e-8)
+        scores = minmax_scale(raw, self.score_range_)
         if self.calibrator:
             return self.calibrator.transform(scores)
         return scores
@@ -0,0 +1,49 @@
+"""Detector classes resolved by configuration name."""
+from __future__ import annotations
+
+import importlib
+
+from .base import AnomalyDetector
+
+# Name used in the ``models`` config section -> ``module:Class``. Modules are
+# only imported when a config asks for them, so a run that trains HBOS never
+# loads sklearn, statsmodels or torch.
+MODEL_REGISTRY: dict[str, str] = {
+    "isolation_forest": ".isolation_forest:IsolationForestDetector",
+    "ocsvm": ".ocsvm:OneClassSVMDetector",
+    "lof": ".lof:LOFDetector",
+    "hbos": ".hbos:HBOSDetector",
+    "stl_resid": ".stl_resid:STLResidualDetector",
+    "arima_resid": ".arima_resid:ARIMAResidualDetector",
+}
+
+# Per-sample change-point detectors for ``stream.online``. They read their
+# rows as one series, so they are kept out of training and the benchmarks.
+ONLINE_REGISTRY: dict[str, str] = {
+    "ewma": ".change_point:EWMADetector",
+    "cusum": ".change_point:CUSUMDetector",
+    "page_hinkley": ".change_point:PageHinkleyDetector",
+}
+
+
+def _resolve(registry: dict[str, str], name: str, kind: str) -> type:
+    target = registry.get(name.lower())
+    if target is None:
+        raise ValueError(f"Unknown {kind} '{name}'")
+    module, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module, __package__), attr)
+
+
+def model_class(name: str) -> type[AnomalyDetector]:
+    """Import and return the detector class registered as ``name``."""
+
+    return _resolve(MODEL_REGISTRY, name, "model")
+
+
+def online_class(name: str) -> type:
+    """Import and return the change-point detector registered as ``name``."""
+
+    return _resolve(ONLINE_REGISTRY, name, "online detector")
+
+
+__all__ = ["MODEL_REGISTRY", "ONLINE_REGISTRY", "model_class", "online_class"]
@@ -1,12 +1,12 @@
 """Detector based on robust STL residuals."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import numpy as np
 from statsmodels.tsa.seasonal import STL  # type: ignore
 
-from .base import CalibrationModel
+from .base import CalibrationModel, minmax_scale
 
 
 @dataclass
@@ -14,6 +14,7 @@ class STLResidualDetector:
     period: int = 24
     feature_index: int = 0
     calibrator: CalibrationModel | None = None
+    score_range_: tuple[float, float] | None = field(default=None, init=False)
 
     def fit(self, X: np.ndarray, y: np.ndarray | None = None) -> "STLResidualDetector":
         series = X[:, self.feature_index].astype(float)
@@ -25,20 +26,20 @@ class STLResidualDetector:
         self.seasonal_pattern_ = result.seasonal[: self.period]
         resid = result.resid
         self.scale_ = float(np.median(np.abs(resid)) + 1e-6)
+        raw = self._raw_scores(X)
+        self.score_range_ = (float(raw.min()), float(raw.max()))
         return self
 
+    def _raw_scores(self, X: np.ndarray) -> np.ndarray:
+        series = X[:, self.feature_index].astype(float)
+        pattern = self.seasonal_pattern_
+        expected = self.trend_level_ + pattern[np.arange(series.size) % len(pattern)]
+        return np.abs(series - expected) / self.scale_
+
     def score_samples(self, X: np.ndarray) -> np.ndarray:
         if not hasattr(self, "seasonal_pattern_"):
             raise RuntimeError("STLResidualDetector must be fitted before scoring")
-        series = X[:, self.feature_index].astype(float)
-        pattern = self.seasonal_pattern_
-        scores = []
-        for idx, value in enumerate(series):
-            expected = self.trend_level_ + pattern[idx % len(pattern)]
-            residual = abs(value - expected) / self.scale_
-            scores.append(residual)
-        scores_arr = np.asarray(scores)
-        scores_arr = (scores_arr - scores_arr.min()) / (scores_arr.max() - scores_arr.min() + 1e-8)
+        scores_arr = minmax_scale(self._raw_scores(X), self.score_range_)
         if self.calibrator:
             return self.calibrator.transform(scores_arr)
         return scores_arr
@@ -6,6 +6,15 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from esi_agents.agents import FeatureEngineer, ModelSelector, ModelTrainer
+
+# Streaming tests train on ``synthetic_signal`` with this config unless they override keys.
+STREAM_CONFIG = {
+    "window": {"size": 50, "stride": 25},
+    "features": {"time": True, "freq": False, "envelope": False, "orders": False},
+    "models": [{"name": "hbos"}],
+}
+
 
 @pytest.fixture
 def synthetic_signal() -> pd.DataFrame:
@@ -21,3 +30,15 @@ def synthetic_signal() -> pd.DataFrame:
             "rpm": rpm,
         }
     )
+
+
+@pytest.fixture
+def stream_selection(synthetic_signal):
+    """``stream_selection(**overrides)`` trains on ``synthetic_signal`` and returns ``(config, selection)``."""
+
+    def train(**overrides):
+        config = {**STREAM_CONFIG, **overrides}
+        features = FeatureEngineer().transform(synthetic_signal, config).matrix
+        return config, ModelSelector().select(ModelTrainer().train(features, config), labels=None)
+
+    return train
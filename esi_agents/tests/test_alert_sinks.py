@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from esi_agents.agents.alert_sinks import make_sink
+
+
+def _messages(n):
+    return [
+        {"asset_id": "A", "channel": "x", "timestamp": f"2024-01-01T00:00:{i:02d}", "anomaly_score": i / 10, "alert": i % 3 == 0}
+        for i in range(n)
+    ]
+
+
+def test_jsonl_sink_rotates_and_flushes_on_close(tmp_path):
+    path = tmp_path / "alerts.jsonl"
+    sink = make_sink({"type": "jsonl", "path": str(path), "max_bytes": 200, "flush_interval_s": 60})
+    for i, message in enumerate(_messages(40)):
+        sink.emit(message)
+        if i % 5 == 4 and i < 30:
+            sink.flush()
+    sink.close()
+    files = sorted(tmp_path.glob("alerts*.jsonl"))
+    assert len(files) > 1
+    rows = [json.loads(line) for file in files for line in file.read_text().splitlines()]
+    assert sorted(row["anomaly_score"] for row in rows) == [m["anomaly_score"] for m in _messages(40)]
+
+
+def test_sqlite_sink_writes_alerts_only_on_close(tmp_path):
+    path = tmp_path / "alerts.db"
+    with make_sink({"type": "sqlite", "path": str(path), "flush_interval_s": 60, "alerts_only": True}) as sink:
+        for message in _messages(30):
+            sink(message)
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT timestamp, alert, payload FROM alerts ORDER BY timestamp").fetchall()
+    assert len(rows) == 10
+    assert all(alert == 1 for _, alert, _ in rows)
+    assert json.loads(rows[0][2])["asset_id"] == "A"
+
+
+def test_parquet_sink_reads_back_mixed_message_kinds(tmp_path):
+    pytest.importorskip("pyarrow")
+    windows = [{**message, "model_version": "v1"} for message in _messages(3)]
+    change = {**_messages(1)[0], "event": "change_point", "detector": "cusum", "field": "value"}
+    with make_sink({"type": "parquet", "path": str(tmp_path / "alerts"), "flush_interval_s": 60}) as sink:
+        for message in windows:
+            sink(message)
+        sink.flush()
+        sink(change)
+    frame = pd.read_parquet(tmp_path / "alerts").sort_values(["event", "anomaly_score"], na_position="first")
+    assert len(frame) == 4 and len(list((tmp_path / "alerts").glob("*.parquet"))) == 2
+    assert frame["event"].tolist()[-1] == "change_point" and frame["event"].isna().sum() == 3
+    assert frame["model_version"].tolist()[:3] == ["v1"] * 3
+    assert json.loads(frame["payload"].iloc[-1])["detector"] == "cusum"
+    assert pd.api.types.is_datetime64_any_dtype(frame["timestamp"])
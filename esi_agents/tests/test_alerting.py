@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from esi_agents.adapters import EventBatch
+from esi_agents.agents import FeatureEngineer, ModelTrainer, StreamScorer
+from esi_agents.agents.alerting import AlertPolicy, AlertTracker
+from esi_agents.models import CascadeDetector
+
+
+def _windows(scores):
+    start = pd.Timestamp("2024-01-01")
+    return [
+        {
+            "asset_id": "A",
+            "channel": "x",
+            "timestamp": (start + pd.Timedelta(seconds=i)).isoformat(),
+            "anomaly_score": score,
+            "alert": score >= 0.9,
+        }
+        for i, score in enumerate(scores)
+    ]
+
+
+def test_tracker_emits_transitions_with_hysteresis_duration_and_cooldown():
+    tracker = AlertTracker(AlertPolicy(enter=0.9, exit=0.5, min_duration_s=1, cooldown_s=5))
+    #        0    1     2     3    4     5    6    7     8     9    10    11
+    scores = [0.95, 0.2, 0.95, 0.97, 0.7, 0.99, 0.4, 0.95, 0.96, 0.3, 0.95, 0.95]
+    events = tracker.update(_windows(scores))
+    # A lone spike does not open; chatter between exit and enter keeps it
+    # open; the re-entry at 7-8 falls inside the cooldown after the close at 6.
+    assert [(e["event"], e["timestamp"][-2:]) for e in events] == [
+        ("alert_start", "03"),
+        ("alert_end", "06"),
+        ("alert_start", "11"),
+    ]
+    assert events[0]["started_at"].endswith("02") and events[1]["peak_score"] == 0.99
+    assert events[1]["duration_s"] == 4.0
+
+
+def test_cascade_escalates_only_prescreened_windows(synthetic_signal, stream_selection):
+    config, selection = stream_selection(models=[{"name": "isolation_forest"}], threshold=0.6)
+    features = FeatureEngineer().transform(synthetic_signal, config).matrix
+    screen = ModelTrainer().train(features, {"models": [{"name": "hbos"}]})[0]
+    full = selection.best_model.model
+    selection.best_model.model = CascadeDetector(screen.model, full, float(np.quantile(screen.scores, 0.7)))
+
+    async def batches():
+        yield EventBatch.from_frame(synthetic_signal)
+
+    scorer = StreamScorer(alerting={"emit": "all"})
+    out: list[dict] = []
+    asyncio.run(scorer.run_batches(batches(), config, selection, out.append))
+    X = features.select_dtypes(include=[np.number]).to_numpy(dtype=float)
+    escalated = np.array([m["escalated"] for m in out])
+    assert 0 < scorer.escalation_rate < 1 and scorer.escalation_rate == escalated.mean()
+    expected = np.where(escalated, full.score_samples(X), screen.model.score_samples(X))
+    np.testing.assert_allclose([m["anomaly_score"] for m in out], expected)
+    assert not any(m["alert"] for m, e in zip(out, escalated) if not e)
+    assert set(scorer.snapshot().extras["alerts"]) == {("asset_1", "accel")}
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import dataclasses
+
+from esi_agents.bench import (
+    BenchContext,
+    FleetSpec,
+    build_suite,
+    compare,
+    generate_fleet,
+    load_results,
+    run_case,
+    save_results,
+    select_cases,
+)
+
+
+def test_synthetic_fleet_is_deterministic_and_labels_faults():
+    spec = FleetSpec(assets=4, channels=("x", "y"), duration_s=1.0, fault_fraction=0.5, seed=3)
+    first, second = generate_fleet(spec), generate_fleet(spec)
+    assert first.frame.equals(second.frame)
+    assert len(first.frame) == spec.rows
+    assert first.frame["timestamp"].is_monotonic_increasing
+    assert len(first.faults) == 2
+    faulty = first.labels[first.labels["label"] == 1]["asset_id"].unique()
+    assert sorted(faulty) == sorted(f.asset_id for f in first.faults)
+    assert not generate_fleet(dataclasses.replace(spec, seed=4)).frame.equals(first.frame)
+
+
+def test_bench_results_round_trip_and_flag_regressions(tmp_path):
+    context = BenchContext(FleetSpec(assets=1, channels=("x",), duration_s=1.0), tmp_path)
+    cases = select_cases(build_suite(context), ["features.time", "models.hbos.*"])
+    assert [case.name for case in cases] == ["features.time", "models.hbos.fit", "models.hbos.score"]
+    results = [run_case(case, repeat=1) for case in cases]
+    assert all(result.status == "ok" and result.throughput > 0 for result in results)
+    baseline = load_results(save_results(tmp_path / "base.json", results, {}))
+    assert compare(results, baseline) == []
+    faster = {name: dataclasses.replace(r, throughput=r.throughput * 10) for name, r in baseline.items()}
+    assert {r.name for r in compare(results, faster)} == set(baseline)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from esi_agents.adapters import EventBatch
+from esi_agents.agents import StreamScorer
+
+WINDOW = {"size": 20, "stride": 10}
+
+
+def _score(frame, trained, event_time, batch_size=9):
+    config, selection = trained
+    scorer = StreamScorer(event_time=event_time)
+    out: list[dict] = []
+
+    async def batches():
+        for start in range(0, len(frame), batch_size):
+            yield EventBatch.from_frame(frame.iloc[start : start + batch_size])
+
+    asyncio.run(scorer.run_batches(batches(), config, selection, out.append))
+    return scorer, [(m["timestamp"], round(m["anomaly_score"], 9)) for m in out]
+
+
+def test_reordered_and_duplicated_samples_score_like_the_ordered_stream(synthetic_signal, stream_selection):
+    trained = stream_selection(window=WINDOW)
+    _, expected = _score(synthetic_signal, trained, None)
+
+    rng = np.random.default_rng(3)
+    order = list(np.argsort(synthetic_signal.index.to_numpy() + rng.uniform(0, 4, len(synthetic_signal))))
+    for row in (5, 30, 61):  # resent right after the original
+        order.insert(order.index(row) + 1, row)
+    noisy = synthetic_signal.iloc[order]  # up to 4 samples (40 ms) out of order
+    scorer, got = _score(noisy, trained, {"lateness_s": 0.05})
+    assert got == expected
+    assert scorer.event_time.duplicates == 3 and scorer.event_time.late == 0
+
+    gapped = synthetic_signal.copy()
+    gapped.loc[55:, "timestamp"] += pd.Timedelta(seconds=5)
+    gapped = pd.concat([gapped, gapped.iloc[[10]]])  # far behind the watermark
+    scorer, got = _score(gapped, trained, {"lateness_s": 0.05, "max_gap_s": 1.0})
+    ends = [pd.Timestamp(ts) for ts, _ in got]
+    gap_at = gapped["timestamp"].iloc[55]
+    starts = [end - pd.Timedelta(milliseconds=190) for end in ends]
+    assert not any(start < gap_at <= end for start, end in zip(starts, ends))
+    assert scorer.event_time.gaps == 1 and scorer.event_time.late == 1
+
+
+def test_windows_between_several_gaps_do_not_depend_on_batch_size(synthetic_signal, stream_selection):
+    trained = stream_selection(window=WINDOW)
+    frame = pd.concat([synthetic_signal] * 6, ignore_index=True)
+    frame["timestamp"] = pd.date_range("2024-01-01", periods=len(frame), freq="10ms")
+    for start in (100, 200, 300, 400, 500):  # five gaps, 100 samples apart
+        frame.loc[start:, "timestamp"] += pd.Timedelta(seconds=5)
+    event_time = {"max_gap_s": 1.0}
+    _, whole = _score(frame, trained, event_time, batch_size=600)
+    scorer, small = _score(frame, trained, event_time, batch_size=100)
+    assert whole == small
+    assert len(whole) == 6 * 9  # (100 - 20) // 10 + 1 windows per run
+    assert scorer.event_time.gaps == 5
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from esi_agents.workflows.fleet import FleetJob, load_manifest, run_fleet
+
+
+def test_fleet_runs_jobs_and_retries_failures(tmp_path):
+    config = {
+        "adapter": "csv",
+        "params": {"path": "data/generator.csv"},
+        "schema_registry": str(tmp_path / "registry.db"),
+        "window": {"size": 128, "stride": 64},
+        "features": {"time": True, "freq": True, "envelope": False, "orders": False},
+        "models": [{"name": "hbos"}],
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    manifest = {
+        "concurrency": 2,
+        "shared": {"schema_registries": [config["schema_registry"]]},
+        "defaults": {"config": str(config_path), "retries": 1},
+        "jobs": [
+            {"out": str(tmp_path / "good")},
+            {"name": "missing", "input": str(tmp_path / "missing.csv"), "out": str(tmp_path / "bad")},
+        ],
+    }
+    manifest_path = tmp_path / "fleet.yaml"
+    manifest_path.write_text(yaml.safe_dump(manifest))
+    jobs, options = load_manifest(manifest_path)
+    summary = run_fleet(jobs, options["concurrency"], options["shared"], tmp_path / "fleet")
+    rows = summary.set_index("job")
+    assert rows.loc["good", "status"] == "ok"
+    assert rows.loc["good", "attempts"] == 1
+    assert rows.loc["good", "features_s"] > 0
+    assert rows.loc["missing", "status"] == "failed"
+    assert rows.loc["missing", "attempts"] == 2
+    assert (tmp_path / "fleet" / "summary.csv").exists()
+
+
+def test_fleet_kills_job_over_memory_cap_and_keeps_going(tmp_path):
+    rows = 4_000_000
+    pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-02-01", periods=rows, freq="20ms"),
+            "asset_id": np.arange(rows).astype(str),
+            "channel": "current_a",
+            "value": np.zeros(rows),
+        }
+    ).to_parquet(tmp_path / "big.parquet")
+    base = {
+        "window": {"size": 128, "stride": 64},
+        "features": {"time": True, "freq": True, "envelope": False, "orders": False},
+        "models": [{"name": "hbos"}],
+    }
+    small = {**base, "adapter": "csv", "params": {"path": "data/generator.csv"}}
+    big = {**base, "adapter": "parquet", "params": {"path": str(tmp_path / "big.parquet")}}
+    for name, config in (("small", small), ("big", big)):
+        (tmp_path / f"{name}.yaml").write_text(yaml.safe_dump(config))
+    # The cap is below a warm worker's RSS but above what the small job adds to it.
+    jobs = [
+        FleetJob("capped", str(tmp_path / "big.yaml"), str(tmp_path / "capped"), memory_mb=100),
+        FleetJob("small", str(tmp_path / "small.yaml"), str(tmp_path / "small"), memory_mb=100),
+    ]
+    rows = run_fleet(jobs, concurrency=1).set_index("job")
+    assert rows.loc["capped", "status"] == "failed"
+    assert rows.loc["capped", "error"].startswith("MemoryError: job grew worker RSS")
+    assert rows.loc["small", "status"] == "ok"
+    assert rows.loc["small", "attempts"] == 1
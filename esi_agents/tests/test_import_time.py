@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("sklearn", "scipy", "statsmodels", "matplotlib", "torch")
+# Cumulative seconds for importing the module; pandas/numpy dominate it.
+BUDGET_S = float(os.environ.get("ESI_IMPORT_BUDGET_S", "1.5"))
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module, from ``-X importtime``."""
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["esi_agents.cli.esi_stream", "esi_agents.workflows.stream_pipeline", "esi_agents.agents.orchestrator"],
+)
+def test_entry_points_do_not_import_heavy_libraries(module):
+    loaded = {name.split(".")[0] for name in _import_times(module)}
+    assert not loaded & set(HEAVY)
+
+
+def test_stream_pipeline_import_time_budget():
+    module = "esi_agents.workflows.stream_pipeline"
+    best = min(_import_times(module)[module] for _ in range(2))
+    assert best / 1e6 < BUDGET_S
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from esi_agents.adapters import BaseAdapter, EventBatch, MergedStream, StreamSource
+from esi_agents.agents.telemetry import StreamMetrics
+from esi_agents.workflows.stream_pipeline import _watch_merged
+
+
+class ListAdapter(BaseAdapter):
+    """Stream adapter replaying fixed batches with an optional delay."""
+
+    def __init__(self, frames, delay_s=0.0):
+        self.frames = frames
+        self.delay_s = delay_s
+
+    def load(self, params):
+        return pd.concat(self.frames, ignore_index=True)
+
+    async def subscribe(self, params):
+        for frame in self.frames:
+            for record in frame.to_dict(orient="records"):
+                yield record
+
+    async def subscribe_batches(self, params):
+        for frame in self.frames:
+            await asyncio.sleep(self.delay_s)
+            yield EventBatch.from_frame(frame)
+
+
+def _frames(asset_id, offset_ms, chunks=4, size=25):
+    frames = []
+    for chunk in range(chunks):
+        start = pd.Timestamp("2024-01-01") + pd.Timedelta(milliseconds=offset_ms + chunk * size * 10)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": pd.date_range(start, periods=size, freq="10ms"),
+                    "asset_id": asset_id,
+                    "channel": "accel",
+                    "value": np.arange(size, dtype=float),
+                }
+            )
+        )
+    return frames
+
+
+def test_merged_stream_interleaves_by_event_time():
+    merged = MergedStream(
+        [
+            StreamSource("a", ListAdapter(_frames("a", 0))),
+            StreamSource("b", ListAdapter(_frames("b", 5), delay_s=0.01)),
+        ],
+        reorder_window_s=10.0,
+    )
+
+    async def consume():
+        return [batch async for batch in merged.batches()]
+
+    batches = asyncio.run(consume())
+    out = EventBatch.concat(batches)
+    assert len(out) == 200
+    assert np.all(np.diff(out.timestamp.astype(np.int64)) >= 0)
+    assert merged.late == 0
+    lag = merged.lag()
+    assert lag["a"]["received"] == lag["b"]["received"] == 100
+    assert lag["a"]["event_lag_s"] is not None
+
+
+def test_merged_stream_per_key_batches():
+    merged = MergedStream(
+        [StreamSource("a", ListAdapter(_frames("a", 0))), StreamSource("b", ListAdapter(_frames("b", 5)))],
+        per_key=True,
+    )
+
+    async def consume():
+        return [batch async for batch in merged.batches()]
+
+    for batch in asyncio.run(consume()):
+        assert len(set(batch.asset_id)) == 1
+
+
+def test_merged_stream_lag_is_exported_per_source():
+    merged = MergedStream(
+        [
+            StreamSource("a", ListAdapter(_frames("a", 0))),
+            StreamSource("b", ListAdapter(_frames("b", 0)[:2])),
+        ],
+        reorder_window_s=10.0,
+    )
+    metrics = StreamMetrics()
+    _watch_merged(metrics, merged)
+    assert 'esi_stream_source_lag_seconds{source="a"} NaN' in metrics.registry.render()
+
+    async def consume():
+        return [batch async for batch in merged.batches()]
+
+    asyncio.run(consume())
+    text = metrics.registry.render()
+    assert 'esi_stream_source_lag_seconds{source="a"} 0' in text
+    assert 'esi_stream_source_lag_seconds{source="b"} 0.5' in text
+    assert 'esi_stream_source_idle_seconds{source="b"}' in text
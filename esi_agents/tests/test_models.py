@@ -25,3 +25,25 @@ def test_detectors_produce_normalised_scores():
         assert scores.shape == (100,)
         assert scores.min() >= 0
         assert scores.max() <= 1 + 1e-6
+
+
+def test_residual_detectors_score_single_rows_like_batches():
+    from esi_agents.models import ARIMAResidualDetector, STLResidualDetector
+
+    rng = np.random.default_rng(0)
+    t = np.arange(96)
+    X = (np.sin(2 * np.pi * t / 24) + 0.1 * rng.normal(size=96))[:, None]
+    for detector in (STLResidualDetector(period=24), ARIMAResidualDetector()):
+        detector.fit(X)
+        spike = np.array([[5.0]])
+        assert detector.score_samples(spike)[0] > 0.5
+        assert detector.score_samples(X[:1])[0] < detector.score_samples(spike)[0]
+
+
+def test_scores_beyond_training_range_keep_their_ranking():
+    X = np.random.default_rng(1).normal(size=(200, 2))
+    detector = LOFDetector().fit(X)
+    assert detector.score_range_ is not None
+    scores = detector.score_samples(np.array([[0.0, 0.0], [5.0, 5.0], [10.0, 10.0], [20.0, 20.0]]))
+    assert 0.0 <= scores[0] <= 1.0
+    assert 1.0 < scores[1] < scores[2] < scores[3]  # not all saturated at 1
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from esi_agents.adapters import MQTTAdapter
+from esi_agents.adapters.payloads import (
+    PAYLOAD_DECODERS,
+    encode_compact_records,
+    encode_packed_float32,
+)
+
+
+class FakeClient:
+    """In-process stand-in for ``paho.mqtt.client.Client``."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.on_message = None
+        self.started = threading.Event()
+        self.stopped = False
+
+    def connect(self, host, port, keepalive=60):
+        pass
+
+    def subscribe(self, topic):
+        self.topic = topic
+
+    def loop_start(self):
+        def _publish():
+            for topic, payload in self.messages:
+                self.on_message(self, None, SimpleNamespace(topic=topic, payload=payload))
+            self.started.set()
+
+        threading.Thread(target=_publish, daemon=True).start()
+
+    def loop_stop(self):
+        self.stopped = True
+
+    def disconnect(self):
+        pass
+
+
+def _by_topic(payload, topic, params):
+    name = "compact_records" if topic.endswith("voltage") else "packed_float32"
+    return PAYLOAD_DECODERS[name](payload, topic, params)
+
+
+def _collect(adapter, params, samples):
+    async def consume():
+        batches = []
+        total = 0
+        async for batch in adapter.subscribe_batches(params):
+            batches.append(batch)
+            total += len(batch)
+            if total >= samples:
+                break
+        return batches
+
+    return asyncio.run(asyncio.wait_for(consume(), timeout=5))
+
+
+def test_mqtt_binary_payloads_are_batched():
+    start = pd.Timestamp("2024-01-01")
+    messages = [
+        ("esi/gen_01/current_a", encode_packed_float32(np.arange(200), start, 1000.0)),
+        (
+            "esi/gen_01/voltage",
+            encode_compact_records(
+                pd.date_range(start, periods=50, freq="ms").to_numpy(), np.ones(50), np.full(50, 1800.0)
+            ),
+        ),
+    ]
+    client = FakeClient(messages)
+    params = {
+        "topic": "esi/#",
+        "topic_pattern": "esi/{asset_id}/{channel}",
+        "payload_decoder": _by_topic,
+        "client_factory": lambda: client,
+    }
+    batches = _collect(MQTTAdapter(), params, 250)
+    merged = {key: part for batch in batches for key, part in batch.groups()}
+    current = merged[("gen_01", "current_a")]
+    assert len(current) == 200
+    assert current.timestamp[1] - current.timestamp[0] == np.timedelta64(1, "ms")
+    assert np.allclose(merged[("gen_01", "voltage")].rpm, 1800.0)
+    assert client.stopped
+
+
+def test_mqtt_bounded_queue_drops_oldest():
+    start = pd.Timestamp("2024-01-01")
+    messages = [
+        ("esi/a/c", encode_packed_float32(np.full(10, float(i)), start + pd.Timedelta(seconds=i), 100.0))
+        for i in range(20)
+    ]
+    client = FakeClient(messages)
+    adapter = MQTTAdapter()
+    params = {
+        "topic": "esi/#",
+        "topic_pattern": "esi/{asset_id}/{channel}",
+        "payload_decoder": "packed_float32",
+        "client_factory": lambda: client,
+        "max_queue": 30,
+        "overflow": "drop_oldest",
+    }
+
+    async def consume():
+        stream = adapter.subscribe_batches(params)
+        first = await stream.__anext__()
+        client.started.wait(timeout=5)
+        rest = []
+        while adapter.stats()["queued"]:
+            rest.append(await stream.__anext__())
+        await stream.aclose()
+        return [first, *rest]
+
+    batches = asyncio.run(asyncio.wait_for(consume(), timeout=5))
+    stats = adapter.stats()
+    assert stats["received"] == 200
+    assert stats["dropped"] > 0
+    assert batches[-1].value[-1] == 19.0
+    assert sum(len(b) for b in batches) + stats["dropped"] == 200
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from esi_agents.adapters import EventBatch
+from esi_agents.agents import OnlineScorer, StreamScorer
+from esi_agents.agents.stream_state import load_state, save_state
+from esi_agents.models import model_class
+
+
+def _frame(values, start="2024-01-01"):
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range(start, periods=len(values), freq="10ms"),
+            "asset_id": "gen",
+            "channel": "current",
+            "value": values,
+        }
+    )
+
+
+def test_step_change_is_signalled_within_a_few_samples():
+    rng = np.random.default_rng(0)
+    history = _frame(rng.normal(0, 1, 2000))
+    live = rng.normal(0, 1, 600)
+    live[400:] += 3.0  # step change at sample 400
+    online = OnlineScorer(
+        [
+            {"type": "cusum", "field": "value"},
+            {"type": "ewma", "field": "value", "params": {"alpha": 0.2, "limit": 4}},
+            {"type": "page_hinkley", "field": "rms"},
+        ]
+    ).fit(history)
+    frame = _frame(live, start="2024-01-02")
+    out: list[dict] = []
+
+    async def batches():
+        for start in range(0, len(frame), 64):
+            yield EventBatch.from_frame(frame.iloc[start : start + 64])
+
+    async def consume():
+        return [batch async for batch in online.tap(batches(), out.append)]
+
+    assert sum(len(b) for b in asyncio.run(consume())) == len(frame)
+    step = frame["timestamp"].iloc[400]
+    first = {}
+    for message in out:
+        first.setdefault(message["detector"], pd.Timestamp(message["timestamp"]))
+    assert set(first) == {"cusum", "ewma", "page_hinkley"}
+    for detector, at in first.items():
+        assert step <= at <= step + pd.Timedelta(milliseconds=10 * 20), detector
+    assert online.change_points == len(out)
+
+
+def test_unseen_key_fits_its_baseline_during_warmup():
+    online = OnlineScorer([{"type": "cusum"}], warmup=100)
+    values = np.r_[np.random.default_rng(1).normal(5, 0.1, 300), np.full(20, 7.0)]
+    messages = online.process(EventBatch.from_frame(_frame(values[:150])))
+    messages += online.process(EventBatch.from_frame(_frame(values[150:], start="2024-01-01 00:00:01.5")))
+    assert messages and all(m["timestamp"] >= "2024-01-01T00:00:03" for m in messages)
+
+
+def test_batch_completing_warmup_is_scored_and_chunking_does_not_matter():
+    values = np.r_[np.random.default_rng(2).normal(5, 0.1, 300), np.full(20, 7.0)]
+    specs = [{"type": "cusum"}, {"type": "ewma"}, {"type": "page_hinkley", "field": "rms"}]
+    whole = OnlineScorer(specs, warmup=100).process(EventBatch.from_frame(_frame(values)))
+    assert {m["detector"] for m in whole} == {"cusum", "ewma", "page_hinkley"}
+
+    chunked = OnlineScorer(specs, warmup=100)
+    frame = _frame(values)
+    pieces = [chunked.process(EventBatch.from_frame(frame.iloc[i : i + 7])) for i in range(0, len(frame), 7)]
+    assert _rounded([m for piece in pieces for m in piece]) == _rounded(whole)
+
+
+def _rounded(messages):
+    return [{**m, "anomaly_score": round(m["anomaly_score"], 9)} for m in messages]
+
+
+def test_checkpointed_keys_resume_without_a_second_warmup(tmp_path):
+    values = np.r_[np.random.default_rng(3).normal(5, 0.1, 300), np.full(20, 7.0)]
+    frame = _frame(values)
+    specs = [{"type": "cusum"}, {"type": "page_hinkley", "field": "rms"}]
+    whole = OnlineScorer(specs, warmup=100).process(EventBatch.from_frame(frame))
+
+    first = StreamScorer()
+    first.online = OnlineScorer(specs, warmup=100)
+    head = first.online.process(EventBatch.from_frame(frame.iloc[:150]))
+    save_state(first.snapshot(), tmp_path / "state.ckpt")
+
+    restored = StreamScorer()
+    restored.online = OnlineScorer(specs, warmup=100)
+    restored.restore(load_state(tmp_path / "state.ckpt"))
+    tail = restored.online.process(EventBatch.from_frame(frame.iloc[150:]))
+    assert tail and _rounded(head + tail) == _rounded(whole)
+    assert not OnlineScorer([{"type": "ewma"}], warmup=100).restore(first.snapshot().extras["online"])
+
+
+def test_change_point_detectors_are_not_batch_models():
+    with pytest.raises(ValueError, match="Unknown model"):
+        model_class("cusum")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from esi_agents.adapters import ParquetAdapter
+
+pytest.importorskip("pyarrow")
+
+
+def _frame(asset_id: str, periods: int = 10) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=periods, freq="s"),
+            "asset_id": [asset_id] * periods,
+            "channel": ["accel"] * periods,
+            "value": [float(i) for i in range(periods)],
+            "rpm": [1800.0] * periods,
+        }
+    )
+
+
+def test_parquet_adapter_filters_and_projection(tmp_path):
+    path = tmp_path / "sample.parquet"
+    pd.concat([_frame("a"), _frame("b")]).to_parquet(path, index=False, row_group_size=5)
+    adapter = ParquetAdapter()
+    frame = adapter.load(
+        {
+            "path": path,
+            "columns": ["value"],
+            "filters": {"asset_id": "b", "start": "2024-01-01 00:00:02", "end": "2024-01-01 00:00:05"},
+        }
+    )
+    assert set(frame["asset_id"]) == {"b"}
+    assert frame["value"].tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert "rpm" not in frame.columns
+
+
+def test_parquet_adapter_hive_partitions_and_batches(tmp_path):
+    for asset_id in ("a", "b"):
+        part = tmp_path / f"asset_id={asset_id}" / "date=2024-01-01"
+        part.mkdir(parents=True)
+        _frame(asset_id).drop(columns=["asset_id"]).to_parquet(part / "part-0.parquet", index=False)
+    adapter = ParquetAdapter()
+    params = {"path": tmp_path, "filters": {"asset_id": ["a"]}, "batch_size": 4}
+    frames = list(adapter.iter_frames(params))
+    assert all(len(frame) <= 4 for frame in frames)
+    assert set(pd.concat(frames)["asset_id"]) == {"a"}
+
+    async def consume():
+        return [item async for item in adapter.subscribe(params)]
+
+    records = asyncio.run(consume())
+    assert len(records) == 10
+    assert records[0]["asset_id"] == "a"
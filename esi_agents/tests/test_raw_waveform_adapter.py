@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from esi_agents.adapters import RawWaveformAdapter
+from esi_agents.agents import DataIngestor
+from esi_agents.features import generate_windows
+
+
+def _write_capture(directory, name, values, channel, rpm_channel=None):
+    values.astype("<f4").tofile(directory / f"{name}.bin")
+    meta = {
+        "asset_id": "turbine_001",
+        "channel": channel,
+        "start_time": "2024-01-01T00:00:00",
+        "sampling_rate_hz": 1000.0,
+    }
+    if rpm_channel:
+        meta["rpm_channel"] = rpm_channel
+    (directory / f"{name}.json").write_text(json.dumps(meta))
+
+
+def test_raw_waveform_windows_are_memory_mapped(tmp_path):
+    signal = np.sin(np.linspace(0, 20 * np.pi, 2000))
+    _write_capture(tmp_path, "accel", signal, "accel_x", rpm_channel="tacho")
+    _write_capture(tmp_path, "tacho", np.full(2000, 1800.0), "tacho")
+    adapter = RawWaveformAdapter()
+    waveforms = adapter.load_waveforms(
+        {"path": tmp_path, "start": "2024-01-01T00:00:00.5", "end": "2024-01-01T00:00:01"}
+    )
+    assert len(waveforms) == 1
+    waveform = waveforms[0]
+    assert len(waveform) == 501
+    assert isinstance(waveform.values.base, np.memmap)
+    assert np.allclose(waveform.values[:3], signal[500:503].astype("<f4"))
+    windows = generate_windows(waveforms, window_size=100, stride=50)
+    assert windows[0].start == pd.Timestamp("2024-01-01T00:00:00.5")
+    assert windows[0].sampling_rate_hz == 1000.0
+    assert np.shares_memory(windows[0].values, waveform.values)
+    assert np.allclose(windows[0].extras["rpm"], 1800.0)
+
+
+def test_data_ingestor_keeps_waveforms(tmp_path):
+    _write_capture(tmp_path, "accel", np.random.default_rng(0).normal(size=1000), "accel_x")
+    result = DataIngestor().ingest({"adapter": "raw_waveform", "params": {"path": tmp_path}})
+    assert result.waveforms is not None and result.signals is result.waveforms
+    assert result.quality.missing_values == 0
+    frame = RawWaveformAdapter().load({"path": tmp_path})
+    assert len(frame) == 1000 and frame["timestamp"].is_monotonic_increasing
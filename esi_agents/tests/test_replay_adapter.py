@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from esi_agents.adapters import EventBatch, ReplayAdapter
+
+
+def _write_csv(tmp_path, n=200):
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=n, freq="10ms"),
+            "asset_id": "gen",
+            "channel": "current",
+            "value": np.sin(np.arange(n) / 5.0),
+        }
+    )
+    path = tmp_path / "gen.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_replay_paces_by_timestamps_and_clones_assets(tmp_path):
+    path = _write_csv(tmp_path)
+    adapter = ReplayAdapter()
+    params = {
+        "source": {"adapter": "csv", "params": {"path": str(path)}},
+        "speed": 10.0,
+        "clones": 3,
+        "clone_jitter_s": 0.05,
+        "batch_size": 64,
+    }
+
+    async def consume():
+        return [batch async for batch in adapter.subscribe_batches(params)]
+
+    out = EventBatch.concat(asyncio.run(consume()))
+    assert len(out) == 600
+    assert set(out.asset_id) == {"gen", "gen~1", "gen~2"}
+    assert np.all(np.diff(out.timestamp.astype(np.int64)) >= 0)
+    summary = adapter.stats.summary()
+    assert summary["samples"] == 600
+    # ~2 s of data at 10x should take roughly 0.2 s
+    assert 0.1 < summary["elapsed_s"] < 1.5
+
+
+def test_replay_latency_probe_records_outputs(tmp_path):
+    path = _write_csv(tmp_path)
+    adapter = ReplayAdapter()
+    params = {"source": {"adapter": "csv", "params": {"path": str(path)}}, "speed": "max", "batch_size": 50}
+    seen = []
+    emit = adapter.latency_probe(seen.append)
+
+    async def consume():
+        async for batch in adapter.subscribe_batches(params):
+            emit({"timestamp": pd.Timestamp(batch.timestamp[-1]).isoformat()})
+
+    asyncio.run(consume())
+    summary = adapter.stats.summary()
+    assert len(seen) == summary["outputs"] == 4
+    assert summary["latency_p50_ms"] is not None
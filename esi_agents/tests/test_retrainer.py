@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+
+from esi_agents.adapters import EventBatch
+from esi_agents.agents import FeatureEngineer, StreamScorer
+from esi_agents.agents.retrainer import DecayingReservoir, Retrainer
+
+WINDOW = {"size": 20, "stride": 10}
+
+
+def test_time_decayed_reservoir_is_bounded_and_favours_recent_rows():
+    now = [0.0]
+    reservoir = DecayingReservoir(capacity=100, decay_s=1.0, seed=0, clock=lambda: now[0])
+    for step in range(50):
+        now[0] = float(step)
+        reservoir.add(np.full((20, 2), step))
+    assert len(reservoir) == 100 and reservoir.seen == 1000
+    assert np.median(reservoir.sample()[:, 0]) > 45
+
+
+def test_retrained_model_is_swapped_in_between_batches(synthetic_signal, stream_selection):
+    config, selection = stream_selection(window=WINDOW)
+    features = FeatureEngineer().transform(synthetic_signal, config).matrix
+    scorer = StreamScorer()
+    reference = features.select_dtypes(include=[np.number])
+    out: list[dict] = []
+
+    async def run():
+        retrainer = Retrainer(scorer, config, reference, min_samples=1, executor="thread")
+
+        async def batches():
+            for start in range(0, len(synthetic_signal), 10):
+                if start == 50:
+                    await retrainer.retrain()
+                yield EventBatch.from_frame(synthetic_signal.iloc[start : start + 10])
+
+        async with retrainer:
+            await scorer.run_batches(batches(), config, selection, out.append)
+        return retrainer
+
+    retrainer = asyncio.run(run())
+    versions = [m["model_version"] for m in out]
+    assert retrainer.retrains == 1 and len(out) == len(features)
+    assert versions[0] != versions[-1] == scorer.model_version
+    assert versions == sorted(versions, key=lambda v: v != versions[0])  # one switch, no interleaving
+
+
+def test_failed_retrain_is_recorded_and_the_loop_keeps_checking(synthetic_signal, stream_selection):
+    config, _ = stream_selection(window=WINDOW)
+    reference = FeatureEngineer().transform(synthetic_signal, config).matrix.select_dtypes(include=[np.number])
+    config = {**config, "models": [{"name": "no_such_model"}]}
+
+    async def run():
+        retrainer = Retrainer(
+            StreamScorer(), config, reference, interval_s=0, check_interval_s=0.01, min_samples=1, executor="thread"
+        )
+        retrainer.reservoir.add(reference.to_numpy(dtype=float))
+        async with retrainer:
+            while retrainer.failures < 2:
+                await asyncio.sleep(0.01)
+        return retrainer
+
+    retrainer = asyncio.run(asyncio.wait_for(run(), timeout=30))
+    assert retrainer.retrains == 0
+    assert isinstance(retrainer.last_error, ValueError)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from esi_agents.adapters import SchemaRegistry, SignalMetadata
+from esi_agents.features import generate_windows
+
+
+def test_registry_upserts_and_migrates_json(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps([{"asset_id": "a", "channel": "accel", "unit": "g"}]))
+    registry = SchemaRegistry(path, cache_size=1)
+    assert registry.get("a", "accel").unit == "g"
+    registry.persist([SignalMetadata("a", "accel", sampling_rate_hz=100.0)])
+    registry.persist([SignalMetadata("b", "accel", channel_type="vibration")])
+    meta = registry.get("a", "accel")
+    assert (meta.unit, meta.sampling_rate_hz) == ("g", 100.0)
+    assert [m.asset_id for m in SchemaRegistry(path).load()] == ["a", "b"]
+    assert (tmp_path / "schema.json.bak").exists()
+
+
+def test_windows_reuse_known_rate_until_drift(tmp_path, synthetic_signal):
+    registry = SchemaRegistry(tmp_path / "schema.db")
+    registry.persist([SignalMetadata("asset_1", "accel", sampling_rate_hz=100.2)])
+    windows = generate_windows(synthetic_signal, window_size=50, stride=25, registry=registry)
+    assert windows[0].sampling_rate_hz == 100.2
+    assert registry.reinferred == 0
+
+    slower = synthetic_signal.assign(
+        timestamp=pd.date_range("2024-01-01", periods=len(synthetic_signal), freq="20ms")
+    )
+    windows = generate_windows(slower, window_size=50, stride=25, registry=registry)
+    assert np.isclose(windows[0].sampling_rate_hz, 50.0)
+    assert registry.reinferred == 1
+    assert np.isclose(registry.get("asset_1", "accel").sampling_rate_hz, 50.0)
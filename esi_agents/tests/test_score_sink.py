@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from esi_agents.agents import ScoreSink, read_scores  # noqa: E402
+
+
+def _scores(asset_id, start, n):
+    starts = pd.date_range(start, periods=n, freq="6h")
+    return pd.DataFrame(
+        {
+            "asset_id": asset_id,
+            "channel": "accel",
+            "window_start": starts,
+            "window_end": starts + pd.Timedelta("1min"),
+            "time_rms": np.linspace(0, 1, n),
+            "anomaly_score": np.linspace(0, 1, n),
+            "alert": np.linspace(0, 1, n) > 0.9,
+        }
+    )
+
+
+def test_sink_partitions_by_asset_and_date(tmp_path):
+    path = tmp_path / "scores.parquet"
+    frames = [_scores("b", "2024-01-01", 8), _scores("a", "2024-01-01", 8)]
+    with ScoreSink(path, key_columns_only=True, row_group_rows=2) as sink:
+        for frame in frames:
+            sink.write(frame)
+    parts = sorted(p.relative_to(path).parent.as_posix() for p in path.rglob("*.parquet"))
+    assert parts == [f"asset_id={a}/date=2024-01-0{d}" for a in "ab" for d in (1, 2)]
+    meta = pq.ParquetFile(next(path.rglob("*.parquet"))).metadata
+    assert meta.num_row_groups == 2
+    assert meta.row_group(0).column(0).compression == "ZSTD"
+
+    scores = read_scores(path, ["anomaly_score"])
+    assert scores.columns.tolist() == ["anomaly_score"]
+    full = read_scores(path)
+    assert "time_rms" not in full.columns
+    assert full["asset_id"].tolist() == ["a"] * 8 + ["b"] * 8
+    assert full.groupby("asset_id")["window_start"].apply(lambda s: s.is_monotonic_increasing).all()
+
+
+def test_read_scores_keeps_zero_padded_partition_values(tmp_path):
+    path = tmp_path / "scores.parquet"
+    with ScoreSink(path) as sink:
+        sink.write(pd.concat([_scores("007", "2024-01-01", 2), _scores("7", "2024-01-01", 2)]))
+    scores = read_scores(path)
+    assert scores["asset_id"].tolist() == ["007", "007", "7", "7"]
+    assert scores["date"].tolist() == ["2024-01-01"] * 4
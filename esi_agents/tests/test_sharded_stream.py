@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+
+from esi_agents.adapters import EventBatch
+from esi_agents.agents import StreamScorer
+from esi_agents.workflows.sharded_stream import HashRing, ShardedScorer
+
+FEATURES = {"time": True, "freq": True, "envelope": False, "orders": False}
+
+
+def test_hash_ring_moves_few_keys_when_growing():
+    keys = [(f"asset_{i}", channel) for i in range(200) for channel in ("x", "y")]
+    three, four = HashRing(3), HashRing(4)
+    moved = sum(three.shard(key) != four.shard(key) for key in keys)
+    assert {three.shard(key) for key in keys} == {0, 1, 2}
+    assert moved < len(keys) * 0.4
+    assert all(four.shard(key) == 3 for key in keys if three.shard(key) != four.shard(key))
+
+
+def test_sharded_scorer_matches_single_process(synthetic_signal, stream_selection):
+    frame = synthetic_signal.copy()
+    frame = frame.loc[frame.index.repeat(3)].reset_index(drop=True)
+    frame["asset_id"] = [f"asset_{i % 3}" for i in range(len(frame))]
+    config, selection = stream_selection(features=FEATURES)
+
+    async def batches():
+        for start in range(0, len(frame), 45):
+            yield EventBatch.from_frame(frame.iloc[start : start + 45])
+
+    expected: list[dict] = []
+    asyncio.run(StreamScorer().run_batches(batches(), config, selection, expected.append))
+    sharded: list[dict] = []
+    with ShardedScorer(2, selection, config, ring_bytes=2**16) as scorer:
+        asyncio.run(scorer.run_batches(batches(), sharded.append))
+
+    def order(message):
+        return message["timestamp"], message["asset_id"], message["channel"]
+
+    assert sharded == sorted(expected, key=order)
+
+
+def test_sharded_scorer_keeps_event_loop_running_when_rings_fill(synthetic_signal, stream_selection):
+    config, selection = stream_selection(features=FEATURES)
+    ticks = [0]
+    during: list[int] = []
+
+    async def batches():
+        start = ticks[0]
+        for _ in range(3):
+            for offset in range(0, len(synthetic_signal), 45):
+                yield EventBatch.from_frame(synthetic_signal.iloc[offset : offset + 45])
+        during.append(ticks[0] - start)
+
+    async def main(scorer):
+        async def ticker():
+            while True:
+                ticks[0] += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await scorer.run_batches(batches())
+        task.cancel()
+
+    with ShardedScorer(1, selection, config, ring_bytes=2**12) as scorer:
+        asyncio.run(main(scorer))
+    assert during[0] > 0
+
+
+def test_sharded_scorer_emits_windows_drained_at_end_of_stream(synthetic_signal, stream_selection):
+    config, selection = stream_selection(features=FEATURES)
+    options = {"event_time": {"lateness_s": 10.0}}  # holds every sample until the stream ends
+
+    async def batches():
+        for start in range(0, len(synthetic_signal), 30):
+            yield EventBatch.from_frame(synthetic_signal.iloc[start : start + 30])
+
+    expected: list[dict] = []
+    asyncio.run(StreamScorer(**options).run_batches(batches(), config, selection, expected.append))
+    sharded: list[dict] = []
+    with ShardedScorer(1, selection, config, scorer_options=options) as scorer:
+        asyncio.run(scorer.run_batches(batches(), sharded.append))
+    assert expected
+    assert sharded == expected
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from esi_agents.adapters import InfluxDBAdapter, TimescaleAdapter, influxdb, timescale
+from esi_agents.adapters.slicing import plan_slices
+
+DATA = pd.DataFrame(
+    {
+        "timestamp": pd.date_range("2024-01-01", periods=24 * 60, freq="min"),
+        "asset_id": "a",
+        "channel": "c",
+        "value": range(24 * 60),
+    }
+)
+
+
+class FakeDatabase:
+    """In-process stand-in for a time-series database."""
+
+    def __init__(self, fail_first: int = 0):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self.fail_first = fail_first
+        self.clients: list[object] = []
+
+    def connect(self):
+        client = object()
+        self.clients.append(client)
+        return client
+
+    def query(self, params):
+        assert params["client"] in self.clients
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.01 if call % 2 else 0.03)
+            if call <= self.fail_first:
+                raise ConnectionError("transient")
+            mask = (DATA["timestamp"] >= params["start"]) & (DATA["timestamp"] < params["end"])
+            return DATA[mask].iloc[::-1]
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_plan_slices_covers_range():
+    slices = plan_slices("2024-01-01", "2024-01-01 10:00", "4h")
+    assert [(str(s), str(e)) for s, e in slices][-1] == ("2024-01-01 08:00:00", "2024-01-01 10:00:00")
+    assert len(slices) == 3
+
+
+@pytest.mark.parametrize("module,adapter_cls", [(influxdb, InfluxDBAdapter), (timescale, TimescaleAdapter)])
+def test_sliced_load_is_ordered_bounded_and_retried(monkeypatch, module, adapter_cls):
+    monkeypatch.setattr(module, "InfluxDBClient" if module is influxdb else "psycopg2", object())
+    db = FakeDatabase(fail_first=1)
+    params = {
+        "query_fn": db.query,
+        "client_factory": db.connect,
+        "start": "2024-01-01",
+        "end": "2024-01-02",
+        "slice_duration": "2h",
+        "max_parallel": 3,
+        "retry_backoff_s": 0.0,
+    }
+    chunks = list(adapter_cls().iter_frames(params))
+    assert len(chunks) == 12
+    frame = pd.concat(chunks, ignore_index=True)
+    assert frame["timestamp"].is_monotonic_increasing
+    assert len(frame) == len(DATA)
+    assert db.peak <= 3
+    assert len(db.clients) <= 3
+    assert db.calls == 13
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+
+import pandas as pd
+
+from esi_agents.adapters import SQLiteAdapter
+
+
+def _write(database, frame):
+    with sqlite3.connect(database) as conn:
+        frame.to_sql("samples", conn, if_exists="append", index=False)
+    conn.close()
+
+
+def _frame(start, periods, asset_id="a"):
+    timestamps = pd.date_range(start, periods=periods, freq="s")
+    return pd.DataFrame(
+        {
+            "timestamp": [ts.isoformat() for ts in timestamps],
+            "asset_id": asset_id,
+            "channel": "c",
+            "value": [float(i) for i in range(periods)],
+        }
+    )
+
+
+def test_sqlite_structured_chunks_and_indexes(tmp_path):
+    database = tmp_path / "historian.db"
+    _write(database, pd.concat([_frame("2024-01-01", 10), _frame("2024-01-01", 10, "b")]))
+    adapter = SQLiteAdapter()
+    params = {
+        "database": str(database),
+        "table": "samples",
+        "asset_id": "a",
+        "start": "2024-01-01 00:00:02",
+        "end": "2024-01-01 00:00:08",
+        "chunk_size": 3,
+    }
+    chunks = list(adapter.iter_frames(params))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    frame = adapter.load(params)
+    assert frame["value"].tolist() == [2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+    assert frame["timestamp"].is_monotonic_increasing
+    with sqlite3.connect(database) as conn:
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(samples)")}
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    assert {"ix_samples_timestamp", "ix_samples_covering"} <= indexes
+    assert mode == "wal"
+    adapter.close()
+
+
+def test_sqlite_subscribe_resumes_from_high_water_mark(tmp_path):
+    database = tmp_path / "historian.db"
+    state = tmp_path / "state.json"
+    _write(database, _frame("2024-01-01", 5))
+    params = {
+        "database": str(database),
+        "table": "samples",
+        "state_path": str(state),
+        "follow": False,
+        "chunk_size": 2,
+    }
+
+    async def consume():
+        return [item async for item in SQLiteAdapter().subscribe(params)]
+
+    assert len(asyncio.run(consume())) == 5
+    _write(database, _frame("2024-01-01 00:00:05", 3))
+    records = asyncio.run(consume())
+    assert [r["value"] for r in records] == [0.0, 1.0, 2.0]
+    assert records[0]["timestamp"] == pd.Timestamp("2024-01-01 00:00:05")
+
+
+def test_sqlite_resume_params_replay_from_checkpoint_time(tmp_path):
+    database = tmp_path / "historian.db"
+    state = tmp_path / "state.json"
+    _write(database, _frame("2024-01-01", 6))
+    params = {"database": str(database), "table": "samples", "state_path": str(state), "follow": False}
+    adapter = SQLiteAdapter()
+
+    async def consume(p):
+        return [item async for item in adapter.subscribe(p)]
+
+    assert len(asyncio.run(consume(params))) == 6
+    resumed = adapter.resume_params(params, pd.Timestamp("2024-01-01 00:00:04"))
+    records = asyncio.run(consume(resumed))
+    assert [r["value"] for r in records] == [4.0, 5.0]
+    assert adapter.resume_params({"query": "SELECT 1"}, pd.Timestamp("2024-01-01")) is None
+    adapter.close()
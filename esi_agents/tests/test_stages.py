@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import threading
+
+from esi_agents.agents.stages import Stage, StageGraph
+
+
+def _graph(tmp_path, calls, setting, resume):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(name):
+        def fn(source):
+            calls.append(name)
+            barrier.wait()  # both branches must be running at once
+            return source + name
+
+        return fn
+
+    stages = [
+        Stage("source", lambda: calls.append("source") or "x", config=setting),
+        Stage("left", branch("l"), inputs=["source"]),
+        Stage("right", branch("r"), inputs=["source"]),
+        Stage("join", lambda left, right: calls.append("join") or left + right, inputs=["left", "right"]),
+    ]
+    return StageGraph(stages, tmp_path, resume=resume)
+
+
+def test_stage_graph_runs_branches_concurrently_and_resumes(tmp_path):
+    calls: list[str] = []
+    assert _graph(tmp_path, calls, 1, resume=False).run(["join"]) == {"join": "xlxr"}
+    assert sorted(calls) == ["join", "l", "r", "source"]
+
+    calls.clear()
+    graph = _graph(tmp_path, calls, 1, resume=True)
+    assert graph.run(["join"]) == {"join": "xlxr"}
+    assert calls == []
+    assert {t.status for t in graph.summary()} == {"cached"}
+
+    calls.clear()
+    graph = _graph(tmp_path, calls, 2, resume=True)
+    graph.run()
+    # source re-ran but produced the same output, so nothing downstream re-runs
+    assert calls == ["source"]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import numpy as np
+
+from esi_agents.adapters import EventBatch
+from esi_agents.agents import SelectionResult, StreamScorer, TrainedModel
+
+CONFIG = {
+    "window": {"size": 20, "stride": 20},
+    "features": {"time": True, "freq": False, "envelope": False, "orders": False},
+    "threshold": 0.5,
+}
+
+
+class GatedModel:
+    """Constant scores once ``gate`` opens; counts the calls waiting on it."""
+
+    def __init__(self, open_gate: bool = False):
+        self.gate = threading.Event()
+        if open_gate:
+            self.gate.set()
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def score_samples(self, X):
+        with self._lock:
+            self.active += 1
+        self.gate.wait(timeout=5)
+        with self._lock:
+            self.active -= 1
+        return np.full(len(X), 0.7)
+
+    def __getstate__(self):
+        return {}  # the model version hashes the pickled model
+
+
+def _run(synthetic_signal, model, offload):
+    selection = SelectionResult(TrainedModel("gated", model, np.empty(0)), {})
+    messages: list[dict] = []
+    backlog: list[int] = []
+
+    async def batches():
+        for k, start in enumerate(range(0, len(synthetic_signal), 20)):
+            # Every earlier batch made one window; those not yet emitted are in flight.
+            backlog.append(k - len(messages))
+            if offload is not None and k == 3:
+                for _ in range(5000):  # ingestion continues while both workers are busy
+                    if model.active == 2:
+                        break
+                    await asyncio.sleep(0.001)
+                assert model.active == 2
+                model.gate.set()
+            yield EventBatch.from_frame(synthetic_signal.iloc[start : start + 20])
+
+    asyncio.run(StreamScorer(offload=offload).run_batches(batches(), CONFIG, selection, messages.append))
+    return messages, backlog
+
+
+def test_offloaded_scoring_keeps_ingesting_within_bound_and_order(synthetic_signal):
+    inline, _ = _run(synthetic_signal, GatedModel(open_gate=True), None)
+    offload = {"executor": "thread", "max_workers": 2, "max_in_flight": 3}
+    offloaded, backlog = _run(synthetic_signal, GatedModel(), offload)
+    assert offloaded == inline
+    assert [m["timestamp"] for m in offloaded] == sorted(m["timestamp"] for m in offloaded)
+    assert max(backlog) == 3
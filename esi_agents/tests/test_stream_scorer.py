@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+
+from esi_agents.adapters import EventBatch, batch_records
+from esi_agents.agents import FeatureEngineer, StreamScorer
+
+
+def test_event_batch_groups_preserve_order(synthetic_signal):
+    frame = synthetic_signal.copy()
+    frame.loc[frame.index % 2 == 1, "channel"] = "other"
+    batch = EventBatch.from_frame(frame)
+    groups = dict(batch.groups())
+    assert set(groups) == {("asset_1", "accel"), ("asset_1", "other")}
+    assert np.array_equal(groups[("asset_1", "other")].value, frame["value"].to_numpy()[1::2])
+
+
+def test_record_shim_batches_records(synthetic_signal):
+    records = synthetic_signal.to_dict(orient="records")
+
+    async def source():
+        for record in records:
+            yield record
+
+    async def consume():
+        return [batch async for batch in batch_records(source(), batch_size=32)]
+
+    batches = asyncio.run(consume())
+    assert sum(len(batch) for batch in batches) == len(records)
+    assert max(len(batch) for batch in batches) <= 32
+
+
+def test_stream_scorer_matches_batch_windows(synthetic_signal, stream_selection):
+    config, selection = stream_selection(
+        features={"time": True, "freq": True, "envelope": True, "orders": True},
+        models=[{"name": "isolation_forest"}],
+        threshold=0.9,
+    )
+    batch_features = FeatureEngineer().transform(synthetic_signal, config)
+    expected = selection.best_model.model.score_samples(
+        batch_features.matrix.select_dtypes(include=[np.number]).to_numpy(dtype=float)
+    )
+    messages: list[dict] = []
+
+    async def batches():
+        for start in range(0, len(synthetic_signal), 7):
+            yield EventBatch.from_frame(synthetic_signal.iloc[start : start + 7])
+
+    asyncio.run(StreamScorer().run_batches(batches(), config, selection, messages.append))
+    assert len(messages) == len(batch_features.windows)
+    assert np.allclose([m["anomaly_score"] for m in messages], expected, atol=1e-6)
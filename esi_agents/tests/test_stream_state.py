@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+
+from esi_agents.adapters import CSVAdapter, EventBatch
+from esi_agents.agents import StreamScorer
+from esi_agents.agents.stream_state import load_state, save_state
+
+
+def test_restored_scorer_resumes_without_gap_or_duplicates(synthetic_signal, stream_selection, tmp_path):
+    config, selection = stream_selection(window={"size": 50, "stride": 20})
+    path = tmp_path / "signal.csv"
+    synthetic_signal.to_csv(path, index=False)
+    params = {"path": str(path), "timestamp_column": "timestamp", "batch_size": 16}
+
+    def score(scorer, batches):
+        out: list[dict] = []
+        asyncio.run(scorer.run_batches(batches, config, selection, out.append))
+        return [(m["timestamp"], round(m["anomaly_score"], 9)) for m in out]
+
+    expected = score(StreamScorer(), CSVAdapter().subscribe_batches(params))
+
+    async def head():
+        yield EventBatch.from_frame(synthetic_signal.iloc[:63])
+
+    first = StreamScorer()
+    before = score(first, head())
+    save_state(first.snapshot(), tmp_path / "state.ckpt")
+
+    state = load_state(tmp_path / "state.ckpt")
+    assert state.model_version == first.model_version
+    restored = StreamScorer()
+    restored.restore(state)
+    adapter = CSVAdapter()
+    after = score(restored, adapter.subscribe_batches(adapter.resume_params(params, state.resume_point())))
+    assert before and after
+    assert before + after == expected
+
+
+def test_restore_resets_alert_state_saved_by_another_model(synthetic_signal, stream_selection):
+    config, selection = stream_selection()
+    _, other = stream_selection(models=[{"name": "isolation_forest"}])
+
+    async def batches():
+        yield EventBatch.from_frame(synthetic_signal)
+
+    first = StreamScorer(alerting={"emit": "all"})
+    asyncio.run(first.run_batches(batches(), config, selection, lambda message: None))
+    state = first.snapshot()
+    assert state.extras["alerts"]
+
+    for model, kept in ((selection, True), (other, False)):
+        restored = StreamScorer(alerting={"emit": "all"})
+        restored.restore(state)
+        asyncio.run(restored.run_batches(batches(), config, model, lambda message: None))  # all replayed
+        assert bool(restored.alert_keys) is kept
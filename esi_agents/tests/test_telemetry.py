@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import asyncio
+import urllib.request
+
+from esi_agents.adapters import EventBatch
+from esi_agents.agents import MetricsExporter, StreamMetrics, StreamScorer
+
+
+def test_stream_metrics_served_over_http_and_dumped(synthetic_signal, stream_selection, tmp_path):
+    config, selection = stream_selection(threshold=0.9)
+    metrics = StreamMetrics()
+    windows: list[dict] = []
+
+    async def batches():
+        for start in range(0, len(synthetic_signal), 40):
+            yield EventBatch.from_frame(synthetic_signal.iloc[start : start + 40])
+
+    asyncio.run(StreamScorer(metrics=metrics).run_batches(batches(), config, selection, windows.append))
+    assert metrics.events.get() == len(synthetic_signal)
+    assert metrics.windows.get() == len(windows)
+    assert metrics.alerts.get() == sum(message["alert"] for message in windows)
+
+    with MetricsExporter(metrics.registry, port=0, path=tmp_path / "stream.prom") as exporter:
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as response:
+            body = response.read().decode()
+    assert f"esi_stream_windows_total {len(windows)}" in body
+    assert 'esi_stream_buffer_fill_ratio{asset_id="asset_1",channel="accel"}' in body
+    assert 'esi_stream_score_seconds_bucket{le="+Inf"}' in body
+    assert "esi_stream_events_total" in (tmp_path / "stream.prom").read_text()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+
+import yaml
+
+from esi_agents.agents import Orchestrator, read_trace
+
+
+def test_orchestrator_writes_nested_spans_and_profiles(tmp_path):
+    config = {
+        "adapter": "csv",
+        "params": {"path": "data/generator.csv"},
+        "window": {"size": 128, "stride": 64},
+        "features": {"time": True, "freq": False, "envelope": False, "orders": False},
+        "models": [{"name": "hbos"}],
+        "tracing": {"chrome": "trace.json", "memory": True, "profile": ["features"]},
+    }
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(config))
+    result = Orchestrator().run(path, None, tmp_path / "run")
+
+    spans = {record.name: record for record in read_trace(result.trace_path)}
+    root = spans["Orchestrator.run"]
+    assert root.parent_id is None
+    assert spans["features"].parent_id == root.span_id
+    assert spans["FeatureEngineer.transform"].parent_id == spans["features"].span_id
+    assert spans["FeatureEngineer.transform"].windows > 0
+    assert spans["DataIngestor.ingest"].rows > 0
+    assert all(record.peak_bytes is not None for record in spans.values())
+    events = json.loads((tmp_path / "run" / "trace.json").read_text())["traceEvents"]
+    assert {"Orchestrator.run", "ModelTrainer.train"} <= {event["name"] for event in events}
+    assert list((tmp_path / "run" / "profiles").glob("features-*.prof"))
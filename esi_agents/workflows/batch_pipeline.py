@@ -6,9 +6,15 @@ from pathlib import Path
 from ..agents import Orchestrator
 
 
-def run_batch(config: str | Path, input_path: str | None, output_dir: str | Path, labels: str | None = None):
+def run_batch(
+    config: str | Path,
+    input_path: str | None,
+    output_dir: str | Path,
+    labels: str | None = None,
+    resume: bool = False,
+):
     orchestrator = Orchestrator()
-    return orchestrator.run(config, input_path, output_dir, labels)
+    return orchestrator.run(config, input_path, output_dir, labels, resume=resume)
 
 
 __all__ = ["run_batch"]
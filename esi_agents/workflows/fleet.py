@@ -0,0 +1,315 @@
+"""Run many batch pipelines on a process pool."""
+from __future__ import annotations
+
+import importlib
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import traceback
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import yaml
+
+_METRIC_COLUMNS = ("roc_auc", "pr_auc", "sic_surrogate", "top_k_precision", "alert_rate")
+
+
+@dataclass
+class FleetJob:
+    """One (config, input, labels, out) batch run of a fleet manifest."""
+
+    name: str
+    config: str
+    out: str
+    input: str | None = None
+    labels: str | None = None
+    memory_mb: float | None = None
+    retries: int = 0
+    resume: bool = False
+
+
+@dataclass
+class FleetResult:
+    name: str
+    status: str
+    attempts: int
+    seconds: float
+    out: str
+    metrics: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+
+def load_manifest(path: str | Path) -> tuple[list[FleetJob], dict[str, Any]]:
+    """Read a YAML or JSON fleet manifest.
+
+    The manifest holds a ``jobs`` list; each job needs ``config`` and
+    ``out`` and may set ``name``, ``input``, ``labels``, ``memory_mb``,
+    ``retries`` and ``resume``. Values under ``defaults`` apply to every
+    job. Remaining top-level keys (``concurrency``, ``shared``) are
+    returned as pool options.
+    """
+
+    raw = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    defaults = raw.get("defaults", {})
+    jobs = []
+    for index, entry in enumerate(raw.get("jobs", [])):
+        spec = {**defaults, **entry}
+        spec.setdefault("name", Path(str(spec.get("out", f"job_{index}"))).name)
+        missing = {"config", "out"} - set(spec)
+        if missing:
+            raise ValueError(f"Fleet job '{spec['name']}' is missing {sorted(missing)}")
+        jobs.append(FleetJob(**spec))
+    names = [job.name for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("Fleet job names must be unique")
+    options = {key: value for key, value in raw.items() if key not in ("defaults", "jobs")}
+    return jobs, options
+
+
+def _configured_models(jobs: Iterable[FleetJob]) -> list[str]:
+    names: set[str] = set()
+    for config in {job.config for job in jobs}:
+        try:
+            models = (yaml.safe_load(Path(config).read_text(encoding="utf-8")) or {}).get("models")
+        except (OSError, yaml.YAMLError):
+            continue
+        models = models or [{"name": "isolation_forest"}, {"name": "lof"}]
+        names.update(str(model["name"]).lower() for model in models)
+    return sorted(names)
+
+
+def _warm_worker(shared: Mapping[str, Any], models: Iterable[str], reports: Any = None) -> None:
+    """Pool initializer: import the pipeline once and open shared registries.
+
+    The detectors the jobs train and the evaluation libraries are imported
+    here, so each worker loads them once. Registries opened here, and the
+    cached FFT tapers and frequency grids, are reused by every job the
+    worker runs.
+    """
+
+    global _REPORTS
+    from ..adapters import SchemaRegistry
+    from ..models import MODEL_REGISTRY, model_class
+
+    _REPORTS = reports
+
+    for name in models:
+        if name in MODEL_REGISTRY:
+            model_class(name)
+    for module in ("esi_agents.agents.orchestrator", "sklearn.metrics", "sklearn.linear_model"):
+        importlib.import_module(module)
+    for path in shared.get("schema_registries", []):
+        SchemaRegistry.open(path)
+
+
+def _rss_bytes() -> int | None:
+    """Resident set size of this process (Linux only)."""
+
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class MemoryGuard:
+    """Kill this process once its RSS grows more than ``limit_mb`` past entry.
+
+    A watchdog thread samples the resident set size every ``interval_s``.
+    Pipeline stages run on :class:`StageGraph` threads, which cannot be
+    interrupted from outside, so the only way to stop an over-cap job is
+    to end its process. ``on_exceed`` is called with the growth in bytes
+    just before the process sends itself ``SIGKILL``. The cap is relative
+    to the RSS on entry, so the libraries a warm worker has already
+    imported do not count against it. It is a no-op where the RSS cannot
+    be read.
+    """
+
+    def __init__(
+        self, limit_mb: float, interval_s: float = 0.1, on_exceed: Callable[[int], None] | None = None
+    ):
+        self.limit_bytes = int(limit_mb * 2**20)
+        self.interval_s = interval_s
+        self.on_exceed = on_exceed
+        self.baseline_bytes = 0
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> MemoryGuard:
+        baseline = _rss_bytes()
+        if baseline is None:
+            return self
+        self.baseline_bytes = self.peak_bytes = baseline
+        self._thread = threading.Thread(target=self._watch, name="fleet-memory-guard", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            rss = _rss_bytes() or 0
+            self.peak_bytes = max(self.peak_bytes, rss)
+            growth = rss - self.baseline_bytes
+            if growth > self.limit_bytes:
+                if self.on_exceed is not None:
+                    self.on_exceed(growth)
+                os.kill(os.getpid(), signal.SIGKILL)
+
+
+_REPORTS: Any = None  # SimpleQueue a pool worker reports memory-cap kills on
+
+
+def _run_job(job: FleetJob) -> dict[str, Any]:
+    """Run one job in a pool worker, under its memory cap."""
+
+    from ..agents import Orchestrator
+
+    if job.memory_mb:
+        limit = job.memory_mb
+
+        def report(growth: int) -> None:
+            if _REPORTS is not None:
+                message = f"job grew worker RSS by {growth / 2**20:.0f} MB, over its {limit:.0f} MB cap"
+                _REPORTS.put((job.name, message))
+
+        with MemoryGuard(limit, on_exceed=report):
+            result = Orchestrator().run(job.config, job.input, job.out, job.labels, resume=job.resume)
+    else:
+        result = Orchestrator().run(job.config, job.input, job.out, job.labels, resume=job.resume)
+    return {
+        "metrics": {key: result.metrics.get(key) for key in _METRIC_COLUMNS},
+        "timings": {timing.name: timing.seconds for timing in result.timings},
+    }
+
+
+def run_fleet(
+    jobs: Iterable[FleetJob],
+    concurrency: int = 4,
+    shared: Mapping[str, Any] | None = None,
+    summary_dir: str | Path | None = None,
+    on_result: Callable[[FleetResult], None] | None = None,
+) -> pd.DataFrame:
+    """Run ``jobs`` on at most ``concurrency`` worker processes.
+
+    Workers are long-lived, so interpreter start-up, library imports and
+    the resources named in ``shared`` are paid once per worker rather than
+    once per job. A failed job is retried up to its ``retries`` times; a
+    worker killed mid-job (for example by the OOM killer) fails the jobs
+    in flight and the pool is restarted. A job that grows its worker's RSS
+    by more than its ``memory_mb`` fails with a ``MemoryError`` and the
+    other jobs killed with that worker are requeued without using up a
+    retry. Returns one summary row per job, also written to
+    ``summary.csv``/``summary.json`` under ``summary_dir``.
+    """
+
+    jobs = list(jobs)
+    shared = dict(shared or {})
+    attempts = {job.name: 0 for job in jobs}
+    started: dict[str, float] = {}
+    results: dict[str, FleetResult] = {}
+    queue = list(jobs)
+    models = _configured_models(jobs)
+
+    def finish(job: FleetJob, outcome: dict[str, Any] | None, error: str | None) -> None:
+        if error is not None and attempts[job.name] <= job.retries:
+            queue.append(job)
+            return
+        result = FleetResult(
+            name=job.name,
+            status="ok" if error is None else "failed",
+            attempts=attempts[job.name],
+            seconds=time.perf_counter() - started[job.name],
+            out=str(job.out),
+            error=error,
+            **(outcome or {}),
+        )
+        results[job.name] = result
+        if on_result is not None:
+            on_result(result)
+
+    reports = multiprocessing.SimpleQueue()
+
+    def died(lost: list[FleetJob]) -> None:
+        capped: dict[str, str] = {}
+        while not reports.empty():
+            name, message = reports.get()
+            capped[name] = message
+        for job in lost:
+            if job.name in capped:
+                finish(job, None, f"MemoryError: {capped[job.name]}")
+            elif capped:
+                # Killed with a neighbour that broke its memory cap: not its failure.
+                attempts[job.name] -= 1
+                queue.append(job)
+            else:
+                finish(job, None, "worker process died")
+
+    while queue:
+        with ProcessPoolExecutor(
+            max_workers=max(1, concurrency), initializer=_warm_worker, initargs=(shared, models, reports)
+        ) as pool:
+            running: dict[Future[dict[str, Any]], FleetJob] = {}
+            lost: list[FleetJob] = []
+            while (queue or running) and not lost:
+                while queue and len(running) < max(1, concurrency):
+                    job = queue.pop(0)
+                    attempts[job.name] += 1
+                    started.setdefault(job.name, time.perf_counter())
+                    running[pool.submit(_run_job, job)] = job
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        finish(job, future.result(), None)
+                    except BrokenProcessPool:
+                        lost.append(job)
+                    except Exception as exc:
+                        finish(job, None, "".join(traceback.format_exception_only(exc)).strip())
+            if lost:
+                # Every job still in flight went down with the pool.
+                died(lost + list(running.values()))
+
+    summary = summarise([results[job.name] for job in jobs])
+    if summary_dir is not None:
+        directory = Path(summary_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        summary.to_csv(directory / "summary.csv", index=False)
+        (directory / "summary.json").write_text(
+            json.dumps([asdict(results[job.name]) for job in jobs], indent=2, default=str), encoding="utf-8"
+        )
+    return summary
+
+
+def summarise(results: Iterable[FleetResult]) -> pd.DataFrame:
+    """One row per job: status, attempts, wall time, metrics and stage seconds."""
+
+    rows = []
+    for result in results:
+        row: dict[str, Any] = {
+            "job": result.name,
+            "status": result.status,
+            "attempts": result.attempts,
+            "seconds": round(result.seconds, 3),
+        }
+        row.update({key: result.metrics.get(key) for key in _METRIC_COLUMNS})
+        row.update({f"{name}_s": round(seconds, 3) for name, seconds in result.timings.items()})
+        row["error"] = result.error
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+__all__ = ["FleetJob", "FleetResult", "MemoryGuard", "load_manifest", "run_fleet", "summarise"]
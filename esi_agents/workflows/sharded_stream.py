@@ -0,0 +1,343 @@
+"""Stream scoring sharded by key across worker processes."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import multiprocessing
+import os
+import pickle
+import struct
+import traceback
+from bisect import bisect
+from collections.abc import AsyncIterator, Callable, Sequence
+from typing import Any
+
+import numpy as np
+
+from ..adapters.base import EventBatch
+from .shm_ring import ShmRing
+
+_DATA, _TICK, _END, _STOP = 1, 2, 3, 4
+_RECORD = struct.Struct("<BBHHIq")  # kind, has_rpm, asset/channel byte lengths, rows, seq
+_RING_BYTES = 8 * 2**20
+_POLL_S = 0.001  # event-loop yield while a ring is full or a worker is busy
+
+
+def _hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+class HashRing:
+    """Consistent hash of ``(asset_id, channel)`` keys onto ``shards``.
+
+    Each shard owns ``vnodes`` points on the ring, so keys spread evenly
+    and growing from ``n`` to ``n + 1`` shards moves about ``1 / (n + 1)``
+    of them.
+    """
+
+    def __init__(self, shards: int, vnodes: int = 64):
+        if shards < 1:
+            raise ValueError("HashRing needs at least one shard")
+        points = sorted((_hash(f"shard-{shard}#{v}"), shard) for shard in range(shards) for v in range(vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+        self._cache: dict[tuple[str, str], int] = {}
+
+    def shard(self, key: tuple[str, str]) -> int:
+        shard = self._cache.get(key)
+        if shard is None:
+            index = bisect(self._points, _hash(f"{key[0]}\x1f{key[1]}")) % len(self._points)
+            shard = self._cache[key] = self._owners[index]
+        return shard
+
+
+def _pad(n: int) -> bytes:
+    return b"\0" * (-n % 8)
+
+
+def _encode(seq: int, key: tuple[str, str], part: EventBatch) -> list[bytes | memoryview]:
+    asset, channel = key[0].encode(), key[1].encode()
+    names = asset + channel
+    parts: list[bytes | memoryview] = [
+        _RECORD.pack(_DATA, part.rpm is not None, len(asset), len(channel), len(part), seq),
+        names + _pad(_RECORD.size + len(names)),
+        memoryview(np.ascontiguousarray(part.timestamp).view(np.int64)).cast("B"),
+        memoryview(np.ascontiguousarray(part.value, dtype=float)).cast("B"),
+    ]
+    if part.rpm is not None:
+        parts.append(memoryview(np.ascontiguousarray(part.rpm, dtype=float)).cast("B"))
+    return parts
+
+
+def _decode(record: bytes) -> tuple[int, int, EventBatch | None]:
+    kind, has_rpm, asset_len, channel_len, rows, seq = _RECORD.unpack_from(record)
+    if kind != _DATA:
+        return kind, seq, None
+    offset = _RECORD.size
+    asset = record[offset : offset + asset_len].decode()
+    channel = record[offset + asset_len : offset + asset_len + channel_len].decode()
+    offset += asset_len + channel_len
+    offset += -offset % 8
+    columns = np.frombuffer(record, dtype=np.int64, count=rows * (3 if has_rpm else 2), offset=offset)
+    return kind, seq, EventBatch(
+        asset_id=np.full(rows, asset, dtype=object),
+        channel=np.full(rows, channel, dtype=object),
+        timestamp=columns[:rows].view("datetime64[ns]"),
+        value=columns[rows : 2 * rows].view(np.float64),
+        rpm=columns[2 * rows :].view(np.float64) if has_rpm else None,
+    )
+
+
+def _control(kind: int, seq: int = 0) -> list[bytes]:
+    return [_RECORD.pack(kind, 0, 0, 0, 0, seq)]
+
+
+def _shard_worker(
+    inbox_handle: tuple[Any, ...],
+    outbox_handle: tuple[Any, ...],
+    selection_bytes: bytes,
+    config: dict[str, Any],
+    scorer_options: dict[str, Any],
+) -> None:
+    """Worker process: score each stream session routed to this shard."""
+
+    from ..agents import StreamScorer
+
+    inbox, outbox = ShmRing.attach(inbox_handle), ShmRing.attach(outbox_handle)
+    parent = os.getppid()
+    try:
+        selection = pickle.loads(selection_bytes)
+        outbox.put([pickle.dumps(("ready", 0, []))])
+
+        def receive() -> bytes | None:
+            while True:
+                record = inbox.get(timeout=1.0)
+                if record is not None:
+                    return record
+                if os.getppid() != parent:  # dispatcher went away
+                    return None
+
+        async def session(first: bytes) -> None:
+            emitted: list[dict[str, Any]] = []
+
+            async def batches() -> AsyncIterator[EventBatch]:
+                record: bytes | None = first
+                parts: list[EventBatch] = []
+                while record is not None:
+                    kind, seq, part = _decode(record)
+                    if kind == _DATA:
+                        parts.append(part)
+                    elif kind == _TICK:
+                        yield EventBatch.concat(parts)
+                        # Resumed: the batch has been scored.
+                        outbox.put([pickle.dumps(("ack", seq, emitted[:]), protocol=pickle.HIGHEST_PROTOCOL)])
+                        emitted.clear()
+                        parts = []
+                    else:
+                        return
+                    record = receive()
+
+            await StreamScorer(**scorer_options).run_batches(batches(), config, selection, emitted.append)
+            # Windows released after the last tick, e.g. drained from the reorder buffers.
+            outbox.put([pickle.dumps(("end", 0, emitted), protocol=pickle.HIGHEST_PROTOCOL)])
+
+        while True:
+            record = receive()
+            if record is None or _RECORD.unpack_from(record)[0] == _STOP:
+                break
+            asyncio.run(session(record))
+    except BaseException:
+        outbox.put([pickle.dumps(("error", 0, traceback.format_exc()))])
+    finally:
+        inbox.close()
+        outbox.close()
+
+
+class ShardedScorer:
+    """Score a stream on ``workers`` processes, each owning a slice of the keys.
+
+    The dispatcher (the calling process) splits every batch by
+    ``(asset_id, channel)`` and routes each part over a shared-memory ring
+    to the worker that owns the key on a :class:`HashRing`. Every worker
+    runs its own :class:`~esi_agents.agents.StreamScorer` on the model in
+    ``selection``. Scored windows come back tagged with their batch number;
+    once every worker that received part of a batch has finished it, its
+    windows are emitted ordered by end time, asset and channel. Workers
+    stay up between :meth:`run_batches` calls until :meth:`close`.
+    ``scorer_options`` are passed to each worker's scorer (for example
+    ``alerting``); alert state is per key, so each shard tracks its own.
+    Windows a worker only releases at the end of the stream (with
+    ``event_time``, from its reorder buffers) are emitted last.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        selection: Any,
+        config: dict[str, Any],
+        ring_bytes: int = _RING_BYTES,
+        start_method: str = "spawn",
+        scorer_options: dict[str, Any] | None = None,
+    ):
+        if workers < 1:
+            raise ValueError("ShardedScorer needs at least one worker")
+        self.workers = workers
+        self.selection = selection
+        self.config = config
+        self.ring_bytes = ring_bytes
+        self.scorer_options = dict(scorer_options or {})
+        self.hash_ring = HashRing(workers)
+        self._context = multiprocessing.get_context(start_method)
+        self._inboxes: list[ShmRing] = []
+        self._outboxes: list[ShmRing] = []
+        self._processes: list[Any] = []
+        self._pending: dict[int, set[int]] = {}
+        self._outputs: dict[int, list[dict[str, Any]]] = {}
+        self._released = 0
+        self._ready: set[int] = set()
+        self._ended: set[int] = set()
+        self._final: list[dict[str, Any]] = []
+        self._emit: Callable[[dict[str, Any]], None] = lambda message: None
+
+    def start(self) -> ShardedScorer:
+        self._spawn()
+        try:
+            while len(self._ready) < self.workers:
+                self._drain(timeout=0.1)
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    async def run_batches(
+        self, batches: AsyncIterator[EventBatch], emit: Callable[[dict[str, Any]], None] | None = None
+    ) -> None:
+        """Route ``batches`` to the workers and emit their scored windows.
+
+        Ring I/O never blocks the event loop: while an inbox is full or a
+        worker has not answered yet, the loop yields between polls so the
+        source adapter and other tasks keep running.
+        """
+
+        self._spawn()
+        self._emit = emit or (lambda message: None)
+        try:
+            while len(self._ready) < self.workers:
+                await self._poll()
+        except BaseException:
+            self.close()
+            raise
+        seq = self._released
+        async for batch in batches:
+            seq += 1
+            touched: set[int] = set()
+            for key, part in batch.groups():
+                shard = self.hash_ring.shard(key)
+                await self._put(shard, _encode(seq, key, part))
+                touched.add(shard)
+            for shard in touched:
+                await self._put(shard, _control(_TICK, seq))
+            self._pending[seq] = touched
+            self._outputs[seq] = []
+            self._drain()
+        self._ended.clear()
+        for shard in range(self.workers):
+            await self._put(shard, _control(_END))
+        while len(self._ended) < self.workers:
+            await self._poll()
+        self._release()
+        final, self._final = self._final, []
+        final.sort(key=lambda m: (m["timestamp"], m["asset_id"], m["channel"]))
+        for message in final:
+            self._emit(message)
+
+    def close(self) -> None:
+        for inbox, outbox, process in zip(self._inboxes, self._outboxes, self._processes):
+
+            def discard(outbox: ShmRing = outbox, process: Any = process) -> None:
+                # Unblock a worker stuck on a full outbox; give up once it is gone.
+                while outbox.get(timeout=0) is not None:
+                    pass
+                if not process.is_alive():
+                    raise RuntimeError("worker exited")
+
+            if process.is_alive():
+                with contextlib.suppress(RuntimeError):
+                    inbox.put(_control(_STOP), waiting=discard)
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        for ring in (*self._inboxes, *self._outboxes):
+            ring.close()
+        self._inboxes, self._outboxes, self._processes = [], [], []
+        self._ready.clear()
+
+    def __enter__(self) -> ShardedScorer:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _spawn(self) -> None:
+        if self._processes:
+            return
+        payload = pickle.dumps(self.selection, protocol=pickle.HIGHEST_PROTOCOL)
+        for _ in range(self.workers):
+            inbox = ShmRing(self.ring_bytes, context=self._context)
+            outbox = ShmRing(self.ring_bytes, context=self._context)
+            process = self._context.Process(
+                target=_shard_worker,
+                args=(inbox.handle(), outbox.handle(), payload, self.config, self.scorer_options),
+                name=f"esi-shard-{len(self._processes)}",
+                daemon=True,
+            )
+            process.start()
+            self._inboxes.append(inbox)
+            self._outboxes.append(outbox)
+            self._processes.append(process)
+
+    async def _put(self, shard: int, parts: Sequence[bytes | memoryview]) -> None:
+        while not self._inboxes[shard].try_put(parts):
+            await self._poll()
+
+    async def _poll(self) -> None:
+        self._drain()
+        await asyncio.sleep(_POLL_S)
+
+    def _drain(self, timeout: float = 0.0) -> None:
+        self._check_workers()
+        for shard, outbox in enumerate(self._outboxes):
+            record = outbox.get(timeout=timeout)
+            while record is not None:
+                kind, seq, payload = pickle.loads(record)
+                if kind == "error":
+                    raise RuntimeError(f"Stream shard {shard} failed:\n{payload}")
+                if kind == "ready":
+                    self._ready.add(shard)
+                elif kind == "end":
+                    self._ended.add(shard)
+                    self._final.extend(payload)
+                else:
+                    self._outputs[seq].extend(payload)
+                    self._pending[seq].discard(shard)
+                record = outbox.get(timeout=0)
+        self._release()
+
+    def _release(self) -> None:
+        while self._released + 1 in self._pending and not self._pending[self._released + 1]:
+            self._released += 1
+            del self._pending[self._released]
+            messages = self._outputs.pop(self._released)
+            messages.sort(key=lambda m: (m["timestamp"], m["asset_id"], m["channel"]))
+            for message in messages:
+                self._emit(message)
+
+    def _check_workers(self) -> None:
+        for shard, process in enumerate(self._processes):
+            if not process.is_alive() and shard not in self._ended and process.exitcode not in (0, None):
+                raise RuntimeError(f"Stream shard {shard} exited with code {process.exitcode}")
+
+
+__all__ = ["HashRing", "ShardedScorer"]
@@ -0,0 +1,161 @@
+"""Single-producer/single-consumer byte queue in shared memory."""
+from __future__ import annotations
+
+import multiprocessing
+import struct
+from collections.abc import Callable, Sequence
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+
+_HEADER = 64  # head and tail counters, each on its own cache line
+_LENGTH = struct.Struct("<I")
+_WRAP = 0xFFFFFFFF
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class ShmRing:
+    """Bounded FIFO of byte records in a :class:`SharedMemory` segment.
+
+    ``head`` and ``tail`` are monotonically increasing byte counters; the
+    producer only writes ``head`` and the consumer only writes ``tail``.
+    A record that would straddle the end of the buffer is preceded by a
+    wrap marker and written at the start, so records may take at most half
+    the capacity. The ``items`` and ``freed``
+    semaphores let either side block instead of spinning and act as the
+    memory barriers between the counter updates and the payload.
+
+    Create the ring in the parent, pass :meth:`handle` to the child and
+    reopen it there with :meth:`attach`.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        shm: SharedMemory | None = None,
+        items: Any = None,
+        freed: Any = None,
+        owner: bool = True,
+        context: Any = None,
+    ):
+        self.capacity = _align(capacity)
+        self.shm = shm or SharedMemory(create=True, size=_HEADER + self.capacity)
+        self.owner = owner
+        self._header = self.shm.buf[:_HEADER]
+        self._counters = np.ndarray((8,), dtype=np.int64, buffer=self._header)
+        self._data = self.shm.buf[_HEADER : _HEADER + self.capacity]
+        context = context or multiprocessing
+        self.items = items if items is not None else context.Semaphore(0)
+        self.freed = freed if freed is not None else context.Semaphore(0)
+
+    def handle(self) -> tuple[str, int, Any, Any]:
+        return (self.shm.name, self.capacity, self.items, self.freed)
+
+    @classmethod
+    def attach(cls, handle: tuple[str, int, Any, Any]) -> ShmRing:
+        name, capacity, items, freed = handle
+        # Children share the parent's resource tracker, which keeps one
+        # entry per segment, so attaching does not leak a registration.
+        return cls(capacity, SharedMemory(name=name), items, freed, owner=False)
+
+    @property
+    def _head(self) -> int:
+        return int(self._counters[0])
+
+    @property
+    def _tail(self) -> int:
+        return int(self._counters[4])
+
+    def put(
+        self,
+        parts: Sequence[bytes | memoryview],
+        timeout: float = 0.1,
+        waiting: Callable[[], None] | None = None,
+    ) -> None:
+        """Append one record made of ``parts``; blocks while the ring is full.
+
+        ``waiting`` is called every ``timeout`` seconds while blocked, so a
+        producer can service its other queues (or give up by raising).
+        """
+
+        layout = self._layout(parts)
+        # One consumed slot is announced per record; take one back per put so
+        # the semaphore count stays bounded by the ring's occupancy.
+        self.freed.acquire(False)
+        while layout is None:
+            if not self.freed.acquire(timeout=timeout) and waiting is not None:
+                waiting()
+            layout = self._layout(parts)
+        self._write(parts, *layout)
+
+    def try_put(self, parts: Sequence[bytes | memoryview]) -> bool:
+        """Append one record made of ``parts`` unless the ring is full."""
+
+        layout = self._layout(parts)
+        if layout is None:
+            return False
+        self.freed.acquire(False)
+        self._write(parts, *layout)
+        return True
+
+    def _layout(self, parts: Sequence[bytes | memoryview]) -> tuple[int, int, int] | None:
+        """``(size, need, pad)`` of the next record, or ``None`` while it does not fit."""
+
+        size = sum(len(part) for part in parts)
+        need = _align(_LENGTH.size + size)
+        if need > self.capacity // 2:
+            raise ValueError(f"Record of {size} bytes exceeds half of the {self.capacity}-byte ring")
+        head = self._head
+        offset = head % self.capacity
+        pad = self.capacity - offset if offset + need > self.capacity else 0
+        if self.capacity - (head - self._tail) < need + pad:
+            return None
+        return size, need, pad
+
+    def _write(self, parts: Sequence[bytes | memoryview], size: int, need: int, pad: int) -> None:
+        head = self._head
+        offset = head % self.capacity
+        if pad:
+            _LENGTH.pack_into(self._data, offset, _WRAP)
+            head += pad
+            offset = 0
+        _LENGTH.pack_into(self._data, offset, size)
+        cursor = offset + _LENGTH.size
+        for part in parts:
+            self._data[cursor : cursor + len(part)] = part
+            cursor += len(part)
+        self._counters[0] = head + need
+        self.items.release()
+
+    def get(self, timeout: float | None = None) -> bytes | None:
+        """Pop the oldest record; ``None`` if none arrives within ``timeout``."""
+
+        if not self.items.acquire(timeout=timeout):
+            return None
+        tail = self._tail
+        offset = tail % self.capacity
+        (size,) = _LENGTH.unpack_from(self._data, offset)
+        if size == _WRAP:
+            tail += self.capacity - offset
+            offset = 0
+            (size,) = _LENGTH.unpack_from(self._data, offset)
+        start = offset + _LENGTH.size
+        record = bytes(self._data[start : start + size])
+        self._counters[4] = tail + _align(_LENGTH.size + size)
+        self.freed.release()
+        return record
+
+    def close(self) -> None:
+        self._counters = None  # type: ignore[assignment]
+        self._header.release()
+        self._data.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+__all__ = ["ShmRing"]
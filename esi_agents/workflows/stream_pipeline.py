@@ -2,12 +2,28 @@
 from __future__ import annotations
 
 import asyncio
+import json
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Any, Callable
 
+import numpy as np
+import pandas as pd
 import yaml
 
-from ..adapters import CSVAdapter, MQTTAdapter, OPCUAAdapter, ParquetAdapter
+from ..adapters import (
+    BaseAdapter,
+    CSVAdapter,
+    MergedStream,
+    MQTTAdapter,
+    OPCUAAdapter,
+    ParquetAdapter,
+    RawWaveformAdapter,
+    ReplayAdapter,
+    SQLiteAdapter,
+    StreamSource,
+)
 from ..agents import (
     DataIngestor,
     FeatureEngineer,
@@ -15,41 +31,287 @@ from ..agents import (
     ModelTrainer,
     StreamScorer,
 )
+from ..agents.model_selector import SelectionResult
+from ..agents.model_trainer import TrainedModel
+from ..agents.online_scorer import OnlineScorer
+from ..agents.retrainer import Retrainer
+from ..agents.alert_sinks import FanOut, open_sinks
+from ..agents.stream_state import StreamCheckpointer, load_state
+from ..agents.telemetry import MetricsExporter, StreamMetrics
+from ..agents.tracing import Tracer
+from ..models.cascade import CascadeDetector
+from .sharded_stream import ShardedScorer
 
 
-async def _stream_from_adapter(adapter_name: str, params: dict[str, Any]):
+def _make_stream_adapter(adapter_name: str) -> BaseAdapter:
     adapter_name = adapter_name.lower()
     if adapter_name == "csv":
         adapter = CSVAdapter()
     elif adapter_name == "parquet":
         adapter = ParquetAdapter()
+    elif adapter_name == "sqlite":
+        adapter = SQLiteAdapter()
+    elif adapter_name == "raw_waveform":
+        adapter = RawWaveformAdapter()
+    elif adapter_name == "replay":
+        adapter = ReplayAdapter()
     elif adapter_name == "mqtt":
         adapter = MQTTAdapter()
     elif adapter_name == "opcua":
         adapter = OPCUAAdapter()
     else:
         raise ValueError(f"Unsupported streaming adapter {adapter_name}")
-    async for item in adapter.subscribe(params):
-        yield item
+    return adapter
+
+
+async def _stream_from_adapter(adapter: BaseAdapter, params: dict[str, Any]):
+    async for batch in adapter.subscribe_batches(params):
+        yield batch
+
+
+def _resumed(adapter: BaseAdapter, params: dict[str, Any], since: pd.Timestamp | None) -> dict[str, Any]:
+    if since is None:
+        return params
+    return adapter.resume_params(params, since) or params
+
+
+def _source_lag(merged: MergedStream, name: str, field: str) -> float:
+    value = merged.lag()[name][field]
+    return float("nan") if value is None else float(value)
+
+
+def _watch_merged(metrics: StreamMetrics, merged: MergedStream) -> None:
+    """Read the merge queue, late count and per-source lag at scrape time."""
 
+    metrics.queue_depth.set_function(merged.queue_depth)
+    metrics.late_events.set_function(lambda: merged.late)
+    for source in merged.sources:
+        for gauge, field in ((metrics.source_lag, "event_lag_s"), (metrics.source_idle, "idle_s")):
+            gauge.labels(source.name).set_function(partial(_source_lag, merged, source.name, field))
+
+
+def _merged_sources(stream_cfg: dict[str, Any], since: pd.Timestamp | None = None) -> MergedStream:
+    sources = []
+    for idx, source in enumerate(stream_cfg["sources"]):
+        adapter = _make_stream_adapter(source["adapter"])
+        sources.append(
+            StreamSource(
+                name=str(source.get("name", f"source_{idx}")),
+                adapter=adapter,
+                params=_resumed(adapter, source.get("params", {}), since),
+            )
+        )
+    return MergedStream(
+        sources,
+        reorder_window_s=float(stream_cfg.get("reorder_window_s", 1.0)),
+        flush_interval_s=float(stream_cfg.get("flush_interval_s", 0.5)),
+        per_key=bool(stream_cfg.get("per_key", False)),
+    )
+
+
+@dataclass
+class _Trained:
+    """What the training phase hands to the scoring phase."""
+
+    feature_engineer: FeatureEngineer
+    selection: SelectionResult
+    features: pd.DataFrame
+    online: OnlineScorer | None = None
+
+
+def _cascaded(selection: SelectionResult, features: pd.DataFrame, cascade_cfg: dict[str, Any]) -> SelectionResult:
+    """Put a cheap pre-screen detector, trained on ``features``, in front of the selected model."""
+
+    name = str(cascade_cfg.get("detector", "hbos")).lower()
+    screen = ModelTrainer().train(features, {"models": [{"name": name, "params": cascade_cfg.get("params", {})}]})[0]
+    if "prescreen" in cascade_cfg:
+        prescreen = float(cascade_cfg["prescreen"])
+    else:
+        prescreen = float(np.quantile(screen.scores, float(cascade_cfg.get("quantile", 0.8))))
+    return _behind_screen(name, screen.model, prescreen, selection)
+
+
+def _behind_screen(name: str, screen: Any, prescreen: float, selection: SelectionResult) -> SelectionResult:
+    best = selection.best_model
+    model = CascadeDetector(screen, best.model, prescreen)
+    return SelectionResult(TrainedModel(f"{name}>{best.name}", model, best.scores), selection.metrics)
+
+
+async def run_stream(
+    config_path: str | Path, emit: Callable[[dict[str, Any]], None] | None = None
+) -> dict[str, Any] | None:
+    """Train on the ``training`` section and score the ``stream`` section.
+
+    When the stream is a ``replay`` adapter, the replay throughput and
+    end-to-end latency summary is returned. A ``tracing`` section records
+    the training stages and every scored batch; relative trace paths are
+    resolved against ``tracing.output_dir`` (default: the working
+    directory). A ``metrics`` section with a ``port`` serves the scorer's
+    metrics at ``http://host:port/metrics``; with a ``path`` they are also
+    written to that file every ``interval_s`` seconds and at the end.
+
+    With a ``checkpoint`` section the scorer's buffers are saved to
+    ``checkpoint.path`` every ``interval_s`` seconds and on exit. A
+    restarted stream restores them and asks sources that can seek by time
+    to replay from the oldest point any key is missing.
+
+    With ``stream.workers`` above one, scoring is sharded by key across
+    that many processes (see :class:`ShardedScorer`); checkpoints and
+    metrics are not available in that mode.
+
+    ``stream.sinks`` lists batched alert sinks (see
+    :func:`~esi_agents.agents.alert_sinks.make_sink`) that replace the
+    per-window print; an explicit ``emit`` still receives every window.
+    The sinks are flushed and closed when the stream ends or fails.
+
+    ``stream.alerting`` turns per-window alerts into per-key alert
+    transitions with hysteresis, and ``stream.event_time`` reorders,
+    deduplicates and gap-splits each key's samples (see
+    :class:`StreamScorer`).
+    ``stream.cascade`` trains a cheap pre-screen detector (HBOS by
+    default) on the training features; only windows it scores at or above
+    ``prescreen`` (default: its ``quantile: 0.8`` on the training windows)
+    are scored by the selected model.
+
+    ``stream.online`` runs per-sample change-point detectors (see
+    :class:`~esi_agents.agents.online_scorer.OnlineScorer`) on every
+    batch before it is windowed; their ``change_point`` messages go to
+    the same sinks as the windowed scores.
+
+    ``stream.retrain`` keeps retraining the model in the background on a
+    sample of recent feature vectors and swaps the new model in between
+    batches (see :class:`~esi_agents.agents.retrainer.Retrainer`). Every
+    window message carries the ``model_version`` that scored it.
+    """
 
-async def run_stream(config_path: str | Path, emit: Callable[[dict[str, Any]], None] | None = None):
     config = yaml.safe_load(Path(config_path).read_text())
+    tracing_cfg = config.get("tracing")
+    output_dir = tracing_cfg.get("output_dir", ".") if isinstance(tracing_cfg, dict) else "."
+    with Tracer.from_config(tracing_cfg, output_dir) as tracer:
+        return await _run_stream(config, emit, tracer)
+
+
+async def _run_stream(
+    config: dict[str, Any], emit: Callable[[dict[str, Any]], None] | None, tracer: Tracer
+) -> dict[str, Any] | None:
     training_cfg = config.get("training", config)
-    ingestor = DataIngestor()
-    ingest_result = ingestor.ingest(training_cfg)
-    feature_engineer = FeatureEngineer()
-    feature_result = feature_engineer.transform(ingest_result.frame, training_cfg)
-    trainer = ModelTrainer()
-    trained = trainer.train(feature_result.matrix, training_cfg)
-    selector = ModelSelector()
-    selection = selector.select(trained, labels=None)
-    stream_cfg = config.get("stream", training_cfg)
-    adapter_name = stream_cfg.get("adapter", training_cfg.get("adapter", "csv"))
-    params = stream_cfg.get("params", {})
-    event_iter = _stream_from_adapter(adapter_name, params)
-    scorer = StreamScorer(feature_engineer)
-    await scorer.run(event_iter, training_cfg, selection, emit)
+    with tracer.span("stream.train"):
+        with tracer.span("DataIngestor.ingest") as span:
+            ingest_result = DataIngestor().ingest(training_cfg)
+            span.set(rows=len(ingest_result.frame))
+        feature_engineer = FeatureEngineer()
+        with tracer.span("FeatureEngineer.transform") as span:
+            feature_result = feature_engineer.transform(ingest_result.signals, training_cfg)
+            span.set(windows=len(feature_result.matrix))
+        with tracer.span("ModelTrainer.train", windows=len(feature_result.matrix)):
+            trained = ModelTrainer().train(feature_result.matrix, training_cfg)
+        with tracer.span("ModelSelector.select"):
+            selection = ModelSelector().select(trained, labels=None)
+        stream_cfg = config.get("stream", training_cfg)
+        if stream_cfg.get("cascade"):
+            with tracer.span("stream.cascade"):
+                selection = _cascaded(selection, feature_result.matrix, stream_cfg["cascade"])
+        online = None
+        if stream_cfg.get("online"):
+            with tracer.span("OnlineScorer.fit", rows=len(ingest_result.frame)):
+                online = OnlineScorer.from_config(stream_cfg["online"]).fit(ingest_result.frame)
+    prepared = _Trained(feature_engineer, selection, feature_result.matrix, online)
+    sinks = open_sinks(stream_cfg.get("sinks"))
+    if not sinks:
+        return await _score_stream(config, stream_cfg, prepared, emit, tracer)
+    fan_out = FanOut([*sinks, *([emit] if emit is not None else [])])
+    try:
+        return await _score_stream(config, stream_cfg, prepared, fan_out, tracer)
+    finally:
+        fan_out.close()
+
+
+async def _score_stream(
+    config: dict[str, Any],
+    stream_cfg: dict[str, Any],
+    prepared: _Trained,
+    emit: Callable[[dict[str, Any]], None] | None,
+    tracer: Tracer,
+) -> dict[str, Any] | None:
+    training_cfg = config.get("training", config)
+    selection, online = prepared.selection, prepared.online
+    workers = int(stream_cfg.get("workers", 1))
+    if workers > 1 and (config.get("checkpoint") or config.get("metrics") or stream_cfg.get("retrain")):
+        raise ValueError("checkpoint, metrics and retrain are not supported with stream.workers > 1")
+    metrics = StreamMetrics() if config.get("metrics") else None
+    checkpoint_cfg = config.get("checkpoint") or {}
+    state = load_state(checkpoint_cfg["path"]) if checkpoint_cfg.get("path") else None
+    since = state.resume_point() if state is not None else None
+    replay: ReplayAdapter | None = None
+    if stream_cfg.get("sources"):
+        merged = _merged_sources(stream_cfg, since)
+        event_iter = merged.batches()
+        if metrics is not None:
+            _watch_merged(metrics, merged)
+    else:
+        adapter_name = stream_cfg.get("adapter", training_cfg.get("adapter", "csv"))
+        adapter = _make_stream_adapter(adapter_name)
+        params = _resumed(adapter, stream_cfg.get("params", {}), since)
+        event_iter = _stream_from_adapter(adapter, params)
+        if isinstance(adapter, ReplayAdapter):
+            replay = adapter
+            emit = adapter.latency_probe(emit or (lambda msg: print(json.dumps(msg))))
+    if online is not None:
+        online.metrics = metrics
+        event_iter = online.tap(event_iter, emit or (lambda msg: print(json.dumps(msg))))
+    if workers > 1:
+        sharded = ShardedScorer(
+            workers,
+            selection,
+            training_cfg,
+            ring_bytes=int(stream_cfg.get("ring_mb", 8) * 2**20),
+            scorer_options={"alerting": stream_cfg.get("alerting"), "event_time": stream_cfg.get("event_time")},
+        )
+        with sharded, tracer.span("stream.score", workers=workers):
+            await sharded.run_batches(event_iter, emit or (lambda msg: print(json.dumps(msg))))
+        return replay.stats.summary() if replay is not None else None
+    scorer = StreamScorer(
+        prepared.feature_engineer,
+        tracer,
+        metrics,
+        offload=stream_cfg.get("offload"),
+        alerting=stream_cfg.get("alerting"),
+        event_time=stream_cfg.get("event_time"),
+    )
+    scorer.online = online
+    if state is not None:
+        scorer.restore(state)
+    checkpointer = None
+    if checkpoint_cfg.get("path"):
+        checkpointer = StreamCheckpointer(
+            scorer, checkpoint_cfg["path"], float(checkpoint_cfg.get("interval_s", 5.0))
+        ).start()
+    exporter = MetricsExporter.from_config(config.get("metrics"), metrics.registry) if metrics else None
+    if exporter is not None:
+        exporter.start()
+    retrainer = None
+    if stream_cfg.get("retrain"):
+        reference = prepared.features.select_dtypes(include=[np.number])
+        retrainer = Retrainer.from_config(scorer, training_cfg, reference, stream_cfg["retrain"])
+        cascade = selection.best_model.model
+        if isinstance(cascade, CascadeDetector):
+            # Keep the start-up pre-screen in front of every retrained model.
+            screen_name = selection.best_model.name.partition(">")[0]
+            retrainer.prepare = partial(_behind_screen, screen_name, cascade.screen, cascade.prescreen)
+        retrainer.start()
+    try:
+        with tracer.span("stream.score") as span:
+            await scorer.run_batches(event_iter, training_cfg, selection, emit)
+            if scorer.escalation_rate is not None:
+                span.set(escalation_rate=scorer.escalation_rate)
+    finally:
+        if retrainer is not None:
+            await retrainer.stop()
+        if exporter is not None:
+            exporter.stop()
+        if checkpointer is not None:
+            await checkpointer.stop()
+    return replay.stats.summary() if replay is not None else None
 
 
 __all__ = ["run_stream"]